@@ -0,0 +1,114 @@
+import sys
+
+import numpy as np
+
+
+class AssetRegistry(object):
+    """
+    Maps asset symbols (e.g. 'EQ:SPY') onto dense integer IDs, in
+    order of first registration, such that per-asset state can be
+    held within arrays indexed by ID rather than within dictionaries
+    keyed by string symbols. Symbols are interned upon registration.
+
+    String symbols are then only required at the API boundary, being
+    converted to IDs once on the way in and back on the way out. Only
+    those components that hold per-asset state register symbols, while
+    queries of unregistered symbols (via `get`) leave the registry
+    unchanged, such that it does not grow with every symbol queried.
+
+    A backtest owns its own registry, shared between its data sources
+    and broker, such that the registry (and the arrays sized by it)
+    does not grow across the backtests of a process.
+    """
+
+    def __init__(self):
+        self.symbols = []
+        self.ids = {}
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self.ids
+
+    def get_id(self, symbol):
+        """
+        Obtain the integer ID of an asset symbol, registering
+        the symbol if it has not been seen before.
+
+        Parameters
+        ----------
+        symbol : `str`
+            The asset symbol.
+
+        Returns
+        -------
+        `int`
+            The dense integer ID of the asset.
+        """
+        try:
+            return self.ids[symbol]
+        except KeyError:
+            asset_id = len(self.symbols)
+            symbol = sys.intern(symbol)
+            self.symbols.append(symbol)
+            self.ids[symbol] = asset_id
+            return asset_id
+
+    def get(self, symbol):
+        """
+        Obtain the integer ID of an asset symbol, without
+        registering the symbol if it has not been seen before.
+
+        Parameters
+        ----------
+        symbol : `str`
+            The asset symbol.
+
+        Returns
+        -------
+        `int` or None
+            The dense integer ID of the asset, or None if the
+            symbol has not been registered.
+        """
+        return self.ids.get(symbol)
+
+    def get_ids(self, symbols):
+        """
+        Obtain the integer IDs of a list of asset symbols,
+        registering any symbols not seen before.
+
+        Parameters
+        ----------
+        symbols : `list[str]`
+            The asset symbols.
+
+        Returns
+        -------
+        `np.ndarray`
+            The integer IDs, in the order of the provided symbols.
+        """
+        return np.array(
+            [self.get_id(symbol) for symbol in symbols], dtype=np.int64
+        )
+
+    def get_symbol(self, asset_id):
+        """
+        Obtain the asset symbol of an integer ID.
+
+        Parameters
+        ----------
+        asset_id : `int`
+            The integer ID of the asset.
+
+        Returns
+        -------
+        `str`
+            The asset symbol.
+        """
+        return self.symbols[asset_id]
+
+
+# The registry shared by default between all components that are
+# created outside of a backtest, i.e. without an explicit registry
+asset_registry = AssetRegistry()
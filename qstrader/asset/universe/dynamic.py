@@ -44,3 +44,15 @@ class DynamicUniverse(Universe):
             asset for asset, asset_date in self.asset_dates.items()
             if asset_date is not None and dt >= asset_date
         ]
+
+    def get_all_assets(self) -> list[str]:
+        """
+        Obtain the list of all assets that ever form part of the
+        Universe, irrespective of their entry dates.
+
+        Returns
+        -------
+        `list[str]`
+            The list of Asset symbols in the dynamic Universe.
+        """
+        return list(self.asset_dates.keys())
@@ -15,3 +15,16 @@ class Universe(object):
         raise NotImplementedError(
             "Should implement get_assets()"
         )
+
+    def get_all_assets(self) -> list[str]:
+        """
+        Obtain the list of all assets that ever form part of the
+        Universe, irrespective of time.
+
+        Returns
+        -------
+        `list[str]` or None
+            The list of Asset symbols, or None if the Universe
+            cannot determine its composition in advance.
+        """
+        return None
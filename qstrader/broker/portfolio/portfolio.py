@@ -2,10 +2,12 @@ import copy
 import datetime
 import logging
 
+import numpy as np
 import pandas as pd
 
 from qstrader import settings
 from qstrader.broker.portfolio.portfolio_event import PortfolioEvent
+from qstrader.broker.portfolio.position_book import ArrayPositionBook
 from qstrader.broker.portfolio.position_handler import PositionHandler
 
 
@@ -28,6 +30,14 @@ class Portfolio(object):
         An identifier for the portfolio.
     name: str, optional
         The human-readable name of the portfolio.
+    array_positions: bool, optional
+        Whether to hold the positions within an array-backed
+        ArrayPositionBook, which values and marks all positions to
+        market in single vectorised operations, rather than within
+        a PositionHandler. Defaults to False.
+    registry: AssetRegistry, optional
+        The registry mapping asset symbols onto the array indices
+        of any ArrayPositionBook. Defaults to the shared registry.
     """
 
     def __init__(
@@ -36,7 +46,9 @@ class Portfolio(object):
         starting_cash=0.0,
         currency="USD",
         portfolio_id=None,
-        name=None
+        name=None,
+        array_positions=False,
+        registry=None
     ):
         """
         Initialise the Portfolio object with a PositionHandler,
@@ -50,7 +62,11 @@ class Portfolio(object):
         self.portfolio_id = portfolio_id
         self.name = name
 
-        self.pos_handler = PositionHandler()
+        self.array_positions = array_positions
+        if self.array_positions:
+            self.pos_handler = ArrayPositionBook(registry=registry)
+        else:
+            self.pos_handler = PositionHandler()
         self.history = []
 
         self.logger = logging.getLogger('Portfolio')
@@ -298,7 +314,7 @@ class Portfolio(object):
         Update the market value of the asset to the current
         trade price and date.
         """
-        if asset not in self.pos_handler.positions:
+        if not self.pos_handler.has_position(asset):
             return
         else:
             if current_price < 0.0:
@@ -318,10 +334,43 @@ class Portfolio(object):
                     )
                 )
 
-            self.pos_handler.positions[asset].update_current_price(
-                current_price, current_dt
+            self.pos_handler.update_current_price(
+                asset, current_price, current_dt
             )
 
+    def update_market_values_of_assets(
+        self, assets, current_prices, current_dt
+    ):
+        """
+        Update the market values of multiple assets at once to
+        their current trade prices at the current trade date.
+        Assets without positions are ignored.
+        """
+        if len(assets) == 0:
+            return
+        current_prices = np.asarray(current_prices, dtype=np.float64)
+        negative_idx = np.flatnonzero(current_prices < 0.0)
+        if len(negative_idx) > 0:
+            raise ValueError(
+                'Current trade price of %s is negative for '
+                'asset %s. Cannot update position.' % (
+                    current_prices[negative_idx[0]], assets[negative_idx[0]]
+                )
+            )
+
+        if current_dt < self.current_dt:
+            raise ValueError(
+                'Current trade date of %s is earlier than '
+                'current date %s of assets %s. Cannot update '
+                'positions.' % (
+                    current_dt, self.current_dt, assets
+                )
+            )
+
+        self.pos_handler.update_current_prices(
+            assets, current_prices, current_dt
+        )
+
     def history_to_df(self):
         """
         Creates a Pandas DataFrame of the Portfolio history.
@@ -0,0 +1,457 @@
+from collections import OrderedDict
+from math import floor
+
+import numpy as np
+
+from qstrader.asset.registry import asset_registry
+from qstrader.broker.portfolio.position import Position
+
+
+class ArrayPositionBook(object):
+    """
+    An alternative to the PositionHandler that stores the quantities,
+    average prices, commissions and current prices of all positions
+    within aligned NumPy arrays indexed by asset ID, rather than as
+    individual Position instances.
+
+    Marking the positions to market, along with the total market
+    value and P&L calculations, are then each a single vectorised
+    operation across the whole book, rather than a Python loop over
+    every position. The accounting is identical to that of Position.
+
+    Individual Position instances are only created on demand, as
+    read-only snapshots, via the `positions` property.
+
+    Parameters
+    ----------
+    registry : `AssetRegistry`, optional
+        The registry mapping asset symbols onto array indices.
+        Defaults to the shared asset registry.
+    """
+
+    def __init__(self, registry=None):
+        self.registry = registry if registry is not None else asset_registry
+
+        # Open positions by asset ID, in order of opening
+        self.open_ids = OrderedDict()
+
+        capacity = max(len(self.registry), 1)
+        self.buy_quantity = np.zeros(capacity)
+        self.sell_quantity = np.zeros(capacity)
+        self.avg_bought = np.zeros(capacity)
+        self.avg_sold = np.zeros(capacity)
+        self.buy_commission = np.zeros(capacity)
+        self.sell_commission = np.zeros(capacity)
+        self.current_price = np.zeros(capacity)
+        self.current_dt = np.full(capacity, None, dtype=object)
+
+        # The latest timestamp of any position, such that the update
+        # times of each position need only be checked if earlier
+        self.latest_dt = None
+
+    def _ensure_capacity(self, asset_id):
+        """
+        Grow the arrays, by at least doubling their length, such
+        that they can be indexed by the provided asset ID.
+
+        Parameters
+        ----------
+        asset_id : `int`
+            The asset ID to accommodate.
+        """
+        capacity = len(self.buy_quantity)
+        if asset_id < capacity:
+            return
+        extra = max(asset_id + 1, 2 * capacity) - capacity
+        for name in (
+            'buy_quantity', 'sell_quantity', 'avg_bought', 'avg_sold',
+            'buy_commission', 'sell_commission', 'current_price'
+        ):
+            setattr(
+                self, name, np.concatenate([getattr(self, name), np.zeros(extra)])
+            )
+        self.current_dt = np.concatenate(
+            [self.current_dt, np.full(extra, None, dtype=object)]
+        )
+
+    def _close_position(self, asset_id):
+        """
+        Remove the position of an asset and reset its array entries,
+        such that it no longer contributes to the book totals.
+
+        Parameters
+        ----------
+        asset_id : `int`
+            The asset ID of the position.
+        """
+        del self.open_ids[asset_id]
+        self.buy_quantity[asset_id] = 0.0
+        self.sell_quantity[asset_id] = 0.0
+        self.avg_bought[asset_id] = 0.0
+        self.avg_sold[asset_id] = 0.0
+        self.buy_commission[asset_id] = 0.0
+        self.sell_commission[asset_id] = 0.0
+        self.current_price[asset_id] = 0.0
+        self.current_dt[asset_id] = None
+
+    def transact_position(self, transaction):
+        """
+        Execute the transaction and update the appropriate
+        position for the transaction's asset accordingly.
+
+        Parameters
+        ----------
+        transaction : `Transaction`
+            The transaction to update the book with.
+        """
+        asset_id = self.registry.get_id(transaction.asset)
+        self._ensure_capacity(asset_id)
+        quantity = transaction.quantity
+        price = transaction.price
+        commission = transaction.commission
+
+        if asset_id not in self.open_ids:
+            self.open_ids[asset_id] = None
+            if quantity > 0:
+                self.buy_quantity[asset_id] = quantity
+                self.avg_bought[asset_id] = price
+                self.buy_commission[asset_id] = commission
+            else:
+                self.sell_quantity[asset_id] = -1.0 * quantity
+                self.avg_sold[asset_id] = price
+                self.sell_commission[asset_id] = commission
+            self.current_price[asset_id] = price
+            self.current_dt[asset_id] = transaction.dt
+            if self.latest_dt is None or transaction.dt > self.latest_dt:
+                self.latest_dt = transaction.dt
+        elif int(floor(quantity)) != 0:
+            if quantity > 0:
+                buy_quantity = self.buy_quantity[asset_id]
+                self.avg_bought[asset_id] = (
+                    (self.avg_bought[asset_id] * buy_quantity) +
+                    (quantity * price)
+                ) / (buy_quantity + quantity)
+                self.buy_quantity[asset_id] = buy_quantity + quantity
+                self.buy_commission[asset_id] += commission
+            else:
+                sell_quantity = self.sell_quantity[asset_id]
+                self.avg_sold[asset_id] = (
+                    (self.avg_sold[asset_id] * sell_quantity) -
+                    (quantity * price)
+                ) / (sell_quantity - quantity)
+                self.sell_quantity[asset_id] = sell_quantity - quantity
+                self.sell_commission[asset_id] += commission
+            self.update_current_price(transaction.asset, price, transaction.dt)
+
+        # If the position has zero quantity remove it
+        if self.buy_quantity[asset_id] == self.sell_quantity[asset_id]:
+            self._close_position(asset_id)
+
+    def _open_ids(self, assets):
+        """
+        Obtain the asset IDs of those provided assets with
+        open positions, ignoring any others.
+
+        Parameters
+        ----------
+        assets : `list[str]`
+            The asset symbols.
+
+        Returns
+        -------
+        `tuple(np.ndarray, np.ndarray)`
+            The asset IDs of the open positions and the positions
+            of these assets within the provided assets.
+        """
+        asset_ids = np.array(
+            [self.registry.ids.get(asset, -1) for asset in assets],
+            dtype=np.int64
+        )
+        is_open = np.array(
+            [asset_id in self.open_ids for asset_id in asset_ids.tolist()],
+            dtype=bool
+        )
+        return asset_ids[is_open], np.flatnonzero(is_open)
+
+    def update_current_price(self, asset, market_price, dt=None):
+        """
+        Updates the current market price of the position in an asset,
+        with an optional timestamp.
+
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol of the position.
+        market_price : `float`
+            The current market price.
+        dt : `pd.Timestamp`, optional
+            The optional timestamp of the current market price.
+        """
+        self.update_current_prices([asset], [market_price], dt)
+
+    def update_current_prices(self, assets, market_prices, dt=None):
+        """
+        Updates the current market prices of the positions in each of
+        the provided assets at once, with an optional timestamp. Assets
+        without open positions are ignored.
+
+        Parameters
+        ----------
+        assets : `list[str]`
+            The asset symbols of the positions.
+        market_prices : `list[float]` or `np.ndarray`
+            The current market prices of each asset.
+        dt : `pd.Timestamp`, optional
+            The optional timestamp of the current market prices.
+        """
+        asset_ids, idx = self._open_ids(assets)
+        if len(asset_ids) == 0:
+            return
+        market_prices = np.asarray(market_prices, dtype=np.float64)[idx]
+
+        if dt is not None and dt < self.latest_dt:
+            for current_dt in self.current_dt[asset_ids]:
+                if dt < current_dt:
+                    raise ValueError(
+                        'Supplied update time of "%s" is earlier than '
+                        'the current time of "%s".' % (dt, current_dt)
+                    )
+
+        non_positive = market_prices <= 0.0
+        if non_positive.any():
+            bad_idx = int(np.flatnonzero(non_positive)[0])
+            raise ValueError(
+                'Market price "%s" of asset "%s" must be positive to '
+                'update the position.' % (
+                    market_prices[bad_idx],
+                    self.registry.get_symbol(int(asset_ids[bad_idx]))
+                )
+            )
+
+        if dt is not None:
+            self.current_dt[asset_ids] = dt
+            self.latest_dt = dt if dt > self.latest_dt else self.latest_dt
+        self.current_price[asset_ids] = market_prices
+
+    def has_position(self, asset):
+        """
+        Whether there is an open position in the provided asset,
+        without creating any Position snapshots.
+
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol.
+
+        Returns
+        -------
+        `Boolean`
+            Whether the asset has an open position.
+        """
+        asset_id = self.registry.get(asset)
+        return asset_id is not None and asset_id in self.open_ids
+
+    def assets(self):
+        """
+        Obtain the asset symbols of all open positions.
+
+        Returns
+        -------
+        `list[str]`
+            The asset symbols, in order of opening.
+        """
+        return [self.registry.get_symbol(asset_id) for asset_id in self.open_ids]
+
+    def net_quantities(self):
+        """
+        Obtain the net quantity of every open position.
+
+        Returns
+        -------
+        `dict{str: float}`
+            The net quantity of each asset, in order of opening.
+        """
+        asset_ids = list(self.open_ids)
+        quantities = (
+            self.buy_quantity[asset_ids] - self.sell_quantity[asset_ids]
+        )
+        return OrderedDict(
+            (self.registry.get_symbol(asset_id), quantity)
+            for asset_id, quantity in zip(asset_ids, quantities.tolist())
+        )
+
+    @property
+    def positions(self):
+        """
+        Read-only Position snapshots of all open positions.
+
+        Returns
+        -------
+        `OrderedDict{str: Position}`
+            The Position of each asset, in order of opening.
+        """
+        positions = OrderedDict()
+        for asset_id in self.open_ids:
+            asset = self.registry.get_symbol(asset_id)
+            positions[asset] = Position(
+                asset,
+                float(self.current_price[asset_id]),
+                self.current_dt[asset_id],
+                float(self.buy_quantity[asset_id]),
+                float(self.sell_quantity[asset_id]),
+                float(self.avg_bought[asset_id]),
+                float(self.avg_sold[asset_id]),
+                float(self.buy_commission[asset_id]),
+                float(self.sell_commission[asset_id])
+            )
+        return positions
+
+    def _net_quantity(self):
+        """
+        The net quantity of every position.
+
+        Returns
+        -------
+        `np.ndarray`
+            The net quantities, zero for any closed positions.
+        """
+        return self.buy_quantity - self.sell_quantity
+
+    def _avg_price(self, net_quantity):
+        """
+        The average price paid, including commission, of every
+        position on its long or short side.
+
+        Parameters
+        ----------
+        net_quantity : `np.ndarray`
+            The net quantity of every position.
+
+        Returns
+        -------
+        `np.ndarray`
+            The average prices.
+        """
+        long_avg = np.divide(
+            self.avg_bought * self.buy_quantity + self.buy_commission,
+            self.buy_quantity,
+            out=np.zeros_like(net_quantity), where=net_quantity > 0
+        )
+        short_avg = np.divide(
+            self.avg_sold * self.sell_quantity - self.sell_commission,
+            self.sell_quantity,
+            out=np.zeros_like(net_quantity), where=net_quantity < 0
+        )
+        return long_avg + short_avg
+
+    def _realised_pnl(self, net_quantity):
+        """
+        The realised P&L of every position, via the same accounting
+        as that of Position.
+
+        Parameters
+        ----------
+        net_quantity : `np.ndarray`
+            The net quantity of every position.
+
+        Returns
+        -------
+        `np.ndarray`
+            The realised P&Ls.
+        """
+        avg_diff = self.avg_sold - self.avg_bought
+        long_pnl = np.where(
+            self.sell_quantity == 0.0, 0.0,
+            (avg_diff * self.sell_quantity) - np.divide(
+                self.sell_quantity, self.buy_quantity,
+                out=np.zeros_like(net_quantity), where=net_quantity > 0
+            ) * self.buy_commission - self.sell_commission
+        )
+        short_pnl = np.where(
+            self.buy_quantity == 0.0, 0.0,
+            (avg_diff * self.buy_quantity) - np.divide(
+                self.buy_quantity, self.sell_quantity,
+                out=np.zeros_like(net_quantity), where=net_quantity < 0
+            ) * self.sell_commission - self.buy_commission
+        )
+        flat_pnl = (
+            (self.avg_sold * self.sell_quantity) -
+            (self.avg_bought * self.buy_quantity) -
+            (self.buy_commission + self.sell_commission)
+        )
+        return np.where(
+            net_quantity > 0, long_pnl,
+            np.where(net_quantity < 0, short_pnl, flat_pnl)
+        )
+
+    def _unrealised_pnl(self, net_quantity):
+        """
+        The unrealised P&L of every position at its current price.
+
+        Parameters
+        ----------
+        net_quantity : `np.ndarray`
+            The net quantity of every position.
+
+        Returns
+        -------
+        `np.ndarray`
+            The unrealised P&Ls.
+        """
+        return (self.current_price - self._avg_price(net_quantity)) * net_quantity
+
+    def total_market_value(self):
+        """
+        Calculate the sum of all the positions' market values.
+        """
+        return float(np.dot(self.current_price, self._net_quantity()))
+
+    def total_market_values(self, assets, market_prices):
+        """
+        Calculate the sum of all the positions' market values at each
+        row of the provided market prices, without updating the
+        positions. Positions in assets without provided prices are
+        valued at their current price.
+
+        Parameters
+        ----------
+        assets : `list[str]`
+            The asset symbols of the columns of the market prices.
+        market_prices : `np.ndarray`
+            The market prices of each asset (column) at each row.
+
+        Returns
+        -------
+        `np.ndarray`
+            The total market value at each row.
+        """
+        market_prices = np.asarray(market_prices, dtype=np.float64)
+        asset_ids, idx = self._open_ids(assets)
+        current_prices = np.tile(self.current_price, (len(market_prices), 1))
+        current_prices[:, asset_ids] = market_prices[:, idx]
+        net_quantity = self._net_quantity()
+        return np.array(
+            [float(np.dot(prices, net_quantity)) for prices in current_prices]
+        )
+
+    def total_unrealised_pnl(self):
+        """
+        Calculate the sum of all the positions' unrealised P&Ls.
+        """
+        return float(np.sum(self._unrealised_pnl(self._net_quantity())))
+
+    def total_realised_pnl(self):
+        """
+        Calculate the sum of all the positions' realised P&Ls.
+        """
+        return float(np.sum(self._realised_pnl(self._net_quantity())))
+
+    def total_pnl(self):
+        """
+        Calculate the sum of all the positions' P&Ls.
+        """
+        net_quantity = self._net_quantity()
+        return float(np.sum(
+            self._realised_pnl(net_quantity) +
+            self._unrealised_pnl(net_quantity)
+        ))
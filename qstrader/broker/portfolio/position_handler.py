@@ -1,5 +1,7 @@
 from collections import OrderedDict
 
+import numpy as np
+
 from qstrader.broker.portfolio.position import Position
 
 
@@ -32,6 +34,44 @@ class PositionHandler(object):
         if self.positions[asset].net_quantity == 0:
             del self.positions[asset]
 
+    def update_current_price(self, asset, market_price, dt=None):
+        """
+        Updates the current market price of the position in an asset,
+        with an optional timestamp.
+        """
+        self.positions[asset].update_current_price(market_price, dt)
+
+    def update_current_prices(self, assets, market_prices, dt=None):
+        """
+        Updates the current market prices of the positions in each
+        of the provided assets, with an optional timestamp. Assets
+        without open positions are ignored.
+        """
+        for asset, market_price in zip(assets, market_prices):
+            if asset in self.positions:
+                self.positions[asset].update_current_price(market_price, dt)
+
+    def has_position(self, asset):
+        """
+        Whether there is an open position in the provided asset.
+        """
+        return asset in self.positions
+
+    def assets(self):
+        """
+        Obtain the asset symbols of all open positions.
+        """
+        return list(self.positions)
+
+    def net_quantities(self):
+        """
+        Obtain the net quantity of every open position.
+        """
+        return OrderedDict(
+            (asset, pos.net_quantity)
+            for asset, pos in self.positions.items()
+        )
+
     def total_market_value(self):
         """
         Calculate the sum of all the positions' market values.
@@ -41,6 +81,24 @@ class PositionHandler(object):
             for asset, pos in self.positions.items()
         )
 
+    def total_market_values(self, assets, market_prices):
+        """
+        Calculate the sum of all the positions' market values at each
+        row of the provided market prices, without updating the
+        positions. Positions in assets without provided prices are
+        valued at their current price.
+        """
+        market_prices = np.asarray(market_prices, dtype=np.float64)
+        columns = {asset: idx for idx, asset in enumerate(assets)}
+        market_values = np.zeros(len(market_prices))
+        for asset, pos in self.positions.items():
+            if asset in columns:
+                prices = market_prices[:, columns[asset]]
+            else:
+                prices = pos.current_price
+            market_values = market_values + prices * pos.net_quantity
+        return market_values
+
     def total_unrealised_pnl(self):
         """
         Calculate the sum of all the positions' unrealised P&Ls.
@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 
 from qstrader import settings
+from qstrader.asset.registry import AssetRegistry
 from qstrader.broker.broker import Broker
 from qstrader.broker.fee_model.fee_model import FeeModel
 from qstrader.broker.fee_model.zero_fee_model import ZeroFeeModel
@@ -44,6 +45,14 @@ class SimulatedBroker(Broker):
         The model used to simulate trade slippage.
     market_impact_model : `MarketImpactModel`, optional
         The model used to simulate market impact of trading.
+    array_positions : `Boolean`, optional
+        Whether the positions of each portfolio are held within an
+        array-backed ArrayPositionBook, which values and marks all
+        positions to market in single vectorised operations.
+        Defaults to False.
+    registry : `AssetRegistry`, optional
+        The registry mapping asset symbols onto the array indices of
+        any ArrayPositionBook. Defaults to the shared registry.
     """
 
     def __init__(
@@ -56,7 +65,9 @@ class SimulatedBroker(Broker):
             initial_funds: float = 0.0,
             fee_model: FeeModel = ZeroFeeModel(),
             slippage_model: FeeModel = None,
-            market_impact_model: FeeModel = None
+            market_impact_model: FeeModel = None,
+            array_positions: bool = False,
+            registry: AssetRegistry = None
     ) -> None:
         super(SimulatedBroker, self).__init__()
 
@@ -65,6 +76,8 @@ class SimulatedBroker(Broker):
         self.data_handler = data_handler
         self.current_dt = start_dt
         self.account_id = account_id
+        self.array_positions = array_positions
+        self.registry = registry
 
         self.base_currency = self._set_base_currency(base_currency)
         self.initial_funds = self._set_initial_funds(initial_funds)
@@ -340,7 +353,9 @@ class SimulatedBroker(Broker):
                 self.current_dt,
                 currency=self.base_currency,
                 portfolio_id=portfolio_id_str,
-                name=name
+                name=name,
+                array_positions=self.array_positions,
+                registry=self.registry
             )
             self.portfolios[portfolio_id_str] = p
             self.open_orders[portfolio_id_str] = queue.Queue()
@@ -669,13 +684,13 @@ class SimulatedBroker(Broker):
 
         # Update portfolio asset values
         for portfolio in self.portfolios:
-            for asset in self.portfolios[portfolio].pos_handler.positions:
-                mid_price = self.data_handler.get_asset_latest_mid_price(
-                    dt, asset
-                )
-                self.portfolios[portfolio].update_market_value_of_asset(
-                    asset, mid_price, self.current_dt
-                )
+            assets = self.portfolios[portfolio].pos_handler.assets()
+            mid_prices = self.data_handler.get_assets_latest_mid_prices(
+                dt, assets
+            )
+            self.portfolios[portfolio].update_market_values_of_assets(
+                assets, mid_prices, self.current_dt
+            )
 
         # Try to execute orders
         if self.exchange.is_open_at_datetime(self.current_dt):
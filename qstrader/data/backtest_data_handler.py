@@ -1,57 +1,237 @@
 import numpy as np
 
+from qstrader.data.price_snapshot import PriceSnapshot
+from qstrader.data.price_store import ArrayPriceStore
+
 
 class BacktestDataHandler(object):
     """
+    Provides latest and historical prices of the assets in a
+    Universe, obtained from a prioritised list of data sources.
+
+    An asset to data source routing table is built such that each
+    price query is only made against those data sources that provide
+    the asset, in order of priority. Data sources that do not expose
+    `has_asset` are assumed to potentially provide every asset.
+
+    Alternatively, in merged mode, the prices of all data sources
+    are combined into a single aligned `ArrayPriceStore` at
+    construction, with subsequent data sources backfilling any
+    prices missing from prior ones.
+
+    A `PriceSnapshot` of the Universe prices can be taken once per
+    simulation event via `update_snapshot`, after which all latest
+    price queries at the snapshot timestamp are served from it.
+
+    Parameters
+    ----------
+    universe : `Universe`
+        The Asset Universe.
+    data_sources : `list`, optional
+        The data sources, in order of priority.
+    merged : `Boolean`, optional
+        Whether to merge the prices of all data sources into a
+        single price store. Requires that every data source has
+        all of its bid/ask prices loaded. Defaults to False.
     """
 
     def __init__(
         self,
         universe,
-        data_sources=None
+        data_sources=None,
+        merged=False
     ):
         self.universe = universe
         self.data_sources = data_sources
+        self.merged = merged
 
-    def get_asset_latest_bid_price(self, dt, asset_symbol):
+        self.asset_routes = {}
+        if self.universe is not None:
+            self.refresh_routes(self.universe.get_all_assets())
+        self.price_store = self._create_merged_price_store()
+        self.snapshot = None
+
+    def _create_merged_price_store(self):
         """
+        Merge the bid/ask prices of all data sources into a single
+        price store, if requested.
+
+        Returns
+        -------
+        `ArrayPriceStore` or None
+            The merged price store, or None if not utilised.
         """
-        # TODO: Check for asset in Universe
-        bid = np.NaN
+        if not self.merged:
+            return None
+        stores = []
         for ds in self.data_sources:
+            store = getattr(ds, 'price_store', None)
+            if store is None:
+                if not hasattr(ds, 'asset_bid_ask_frames'):
+                    raise ValueError(
+                        "Unable to merge data source '%s' as it does not "
+                        "provide its bid/ask prices as DataFrames." % ds
+                    )
+                store = ArrayPriceStore.from_bid_ask_frames(
+                    dict(ds.asset_bid_ask_frames)
+                )
+            stores.append(store)
+        return ArrayPriceStore.merge(stores)
+
+    def refresh_routes(self, asset_symbols=None):
+        """
+        Rebuild the asset to data source routing table, for instance
+        when the Universe or the data sources change. Routes of any
+        other assets are subsequently built upon their first query.
+
+        Parameters
+        ----------
+        asset_symbols : `list[str]`, optional
+            The asset symbols to route.
+        """
+        self.asset_routes = {}
+        if asset_symbols is not None:
+            for asset_symbol in asset_symbols:
+                self._obtain_asset_route(asset_symbol)
+
+    def _obtain_asset_route(self, asset_symbol):
+        """
+        Obtain the data sources that provide an asset, in order of
+        priority, building the route if necessary.
+
+        Parameters
+        ----------
+        asset_symbol : `str`
+            The asset symbol.
+
+        Returns
+        -------
+        `tuple`
+            The data sources providing the asset.
+        """
+        try:
+            return self.asset_routes[asset_symbol]
+        except KeyError:
+            route = tuple(
+                ds for ds in self.data_sources
+                if not hasattr(ds, 'has_asset') or ds.has_asset(asset_symbol)
+            )
+            self.asset_routes[asset_symbol] = route
+            return route
+
+    def advance(self, dt):
+        """
+        Advance the cursors of all data sources supporting them
+        to the current simulation time.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The current simulation time.
+        """
+        for ds in self.data_sources:
+            if hasattr(ds, 'advance'):
+                ds.advance(dt)
+
+    def update_snapshot(self, dt, asset_symbols):
+        """
+        Resolve the latest bid and ask prices of a list of assets
+        once, such that subsequent latest price queries at the same
+        timestamp are served from the snapshot.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp of the snapshot.
+        asset_symbols : `list[str]`
+            The asset symbols to include in the snapshot.
+
+        Returns
+        -------
+        `PriceSnapshot`
+            The price snapshot.
+        """
+        assets = list(asset_symbols)
+        self.snapshot = None
+        bids = self.get_assets_latest_bid_prices(dt, assets)
+        asks = self.get_assets_latest_ask_prices(dt, assets)
+        self.snapshot = PriceSnapshot(dt, assets, bids, asks)
+        return self.snapshot
+
+    def _get_asset_latest_price(self, dt, asset_symbol, method):
+        """
+        Obtain the latest price of an asset from the first data
+        source on its route providing a (non-NaN) price.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the price for.
+        asset_symbol : `str`
+            The asset symbol to obtain the price for.
+        method : `str`
+            The name of the single asset data source query method.
+
+        Returns
+        -------
+        `float`
+            The price.
+        """
+        snapshot = self.snapshot
+        if snapshot is not None and snapshot.dt == dt:
+            idx = snapshot.asset_index.get(asset_symbol)
+            if idx is not None:
+                if method == 'get_bid':
+                    return snapshot.bids[idx]
+                return snapshot.asks[idx]
+
+        if self.price_store is not None:
             try:
-                bid = ds.get_bid(dt, asset_symbol)
-                if not np.isnan(bid):
-                    return bid
+                return getattr(self.price_store, method)(dt, asset_symbol)
+            except KeyError:
+                return np.NaN
+
+        price = np.NaN
+        for ds in self._obtain_asset_route(asset_symbol):
+            try:
+                price = getattr(ds, method)(dt, asset_symbol)
+                if not np.isnan(price):
+                    return price
             except Exception:
-                bid = np.NaN
-        return bid
+                price = np.NaN
+        return price
+
+    def get_asset_latest_bid_price(self, dt, asset_symbol):
+        """
+        """
+        # TODO: Check for asset in Universe
+        return self._get_asset_latest_price(dt, asset_symbol, 'get_bid')
 
     def get_asset_latest_ask_price(self, dt, asset_symbol):
         """
         """
         # TODO: Check for asset in Universe
-        ask = np.NaN
-        for ds in self.data_sources:
-            try:
-                ask = ds.get_ask(dt, asset_symbol)
-                if not np.isnan(ask):
-                    return ask
-            except Exception:
-                ask = np.NaN
-        return ask
+        return self._get_asset_latest_price(dt, asset_symbol, 'get_ask')
 
     def get_asset_latest_bid_ask_price(self, dt, asset_symbol):
         """
+        Obtain the latest bid and ask prices of an asset.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the bid/ask prices for.
+        asset_symbol : `str`
+            The asset symbol to obtain the bid/ask prices for.
+
+        Returns
+        -------
+        `tuple(float, float)`
+            The bid and ask prices.
         """
-        # TODO: For the moment this is sufficient for OHLCV
-        # data, which only usually provides mid prices
-        # This will need to be revisited when handling intraday
-        # bid/ask time series.
-        # It has been added as an optimisation mechanism for
-        # interday backtests.
         bid = self.get_asset_latest_bid_price(dt, asset_symbol)
-        return (bid, bid)
+        ask = self.get_asset_latest_ask_price(dt, asset_symbol)
+        return (bid, ask)
 
     def get_asset_latest_mid_price(self, dt, asset_symbol):
         """
@@ -64,6 +244,237 @@ class BacktestDataHandler(object):
             mid = np.NaN
         return mid
 
+    def _get_assets_latest_prices(self, dt, assets, batch_method, method):
+        """
+        Obtain the latest prices of a list of assets from the current
+        price snapshot, if taken at the provided timestamp, otherwise
+        in a single vectorised query per data source.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the prices for.
+        batch_method : `str`
+            The name of the multi-asset data source query method.
+        method : `str`
+            The name of the single asset data source query method,
+            used for data sources that do not support multi-asset
+            queries.
+
+        Returns
+        -------
+        `np.ndarray`
+            The prices, in the order of the provided assets.
+        """
+        assets = list(assets)
+        snapshot = self.snapshot
+        if snapshot is not None and snapshot.dt == dt:
+            cols = snapshot.locate(assets)
+            snapshot_prices = snapshot.bids if batch_method == 'get_bids' \
+                else snapshot.asks
+            prices = snapshot.get_prices(snapshot_prices, cols)
+            unknown = cols < 0
+            if unknown.any():
+                # Query any assets outside of the snapshot directly
+                prices[unknown] = self._query_assets_latest_prices(
+                    dt, [asset for asset, unk in zip(assets, unknown) if unk],
+                    batch_method, method
+                )
+            return prices
+        return self._query_assets_latest_prices(
+            dt, assets, batch_method, method
+        )
+
+    def _query_assets_latest_prices(self, dt, assets, batch_method, method):
+        """
+        Query the data sources (or merged price store) for the
+        latest prices of a list of assets.
+
+        Each data source is queried in turn only for those assets
+        that are routed to it and do not yet have a (non-NaN) price.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the prices for.
+        batch_method : `str`
+            The name of the multi-asset data source query method.
+        method : `str`
+            The name of the single asset data source query method.
+
+        Returns
+        -------
+        `np.ndarray`
+            The prices, in the order of the provided assets.
+        """
+        if self.price_store is not None:
+            return getattr(self.price_store, batch_method)(dt, assets)
+
+        routes = [self._obtain_asset_route(asset) for asset in assets]
+        prices = np.full(len(assets), np.NaN)
+        for ds in self.data_sources:
+            missing = np.isnan(prices)
+            if not missing.any():
+                break
+            missing &= np.array([ds in route for route in routes], dtype=bool)
+            if not missing.any():
+                continue
+            missing_assets = [
+                asset for asset, miss in zip(assets, missing) if miss
+            ]
+            if hasattr(ds, batch_method):
+                try:
+                    prices[missing] = getattr(ds, batch_method)(
+                        dt, missing_assets
+                    )
+                except Exception:
+                    continue
+            else:
+                for idx in np.flatnonzero(missing):
+                    try:
+                        prices[idx] = getattr(ds, method)(dt, assets[idx])
+                    except Exception:
+                        prices[idx] = np.NaN
+        return prices
+
+    def get_assets_latest_bid_prices(self, dt, asset_symbols):
+        """
+        Obtain the latest bid prices of a list of assets.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the bid prices for.
+        asset_symbols : `list[str]`
+            The asset symbols to obtain the bid prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The bid prices, in the order of the provided assets.
+        """
+        return self._get_assets_latest_prices(
+            dt, asset_symbols, 'get_bids', 'get_bid'
+        )
+
+    def get_assets_latest_ask_prices(self, dt, asset_symbols):
+        """
+        Obtain the latest ask prices of a list of assets.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the ask prices for.
+        asset_symbols : `list[str]`
+            The asset symbols to obtain the ask prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The ask prices, in the order of the provided assets.
+        """
+        return self._get_assets_latest_prices(
+            dt, asset_symbols, 'get_asks', 'get_ask'
+        )
+
+    def get_assets_latest_bid_ask_prices(self, dt, asset_symbols):
+        """
+        Obtain the latest bid and ask prices of a list of assets.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the bid/ask prices for.
+        asset_symbols : `list[str]`
+            The asset symbols to obtain the bid/ask prices for.
+
+        Returns
+        -------
+        `tuple(np.ndarray, np.ndarray)`
+            The bid and ask prices, in the order of the provided assets.
+        """
+        bids = self.get_assets_latest_bid_prices(dt, asset_symbols)
+        asks = self.get_assets_latest_ask_prices(dt, asset_symbols)
+        return (bids, asks)
+
+    def get_assets_latest_mid_prices(self, dt, asset_symbols):
+        """
+        Obtain the latest mid prices of a list of assets.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the mid prices for.
+        asset_symbols : `list[str]`
+            The asset symbols to obtain the mid prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The mid prices, in the order of the provided assets.
+        """
+        bids, asks = self.get_assets_latest_bid_ask_prices(dt, asset_symbols)
+        return (bids + asks) / 2.0
+
+    def _obtain_bulk_price_source(self):
+        """
+        Obtain the single source of all prices, if available, which
+        can answer queries over many timestamps at once, i.e. the
+        merged price store or the only data source if it supports
+        multi-timestamp queries.
+
+        Returns
+        -------
+        `ArrayPriceStore` or data source or None
+            The price source, or None if not available.
+        """
+        if self.price_store is not None:
+            return self.price_store
+        if self.data_sources is not None and len(self.data_sources) == 1:
+            ds = self.data_sources[0]
+            if hasattr(ds, 'get_bids_matrix'):
+                return ds
+        return None
+
+    def get_assets_latest_mid_prices_matrix(self, dts, asset_symbols):
+        """
+        Obtain the latest mid prices of a list of assets at each of
+        a sorted list of timestamps, such as the valuation times of
+        a period over which holdings are unchanged.
+
+        If all prices are held by a single price store or data source
+        they are obtained in a single multi-timestamp query, otherwise
+        each of the timestamps is queried in turn.
+
+        Parameters
+        ----------
+        dts : `list[pd.Timestamp]` or `pd.DatetimeIndex`
+            When to obtain the mid prices for.
+        asset_symbols : `list[str]`
+            The asset symbols to obtain the mid prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The (timestamp x asset) mid prices, in the order of the
+            provided timestamps and assets.
+        """
+        assets = list(asset_symbols)
+        source = self._obtain_bulk_price_source()
+        if source is not None:
+            bids = source.get_bids_matrix(dts, assets)
+            asks = source.get_asks_matrix(dts, assets)
+            return (bids + asks) / 2.0
+
+        mids = np.full((len(dts), len(assets)), np.NaN)
+        for row, dt in enumerate(dts):
+            mids[row] = self.get_assets_latest_mid_prices(dt, assets)
+        return mids
+
     def get_assets_historical_range_close_price(
         self, start_dt, end_dt, asset_symbols, adjusted=False
     ):
@@ -0,0 +1,399 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Incremented whenever the cached representation changes, in
+# order to invalidate any previously cached data
+CACHE_VERSION = 3
+
+
+class BarDataCache(object):
+    """
+    An on-disk binary columnar cache of prepared bar and bid/ask
+    DataFrames, used to avoid re-parsing and re-converting CSV files
+    on every backtest construction.
+
+    Each cache entry is a directory of NumPy '.npy' files, one per
+    DataFrame column along with the int64 nanosecond (UTC) timestamp
+    index, which are memory-mapped when loaded. Entries are keyed on
+    the source file path, whether prices are adjusted, the dtype of any
+    compact prices and the market session times or exchange calendar.
+    Each key holds versioned entry directories, named by the source
+    file modification time and size along with the cache version, such
+    that any modification of the source file invalidates the entry.
+
+    Entries are written to a temporary directory which is then moved
+    into place atomically, such that an entry is never modified once
+    visible to readers (which may have memory-mapped its columns).
+    Superseded versions of an entry are pruned once a new version is
+    stored, such that the cache does not grow without bound.
+
+    The data-quality validation report of each source file is also
+    stored as a JSON file within its entry, such that unmodified data
+    is not re-validated on every backtest construction.
+
+    Parameters
+    ----------
+    cache_dir : `str`
+        The full path to the directory in which to store the cache.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self._prune_unversioned_entries()
+
+    def _prune_unversioned_entries(self):
+        """
+        Remove any entries stored directly under their key, rather
+        than within a versioned directory, as written by previous
+        cache versions prior to the versioning of entries.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, name)
+            if os.path.isdir(os.path.join(entry_dir, 'bar')):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+
+    def _cache_key(
+        self, file_path, adjust_prices, price_dtype=None, session_times=None
+    ):
+        """
+        Create the cache key of a source file, which is independent
+        of the version of the source file.
+
+        Parameters
+        ----------
+        file_path : `str`
+            The full path to the source file.
+        adjust_prices : `Boolean`
+            Whether the cached prices are adjusted for corporate actions.
+        price_dtype : `str` or `np.dtype`, optional
+            The dtype of compact mid prices, if utilised.
+        session_times : `tuple(str)`, optional
+            The market open and close times, and any exchange calendar
+            name, of the cached bid/ask prices, if not the default
+            session times.
+
+        Returns
+        -------
+        `str`
+            The cache key.
+        """
+        if price_dtype is not None:
+            price_dtype = np.dtype(price_dtype).str
+        key = '%s|%s|%s' % (
+            os.path.abspath(file_path), adjust_prices, price_dtype
+        )
+        if session_times is not None:
+            key += '|%s' % '|'.join(session_times)
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _entry_version(file_path):
+        """
+        Create the version of the cache entry of a source file, from
+        its modification time and size along with the cache version.
+
+        Parameters
+        ----------
+        file_path : `str`
+            The full path to the source file.
+
+        Returns
+        -------
+        `str`
+            The entry version.
+        """
+        stat = os.stat(file_path)
+        return 'v%s-%s-%s' % (CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+
+    def _entry_dir(
+        self, file_path, adjust_prices, price_dtype=None, session_times=None
+    ):
+        """
+        Obtain the directory of the current version of the cache
+        entry for a source file.
+
+        Parameters
+        ----------
+        file_path : `str`
+            The full path to the source file.
+        adjust_prices : `Boolean`
+            Whether the cached prices are adjusted for corporate actions.
+        price_dtype : `str` or `np.dtype`, optional
+            The dtype of compact mid prices, if utilised.
+        session_times : `tuple(str)`, optional
+            The market open and close times, and any exchange calendar
+            name, of the cached bid/ask prices, if not the default
+            session times.
+
+        Returns
+        -------
+        `str`
+            The full path to the cache entry directory.
+        """
+        return os.path.join(
+            self.cache_dir,
+            self._cache_key(
+                file_path, adjust_prices, price_dtype, session_times
+            ),
+            self._entry_version(file_path)
+        )
+
+    @staticmethod
+    def _prune_versions(entry_dir):
+        """
+        Remove all versions of a cache entry other than the provided
+        version, ignoring the temporary directories of entries that
+        are still being written.
+
+        Parameters
+        ----------
+        entry_dir : `str`
+            The full path to the current version of the entry.
+        """
+        key_dir, version = os.path.split(entry_dir)
+        for name in os.listdir(key_dir):
+            if name != version and '.tmp.' not in name:
+                shutil.rmtree(os.path.join(key_dir, name), ignore_errors=True)
+
+    @staticmethod
+    def _save_frame(frame_dir, df):
+        """
+        Save a timestamp-indexed DataFrame as a directory of
+        column '.npy' files.
+
+        Parameters
+        ----------
+        frame_dir : `str`
+            The directory in which to store the DataFrame.
+        df : `pd.DataFrame`
+            The UTC timestamp-indexed DataFrame to store.
+        """
+        os.makedirs(frame_dir)
+        np.save(os.path.join(frame_dir, 'index.npy'), df.index.asi8)
+        for idx, column in enumerate(df.columns):
+            np.save(
+                os.path.join(frame_dir, '%s.npy' % idx),
+                df[column].to_numpy()
+            )
+        meta = {'index_name': df.index.name, 'columns': list(df.columns)}
+        with open(os.path.join(frame_dir, 'meta.json'), 'w') as meta_file:
+            json.dump(meta, meta_file)
+
+    @staticmethod
+    def _load_frame(frame_dir):
+        """
+        Load a timestamp-indexed DataFrame from a directory of
+        memory-mapped column '.npy' files.
+
+        Parameters
+        ----------
+        frame_dir : `str`
+            The directory in which the DataFrame is stored.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The UTC timestamp-indexed DataFrame.
+        """
+        with open(os.path.join(frame_dir, 'meta.json'), 'r') as meta_file:
+            meta = json.load(meta_file)
+        index = pd.DatetimeIndex(
+            np.load(os.path.join(frame_dir, 'index.npy')), name=meta['index_name']
+        ).tz_localize('UTC')
+        columns = {
+            column: np.load(
+                os.path.join(frame_dir, '%s.npy' % idx), mmap_mode='r'
+            )
+            for idx, column in enumerate(meta['columns'])
+        }
+        return pd.DataFrame(columns, index=index, columns=meta['columns'])
+
+    def load(
+        self, file_path, adjust_prices, price_dtype=None, session_times=None
+    ):
+        """
+        Load the cached bar and bid/ask DataFrames of a source file.
+
+        Parameters
+        ----------
+        file_path : `str`
+            The full path to the source file.
+        adjust_prices : `Boolean`
+            Whether the cached prices are adjusted for corporate actions.
+        price_dtype : `str` or `np.dtype`, optional
+            The dtype of compact mid prices, if utilised.
+        session_times : `tuple(str)`, optional
+            The market open and close times, and any exchange calendar
+            name, of the cached bid/ask prices, if not the default
+            session times.
+
+        Returns
+        -------
+        `tuple(pd.DataFrame, pd.DataFrame)` or None
+            The bar and bid/ask DataFrames, or None if the source
+            file has not been cached.
+        """
+        entry_dir = self._entry_dir(
+            file_path, adjust_prices, price_dtype, session_times
+        )
+        bar_dir = os.path.join(entry_dir, 'bar')
+        bid_ask_dir = os.path.join(entry_dir, 'bid_ask')
+        try:
+            return (self._load_frame(bar_dir), self._load_frame(bid_ask_dir))
+        except FileNotFoundError:
+            # Not cached, or pruned by a concurrent update of the source
+            return None
+
+    def save(
+        self, file_path, adjust_prices, bar_df, bid_ask_df, price_dtype=None,
+        session_times=None
+    ):
+        """
+        Store the bar and bid/ask DataFrames of a source file.
+
+        DataFrames containing non-numeric columns are not cached.
+
+        Parameters
+        ----------
+        file_path : `str`
+            The full path to the source file.
+        adjust_prices : `Boolean`
+            Whether the cached prices are adjusted for corporate actions.
+        bar_df : `pd.DataFrame`
+            The daily 'bar' OHLCV DataFrame.
+        bid_ask_df : `pd.DataFrame`
+            The individually-timestamped bid/ask DataFrame.
+        price_dtype : `str` or `np.dtype`, optional
+            The dtype of compact mid prices, if utilised.
+        session_times : `tuple(str)`, optional
+            The market open and close times, and any exchange calendar
+            name, of the cached bid/ask prices, if not the default
+            session times.
+
+        Returns
+        -------
+        `Boolean`
+            Whether the DataFrames were cached.
+        """
+        for df in (bar_df, bid_ask_df):
+            if not all(
+                np.issubdtype(dtype, np.number) for dtype in df.dtypes
+            ):
+                return False
+
+        entry_dir = self._entry_dir(
+            file_path, adjust_prices, price_dtype, session_times
+        )
+
+        # Write to a temporary directory first, which is then moved
+        # into place atomically, such that a partially written entry
+        # is never loaded and a visible entry is never modified
+        tmp_dir = '%s.tmp.%s' % (entry_dir, os.getpid())
+        if os.path.exists(tmp_dir):
+            shutil.rmtree(tmp_dir)
+        self._save_frame(os.path.join(tmp_dir, 'bar'), bar_df)
+        self._save_frame(os.path.join(tmp_dir, 'bid_ask'), bid_ask_df)
+        try:
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            # The same version of the entry has already been cached,
+            # possibly concurrently by another process, and is retained
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self._prune_versions(entry_dir)
+        return True
+
+    def load_report(
+        self, file_path, adjust_prices, params, price_dtype=None,
+        session_times=None
+    ):
+        """
+        Load the cached validation report of a source file.
+
+        Parameters
+        ----------
+        file_path : `str`
+            The full path to the source file.
+        adjust_prices : `Boolean`
+            Whether the cached prices are adjusted for corporate actions.
+        params : `dict`
+            The parameters of the validation, which must match those
+            of the cached report.
+        price_dtype : `str` or `np.dtype`, optional
+            The dtype of compact mid prices, if utilised.
+        session_times : `tuple(str)`, optional
+            The market open and close times, and any exchange calendar
+            name, of the cached bid/ask prices, if not the default
+            session times.
+
+        Returns
+        -------
+        `dict` or None
+            The validation report, or None if the source file has not
+            been validated with the provided parameters.
+        """
+        report_path = os.path.join(
+            self._entry_dir(
+                file_path, adjust_prices, price_dtype, session_times
+            ),
+            'validation.json'
+        )
+        if not os.path.exists(report_path):
+            return None
+        with open(report_path, 'r') as report_file:
+            cached = json.load(report_file)
+        if cached['params'] != params:
+            return None
+        return cached['report']
+
+    def save_report(
+        self, file_path, adjust_prices, params, report, price_dtype=None,
+        session_times=None
+    ):
+        """
+        Store the validation report of a source file within its
+        cache entry. Reports are not cached for source files whose
+        DataFrames are not cached.
+
+        Parameters
+        ----------
+        file_path : `str`
+            The full path to the source file.
+        adjust_prices : `Boolean`
+            Whether the cached prices are adjusted for corporate actions.
+        params : `dict`
+            The parameters of the validation.
+        report : `dict`
+            The JSON serialisable validation report.
+        price_dtype : `str` or `np.dtype`, optional
+            The dtype of compact mid prices, if utilised.
+        session_times : `tuple(str)`, optional
+            The market open and close times, and any exchange calendar
+            name, of the cached bid/ask prices, if not the default
+            session times.
+
+        Returns
+        -------
+        `Boolean`
+            Whether the report was cached.
+        """
+        entry_dir = self._entry_dir(
+            file_path, adjust_prices, price_dtype, session_times
+        )
+        if not os.path.exists(entry_dir):
+            return False
+        report_path = os.path.join(entry_dir, 'validation.json')
+
+        # Write to a temporary file first such that a partially
+        # written report is never loaded
+        tmp_path = '%s.tmp.%s' % (report_path, os.getpid())
+        with open(tmp_path, 'w') as report_file:
+            json.dump({'params': params, 'report': report}, report_file)
+        os.replace(tmp_path, report_path)
+        return True
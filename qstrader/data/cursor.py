@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+
+class BarCursor(object):
+    """
+    Tracks the current row position within the sorted timestamps
+    of each asset as the simulation time advances monotonically,
+    such that price lookups at the current simulation time avoid
+    a binary search over the full history.
+
+    Positions are only advanced when an asset is queried at the
+    current cursor time, moving forward from the previously
+    tracked position. Queries at any other time fall back to a
+    binary search, while moving the cursor backwards in time
+    discards all tracked positions.
+    """
+
+    def __init__(self):
+        self.dt_ns = None
+        self.positions = {}
+
+    def advance(self, dt):
+        """
+        Move the cursor to the provided simulation time.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The current simulation time.
+        """
+        dt_ns = pd.Timestamp(dt).value
+        if self.dt_ns is not None and dt_ns < self.dt_ns:
+            # Positions are only valid for monotonically increasing time
+            self.positions = {}
+        self.dt_ns = dt_ns
+
+    def locate(self, key, timestamps, dt_ns):
+        """
+        Obtain the row that is current at the provided time, i.e.
+        the last row whose timestamp does not exceed it.
+
+        Parameters
+        ----------
+        key : `str`
+            The key of the tracked position, e.g. the asset symbol.
+        timestamps : `np.ndarray`
+            The sorted int64 nanosecond timestamps.
+        dt_ns : `int`
+            The nanosecond timestamp to locate.
+
+        Returns
+        -------
+        `int`
+            The row position, or -1 if prior to the first timestamp.
+        """
+        if dt_ns != self.dt_ns:
+            return int(np.searchsorted(timestamps, dt_ns, side='right')) - 1
+
+        row = self.positions.get(key, -1)
+        num_rows = len(timestamps)
+        if row + 1 < num_rows and timestamps[row + 1] <= dt_ns:
+            if row + 2 < num_rows and timestamps[row + 2] <= dt_ns:
+                # Advanced beyond the next row, so search the remainder
+                start = max(row, 0)
+                row = start + int(
+                    np.searchsorted(timestamps[start:], dt_ns, side='right')
+                ) - 1
+            else:
+                row += 1
+        self.positions[key] = row
+        return row
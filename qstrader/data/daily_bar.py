@@ -0,0 +1,1119 @@
+import numpy as np
+import pandas as pd
+import pytz
+
+from qstrader import settings
+from qstrader.asset.registry import asset_registry
+from qstrader.data.cursor import BarCursor
+from qstrader.data.price_cache import PriceCache
+from qstrader.data.price_store import ArrayPriceStore
+from qstrader.data.validation import BarDataValidator
+from qstrader.exchange.exchange_calendar import (
+    DEFAULT_MARKET_CLOSE, DEFAULT_MARKET_OPEN
+)
+
+
+class DailyBarDataSource(object):
+    """
+    Encapsulates the preparation and querying of daily 'bar' OHLCV
+    data. The bars of each asset are converted into an intraday
+    timestamped Pandas DataFrame with opening and closing prices.
+
+    Subclasses are responsible for loading the bars of each asset
+    (e.g. from CSV files or a database) into the `asset_bar_frames`
+    and `asset_bid_ask_frames` dictionaries, before calling
+    `_prepare_price_data`. The raw bars should be validated, via
+    `_check_bar_frames`, prior to being sorted, adjusted and converted
+    (as in `_convert_bar_frames`), otherwise the loaded bars are
+    validated by `_prepare_price_data`.
+
+    Optionally utilises adjusted closing prices (if available) to
+    adjust both the close and open.
+
+    Parameters
+    ----------
+    asset_type : `str`
+        The asset type that the price/volume data is for.
+        TODO: Unused at this stage and currently hardcoded to Equity.
+    adjust_prices : `Boolean`, optional
+        Whether to utilise corporate-action adjusted prices for both
+        the open and closing prices. Defaults to True.
+    array_store : `Boolean`, optional
+        Whether to additionally hold all bid/ask prices within a single
+        time x asset `ArrayPriceStore`, which is used to answer bid/ask
+        queries. Defaults to False.
+    price_dtype : `str` or `np.dtype`, optional
+        If provided, stores the (identical) bid and ask prices as a
+        single 'Mid' price column of this dtype, e.g. 'float32' to
+        quarter the memory of the bid/ask prices. Defaults to None,
+        meaning separate double precision 'Bid' and 'Ask' columns.
+    max_precision_error : `float`, optional
+        If provided, the maximum relative pricing error permitted to
+        be introduced by the price dtype, validated upon loading.
+    price_cache_size : `int`, optional
+        The maximum number of bid and of ask prices to cache for
+        repeated queries. Defaults to 1024 * 1024. If None the
+        caches are unbounded, while if zero no prices are cached.
+    validate_data : `Boolean`, optional
+        Whether to check the quality of all loaded bars prior to their
+        usage, raising an error for missing pricing columns, duplicate
+        or unsorted dates and non-positive prices. Defaults to True.
+    max_gap_days : `int`, optional
+        The maximum number of calendar days between consecutive bars
+        before the gap is reported by the validation. Defaults to 7.
+    market_open : `str`, optional
+        The (UTC) time of the opening price of each bar, in 'HH:MM:SS'
+        format. Defaults to '14:30:00'.
+    market_close : `str`, optional
+        The (UTC) time of the closing price of each bar, in 'HH:MM:SS'
+        format. Defaults to '21:00:00'.
+    calendar : `ExchangeCalendar`, optional
+        If provided, the opening and closing prices of each bar are
+        timestamped at the market open and close times of its session
+        within the exchange calendar, e.g. at the early close time of
+        early close sessions, in place of the market open and close
+        times parameters.
+    registry : `AssetRegistry`, optional
+        The registry of the asset IDs keying the price caches, in
+        which the loaded assets are registered. Defaults to the shared
+        registry.
+    """
+
+    def __init__(
+        self, asset_type, adjust_prices=True, array_store=False,
+        price_dtype=None, max_precision_error=None,
+        price_cache_size=1024 * 1024, validate_data=True, max_gap_days=7,
+        market_open=DEFAULT_MARKET_OPEN, market_close=DEFAULT_MARKET_CLOSE,
+        calendar=None, registry=None
+    ):
+        if calendar is not None:
+            market_open = calendar.market_open
+            market_close = calendar.market_close
+        self.market_open = pd.Timedelta(market_open)
+        self.market_close = pd.Timedelta(market_close)
+        if not (
+            pd.Timedelta(0) <= self.market_open < self.market_close <
+            pd.Timedelta(days=1)
+        ):
+            raise ValueError(
+                "Market open time '%s' must precede the market close time "
+                "'%s' within the same day." % (market_open, market_close)
+            )
+
+        self.calendar = calendar
+        self.asset_type = asset_type
+        self.adjust_prices = adjust_prices
+        self.array_store = array_store
+        self.price_dtype = price_dtype
+        self.max_precision_error = max_precision_error
+        if self.price_dtype is not None:
+            self.bid_column = 'Mid'
+            self.ask_column = 'Mid'
+        else:
+            self.bid_column = 'Bid'
+            self.ask_column = 'Ask'
+
+        self.lazy = False
+        self.asset_streams = None
+        self.asset_bar_frames = {}
+        self.asset_bid_ask_frames = {}
+        self.precision_errors = None
+        self.price_store = None
+        self.close_panels = {}
+
+        self.validate_data = validate_data
+        self.validator = BarDataValidator(max_gap_days=max_gap_days)
+        self.validation_report = None
+
+        self.price_cache_size = price_cache_size
+        self.registry = registry if registry is not None else asset_registry
+        self.bid_cache = PriceCache(max_size=price_cache_size)
+        self.ask_cache = PriceCache(max_size=price_cache_size)
+        self.cursor = BarCursor()
+
+    def _prepare_price_data(self):
+        """
+        Validate the quality and precision of, and optionally create
+        the price store from, the loaded DataFrames. The quality of
+        the loaded bars is only validated here if the raw bars were
+        not validated while being loaded.
+        """
+        if self.validation_report is None:
+            self.validation_report = self._check_bar_data()
+        self.registry.get_ids(list(self.asset_bid_ask_frames))
+        self.precision_errors = self._check_price_precision()
+        self.price_store = self._create_price_store()
+
+    @property
+    def session_times(self):
+        """
+        The market open and close times of the opening and closing
+        prices of each bar, along with the name of any exchange
+        calendar, if not the default session times.
+
+        Returns
+        -------
+        `tuple(str)` or None
+            The open and close times, e.g. ('13:30:00', '20:00:00'),
+            followed by the calendar name if utilised, or None if the
+            default session times are utilised.
+        """
+        if self.calendar is None and (self.market_open, self.market_close) == (
+            pd.Timedelta(DEFAULT_MARKET_OPEN),
+            pd.Timedelta(DEFAULT_MARKET_CLOSE)
+        ):
+            return None
+        session_times = (
+            str(self.market_open).split(' ')[-1],
+            str(self.market_close).split(' ')[-1]
+        )
+        if self.calendar is not None:
+            session_times += (self.calendar.name,)
+        return session_times
+
+    def _obtain_asset_symbol(self, symbol):
+        """
+        Return the QSTrader symbology for the asset.
+
+        TODO: Remove hardcoding to Equity asset types.
+
+        Parameters
+        ----------
+        symbol : `str`
+            The ticker symbol of the asset, e.g. 'SPY'.
+
+        Returns
+        -------
+        `str`
+            The QSTrader symbology of the asset. e.g. 'EQ:SPY'.
+        """
+        return 'EQ:%s' % symbol
+
+    def _split_bars_by_symbol(self, bars_df, symbol_column='Symbol'):
+        """
+        Split a long-format DataFrame of the daily 'bars' of many
+        assets, with a date column and a symbol column, into the
+        date-indexed bar DataFrames of each asset, localised to UTC.
+
+        Parameters
+        ----------
+        bars_df : `pd.DataFrame`
+            The long-format daily 'bar' DataFrame.
+        symbol_column : `str`, optional
+            The name of the symbol column.
+
+        Returns
+        -------
+        `dict{str: pd.DataFrame}`
+            The asset-symbol keyed dictionary of bar DataFrames.
+        """
+        bars_df = bars_df.copy()
+        bars_df['Date'] = pd.to_datetime(bars_df['Date'])
+        bar_frames = {}
+        for symbol, bar_df in bars_df.groupby(symbol_column, sort=True):
+            # The bars retain their original order, such that any
+            # unsorted dates are reported by the validation
+            bar_df = bar_df.drop(columns=symbol_column).set_index('Date')
+
+            # Ensure all timestamps are set to UTC for consistency
+            if bar_df.index.tz is None:
+                bar_df = bar_df.set_index(bar_df.index.tz_localize(pytz.UTC))
+            bar_frames[self._obtain_asset_symbol(symbol)] = bar_df
+        return bar_frames
+
+    def _convert_bar_frames(self, bar_frames):
+        """
+        Adjust each of the daily 'bar' DataFrames and convert them into
+        individually-timestamped open/closing price DataFrames.
+
+        If data validation is utilised the raw bars of all assets are
+        validated first, raising a single error describing every invalid
+        asset, prior to any bars being sorted, adjusted or converted.
+
+        Parameters
+        ----------
+        bar_frames : `dict{str: pd.DataFrame}`
+            The asset-symbol keyed dictionary of bar DataFrames.
+
+        Returns
+        -------
+        `tuple(dict{pd.DataFrame}, dict{pd.DataFrame})`
+            The asset-symbol keyed dictionaries of bar DataFrames
+            and of bid/ask DataFrames.
+        """
+        self.validation_report = self._check_bar_frames(bar_frames)
+
+        asset_bar_frames = {}
+        asset_bid_ask_frames = {}
+        for asset_symbol, bar_df in bar_frames.items():
+            bar_df = self._adjust_bar_frame(bar_df.sort_index())
+            asset_bar_frames[asset_symbol] = bar_df
+            asset_bid_ask_frames[asset_symbol] = \
+                self._convert_bar_frame_into_bid_ask_df(bar_df)
+        return asset_bar_frames, asset_bid_ask_frames
+
+    def _adjust_bar_frame(self, bar_df):
+        """
+        Adds the corporate-action adjustment factor of each bar, along
+        with the correspondingly adjusted opening price, to the daily
+        'bar' DataFrame, using any provided 'Adjusted Close' column.
+
+        The adjustment factors are stored alongside the raw bars such
+        that both raw and adjusted prices can be obtained without
+        recomputation, and such that appending bars only requires the
+        factors of the new bars to be calculated.
+
+        The bars are expected to have been validated beforehand, such
+        that missing pricing columns are described by the validation
+        report of all assets. The errors raised here for missing
+        columns only apply if data validation is not utilised.
+
+        Parameters
+        ----------
+        bar_df : `pd.DataFrame`
+            The daily 'bar' OHLCV DataFrame.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The daily 'bar' DataFrame with 'Adj Factor' and 'Adj Open'
+            columns, if an 'Adj Close' column is available.
+        """
+        if 'Adj Close' not in bar_df.columns:
+            if self.adjust_prices:
+                raise ValueError(
+                    "Unable to locate Adjusted Close pricing column in "
+                    "daily bar data. "
+                    "Prices cannot be adjusted. Exiting."
+                )
+            return bar_df
+
+        adj_close = bar_df['Adj Close'].to_numpy(dtype=np.float64)
+        close = bar_df['Close'].to_numpy(dtype=np.float64)
+        adj_factor = adj_close / close
+        return bar_df.assign(**{
+            'Adj Factor': adj_factor,
+            'Adj Open': adj_factor * bar_df['Open'].to_numpy(dtype=np.float64)
+        })
+
+    def _obtain_session_offsets(self, dates):
+        """
+        Obtain the offsets from midnight of the opening and closing
+        prices of the bars of each of the provided dates.
+
+        Parameters
+        ----------
+        dates : `pd.DatetimeIndex`
+            The (midnight) dates of the bars.
+
+        Returns
+        -------
+        `tuple(np.ndarray, np.ndarray)`
+            The int64 nanosecond offsets of the open and close prices.
+        """
+        open_offsets = np.full(len(dates), self.market_open.value)
+        close_offsets = np.full(len(dates), self.market_close.value)
+        if self.calendar is None or len(dates) == 0:
+            return open_offsets, close_offsets
+
+        # Bars on dates that are not exchange sessions retain
+        # the regular market open and close times
+        if dates.tz is not None:
+            dates = dates.tz_convert('UTC').tz_localize(None)
+        sessions = self.calendar.sessions(dates[0], dates[-1])
+        session_idx = sessions.index.get_indexer(dates)
+        found = session_idx >= 0
+        midnights = dates.asi8[found]
+        open_offsets[found] = (
+            sessions['market_open'].array.asi8[session_idx[found]] - midnights
+        )
+        close_offsets[found] = (
+            sessions['market_close'].array.asi8[session_idx[found]] - midnights
+        )
+        return open_offsets, close_offsets
+
+    def _interleave_bar_prices(self, bar_df):
+        """
+        Interleaves the open and closing prices of the daily OHLCV
+        'bars' into individually timestamped double precision prices.
+
+        Optionally utilises the corporate-action adjusted open/close
+        prices, which are calculated if not already present.
+
+        Parameters
+        ----------
+        `pd.DataFrame`
+            The daily 'bar' OHLCV DataFrame.
+
+        Returns
+        -------
+        `tuple(pd.DatetimeIndex, np.ndarray)`
+            The timestamps and the open/closing prices, optionally
+            adjusted for corporate actions.
+        """
+        bar_df = bar_df.sort_index()
+        if self.adjust_prices:
+            if 'Adj Open' not in bar_df.columns:
+                bar_df = self._adjust_bar_frame(bar_df)
+            open_prices = bar_df['Adj Open'].to_numpy(dtype=np.float64)
+            close_prices = bar_df['Adj Close'].to_numpy(dtype=np.float64)
+        else:
+            open_prices = bar_df['Open'].to_numpy(dtype=np.float64)
+            close_prices = bar_df['Close'].to_numpy(dtype=np.float64)
+
+        # Interleave the open/close prices into separate, appropriately
+        # timestamped rows. As the bars are sorted the interleaved
+        # timestamps are also sorted, so no further sort is necessary.
+        num_prices = 2 * len(bar_df)
+        open_offsets, close_offsets = self._obtain_session_offsets(bar_df.index)
+        timestamps = np.repeat(bar_df.index.asi8, 2)
+        timestamps[0::2] += open_offsets
+        timestamps[1::2] += close_offsets
+
+        prices = np.empty(num_prices, dtype=np.float64)
+        prices[0::2] = open_prices
+        prices[1::2] = close_prices
+
+        # Forward-fill any missing prices from the last available price
+        fill_idx = np.where(np.isnan(prices), 0, np.arange(num_prices))
+        np.maximum.accumulate(fill_idx, out=fill_idx)
+        prices = prices[fill_idx]
+
+        dates = pd.DatetimeIndex(timestamps, name='Date').tz_localize(
+            bar_df.index.tz
+        )
+        return dates, prices
+
+    def _convert_bar_frame_into_bid_ask_df(self, bar_df):
+        """
+        Converts the DataFrame from daily OHLCV 'bars' into a DataFrame
+        of open and closing price timestamps.
+
+        If a price dtype is provided, a single 'Mid' column of that
+        dtype is stored in place of the (identical) 'Bid' and 'Ask'
+        columns.
+
+        Parameters
+        ----------
+        `pd.DataFrame`
+            The daily 'bar' OHLCV DataFrame.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The individually-timestamped open/closing prices, optionally
+            adjusted for corporate actions.
+        """
+        dates, prices = self._interleave_bar_prices(bar_df)
+        if self.price_dtype is not None:
+            return pd.DataFrame(
+                {'Mid': prices.astype(self.price_dtype)}, index=dates
+            )
+
+        # TODO: Unable to distinguish between Bid/Ask, implement later
+        return pd.DataFrame({'Bid': prices, 'Ask': prices}, index=dates)
+
+    def _validate_bar_frame(self, asset, bar_df):
+        """
+        Check the quality of the daily 'bar' DataFrame of an asset.
+
+        Subclasses may override this in order to reuse previously
+        cached reports.
+
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol of the bars.
+        bar_df : `pd.DataFrame`
+            The daily 'bar' OHLCV DataFrame.
+
+        Returns
+        -------
+        `dict`
+            The validation report of the bars.
+        """
+        return self.validator.validate(
+            bar_df, adjust_prices=self.adjust_prices
+        )
+
+    def validate_bar_data(self):
+        """
+        Check the quality of the daily 'bar' DataFrames of all assets.
+
+        Lazily loaded and streamed bars are not validated, since this
+        would require all of the bars to be loaded.
+
+        Returns
+        -------
+        `dict{str: dict}`
+            The asset symbol keyed validation reports.
+        """
+        if self.lazy or self.asset_streams is not None:
+            return {}
+        return {
+            asset: self._validate_bar_frame(asset, bar_df)
+            for asset, bar_df in self.asset_bar_frames.items()
+        }
+
+    def _check_bar_data(self):
+        """
+        Validate the quality of the daily 'bar' DataFrames, if
+        requested, raising an error if any asset fails validation.
+
+        Returns
+        -------
+        `dict{str: dict}` or None
+            The asset symbol keyed validation reports, or None if
+            not validated.
+        """
+        if not self.validate_data:
+            return None
+        if settings.PRINT_EVENTS:
+            print("Validating daily bar data...")
+        report = self.validate_bar_data()
+        self.validator.check(report)
+        return report
+
+    def _check_bar_frames(self, bar_frames):
+        """
+        Validate the quality of the raw (i.e. unsorted and unadjusted)
+        daily 'bar' DataFrames, if requested, raising a single error
+        describing every asset that fails validation.
+
+        Parameters
+        ----------
+        bar_frames : `dict{str: pd.DataFrame}`
+            The asset-symbol keyed dictionary of raw bar DataFrames.
+
+        Returns
+        -------
+        `dict{str: dict}` or None
+            The asset symbol keyed validation reports, or None if
+            not validated.
+        """
+        if not self.validate_data:
+            return None
+        if settings.PRINT_EVENTS:
+            print("Validating daily bar data...")
+        report = {
+            asset: self._validate_bar_frame(asset, bar_df)
+            for asset, bar_df in bar_frames.items()
+        }
+        self.validator.check(report)
+        return report
+
+    def validate_price_precision(self):
+        """
+        Calculate the maximum relative pricing error of each asset
+        introduced by storing prices at the provided price dtype,
+        rather than at double precision.
+
+        Returns
+        -------
+        `dict{str: float}`
+            The asset symbol keyed maximum relative pricing errors.
+        """
+        precision_errors = {}
+        for asset, bar_df in self.asset_bar_frames.items():
+            _, prices = self._interleave_bar_prices(bar_df)
+            stored_prices = self.asset_bid_ask_frames[asset][
+                self.bid_column
+            ].to_numpy(dtype=np.float64)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                errors = np.abs(stored_prices - prices) / np.abs(prices)
+            errors = errors[np.isfinite(errors)]
+            precision_errors[asset] = (
+                float(errors.max()) if len(errors) > 0 else 0.0
+            )
+        return precision_errors
+
+    def _check_price_precision(self):
+        """
+        Validate the precision of the stored prices against the
+        maximum permitted relative pricing error, if provided.
+
+        Returns
+        -------
+        `dict{str: float}` or None
+            The asset symbol keyed maximum relative pricing errors,
+            or None if not validated.
+        """
+        if self.max_precision_error is None:
+            return None
+        precision_errors = self.validate_price_precision()
+        for asset, error in precision_errors.items():
+            if settings.PRINT_EVENTS:
+                print(
+                    "Maximum relative pricing error for '%s': %s" % (
+                        asset, error
+                    )
+                )
+            if error > self.max_precision_error:
+                raise ValueError(
+                    "Maximum relative pricing error of '%s' for '%s' "
+                    "exceeds the permitted error of '%s'. Use a higher "
+                    "precision price dtype." % (
+                        error, asset, self.max_precision_error
+                    )
+                )
+        return precision_errors
+
+    def _create_price_store(self):
+        """
+        Create the time x asset array-backed price store from the
+        bid/ask DataFrames, if requested.
+
+        Returns
+        -------
+        `ArrayPriceStore` or None
+            The price store, or None if not utilised.
+        """
+        if not self.array_store:
+            return None
+        if settings.PRINT_EVENTS:
+            print("Creating array-backed price store...")
+        return ArrayPriceStore.from_bid_ask_frames(self.asset_bid_ask_frames)
+
+    def append_bars(self, asset, bar_df):
+        """
+        Append new daily 'bars' of an asset, such as the latest
+        day of data in a nightly run, without reprocessing the
+        existing bars.
+
+        Only the adjustment factors and bid/ask prices of the new
+        bars are calculated. The appended bars are assumed to be
+        adjusted consistently with the existing bars, i.e. any
+        corporate action requiring the restatement of historical
+        adjusted prices necessitates a reload of the data. If data
+        validation is utilised the new bars are validated prior to
+        being appended.
+
+        When appending the bars of many assets use `append_bar_frames`,
+        which extends the price store once for all of the assets.
+
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol.
+        bar_df : `pd.DataFrame`
+            The new daily 'bar' OHLCV DataFrame, indexed by date,
+            with all dates after the existing bars of the asset.
+        """
+        self.append_bar_frames({asset: bar_df})
+
+    def append_bar_frames(self, bar_frames):
+        """
+        Append new daily 'bars' of a set of assets at once. See
+        `append_bars` for details.
+
+        The bars of every asset are validated and checked to follow
+        the existing bars before any are appended, such that the data
+        source is left unmodified if any are invalid. The array-backed
+        price store, if utilised, is then extended in place with the
+        new prices rather than being recreated.
+
+        Parameters
+        ----------
+        bar_frames : `dict{str: pd.DataFrame}`
+            The asset symbol keyed new daily 'bar' OHLCV DataFrames,
+            indexed by date, with all dates after the existing bars
+            of each asset.
+        """
+        if self.lazy or self.asset_streams is not None:
+            raise ValueError(
+                "Unable to append bars to a lazily loaded or streamed "
+                "data source."
+            )
+
+        # Validate the raw bars prior to sorting and adjusting them
+        if self.validate_data:
+            self.validator.check({
+                asset: self.validator.validate(
+                    bar_df, adjust_prices=self.adjust_prices
+                ) for asset, bar_df in bar_frames.items()
+            })
+
+        new_bar_frames = {}
+        for asset, bar_df in bar_frames.items():
+            bar_df = bar_df.sort_index()
+            if bar_df.index.tz is None:
+                bar_df = bar_df.set_index(bar_df.index.tz_localize(pytz.UTC))
+            existing_bar_df = self.asset_bar_frames.get(asset)
+            if existing_bar_df is not None and len(existing_bar_df) > 0 and \
+                    len(bar_df) > 0 and \
+                    bar_df.index[0] <= existing_bar_df.index[-1]:
+                raise ValueError(
+                    "Unable to append bars for '%s' starting at '%s' as "
+                    "they do not follow the existing bars ending at "
+                    "'%s'." % (
+                        asset, bar_df.index[0], existing_bar_df.index[-1]
+                    )
+                )
+            new_bar_frames[asset] = bar_df
+
+        new_bid_ask_frames = {}
+        for asset, bar_df in new_bar_frames.items():
+            bar_df = self._adjust_bar_frame(bar_df)
+            bid_ask_df = self._convert_bar_frame_into_bid_ask_df(bar_df)
+            if asset in self.asset_bar_frames:
+                existing_bid_ask_df = self.asset_bid_ask_frames[asset]
+                if len(existing_bid_ask_df) > 0:
+                    # Forward-fill any leading missing prices of the new
+                    # bars from the last existing price
+                    bid_ask_df = bid_ask_df.fillna(
+                        existing_bid_ask_df.iloc[-1]
+                    )
+                self.asset_bar_frames[asset] = pd.concat(
+                    [self.asset_bar_frames[asset], bar_df]
+                )
+                self.asset_bid_ask_frames[asset] = pd.concat(
+                    [existing_bid_ask_df, bid_ask_df]
+                )
+            else:
+                self.asset_bar_frames[asset] = bar_df
+                self.asset_bid_ask_frames[asset] = bid_ask_df
+                self.registry.get_id(asset)
+            new_bid_ask_frames[asset] = bid_ask_df
+
+        # Invalidate all data derived from the previous bars
+        self.close_panels.clear()
+        self.bid_cache.clear()
+        self.ask_cache.clear()
+        if self.price_store is not None and \
+                not self.price_store.append(new_bid_ask_frames):
+            self.price_store = self._create_price_store()
+
+    def has_asset(self, asset):
+        """
+        Whether the data source provides prices for an asset.
+
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol.
+
+        Returns
+        -------
+        `Boolean`
+            Whether the asset is provided by the data source.
+        """
+        return asset in self.asset_bid_ask_frames
+
+    def _get_cached_price(self, cache, price_func, dt, asset):
+        """
+        Obtain a price from the provided cache, falling back to
+        the provided price query method on a cache miss.
+
+        Parameters
+        ----------
+        cache : `PriceCache`
+            The cache of previously queried prices.
+        price_func : `callable`
+            The uncached single asset price query method.
+        dt : `pd.Timestamp`
+            When to obtain the price for.
+        asset : `str`
+            The asset symbol to obtain the price for.
+
+        Returns
+        -------
+        `float`
+            The price.
+        """
+        asset_idx = self.registry.get(asset)
+        if self.price_cache_size == 0 or asset_idx is None:
+            # Queries of unknown assets are neither cached nor registered
+            return price_func(dt, asset)
+        dt_ns = pd.Timestamp(dt).value
+        price = cache.get(dt_ns, asset_idx)
+        if price is None:
+            price = price_func(dt, asset)
+            cache.put(dt_ns, asset_idx, price)
+        return price
+
+    def advance(self, dt):
+        """
+        Advance the cursor of the data source to the current
+        simulation time, such that subsequent price queries at
+        this time are answered from the tracked row positions.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The current simulation time.
+        """
+        self.cursor.advance(dt)
+
+    def _get_frame_price(self, dt, asset, column):
+        """
+        Obtain the price of an asset at the provided timestamp from
+        its bid/ask DataFrame, i.e. the last price at or prior to it.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the price for.
+        asset : `str`
+            The asset symbol to obtain the price for.
+        column : `str`
+            The price column of the bid/ask DataFrame.
+
+        Returns
+        -------
+        `float`
+            The price, or NaN if prior to the start date.
+        """
+        bid_ask_df = self.asset_bid_ask_frames[asset]
+        row = self.cursor.locate(
+            asset, bid_ask_df.index.asi8, pd.Timestamp(dt).value
+        )
+        if row < 0:  # Before start date
+            return np.NaN
+        return float(bid_ask_df.iat[row, bid_ask_df.columns.get_loc(column)])
+
+    def _get_bid(self, dt, asset):
+        """
+        Obtain the uncached bid price of an asset at the provided
+        timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the bid price for.
+        asset : `str`
+            The asset symbol to obtain the bid price for.
+
+        Returns
+        -------
+        `float`
+            The bid price.
+        """
+        if self.price_store is not None:
+            return self.price_store.get_bid(dt, asset)
+        if self.asset_streams is not None:
+            return self.asset_streams[asset].get_bid(dt)
+        return self._get_frame_price(dt, asset, self.bid_column)
+
+    def _get_ask(self, dt, asset):
+        """
+        Obtain the uncached ask price of an asset at the provided
+        timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the ask price for.
+        asset : `str`
+            The asset symbol to obtain the ask price for.
+
+        Returns
+        -------
+        `float`
+            The ask price.
+        """
+        if self.price_store is not None:
+            return self.price_store.get_ask(dt, asset)
+        if self.asset_streams is not None:
+            return self.asset_streams[asset].get_ask(dt)
+        return self._get_frame_price(dt, asset, self.ask_column)
+
+    def get_bid(self, dt, asset):
+        """
+        Obtain the bid price of an asset at the provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the bid price for.
+        asset : `str`
+            The asset symbol to obtain the bid price for.
+
+        Returns
+        -------
+        `float`
+            The bid price.
+        """
+        return self._get_cached_price(self.bid_cache, self._get_bid, dt, asset)
+
+    def get_ask(self, dt, asset):
+        """
+        Obtain the ask price of an asset at the provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the ask price for.
+        asset : `str`
+            The asset symbol to obtain the ask price for.
+
+        Returns
+        -------
+        `float`
+            The ask price.
+        """
+        return self._get_cached_price(self.ask_cache, self._get_ask, dt, asset)
+
+    def _get_prices(self, dt, assets, method):
+        """
+        Obtain the prices of a list of assets at the provided timestamp
+        by querying each asset individually. Assets without any
+        pricing data are returned as NaN.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the prices for.
+        method : `callable`
+            The single asset price query method.
+
+        Returns
+        -------
+        `np.ndarray`
+            The prices, in the order of the provided assets.
+        """
+        prices = np.full(len(assets), np.NaN)
+        for idx, asset in enumerate(assets):
+            try:
+                prices[idx] = method(dt, asset)
+            except KeyError:
+                prices[idx] = np.NaN
+        return prices
+
+    def get_bids(self, dt, assets):
+        """
+        Obtain the bid prices of a list of assets at the provided
+        timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the bid prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the bid prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The bid prices, in the order of the provided assets.
+        """
+        if self.price_store is not None:
+            return self.price_store.get_bids(dt, assets)
+        return self._get_prices(dt, assets, self.get_bid)
+
+    def get_asks(self, dt, assets):
+        """
+        Obtain the ask prices of a list of assets at the provided
+        timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the ask prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the ask prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The ask prices, in the order of the provided assets.
+        """
+        if self.price_store is not None:
+            return self.price_store.get_asks(dt, assets)
+        return self._get_prices(dt, assets, self.get_ask)
+
+    def _get_price_matrix(self, dts, assets, column, method):
+        """
+        Obtain the prices of a list of assets at each of a sorted list
+        of timestamps, searching the timestamps of each asset once for
+        all of the provided timestamps.
+
+        Streamed prices are queried at each timestamp in turn.
+
+        Parameters
+        ----------
+        dts : `list[pd.Timestamp]` or `pd.DatetimeIndex`
+            When to obtain the prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the prices for.
+        column : `str`
+            The price column of the bid/ask DataFrames.
+        method : `callable`
+            The multi-asset price query method, used for streamed prices.
+
+        Returns
+        -------
+        `np.ndarray`
+            The (timestamp x asset) prices, with NaN for assets
+            without any pricing data.
+        """
+        prices = np.full((len(dts), len(assets)), np.NaN)
+        if self.asset_streams is not None:
+            for row, dt in enumerate(dts):
+                prices[row] = method(dt, assets)
+            return prices
+
+        dts_ns = pd.DatetimeIndex(dts).asi8
+        for col, asset in enumerate(assets):
+            if asset not in self.asset_bid_ask_frames:
+                continue
+            bid_ask_df = self.asset_bid_ask_frames[asset]
+            rows = np.searchsorted(
+                bid_ask_df.index.asi8, dts_ns, side='right'
+            ) - 1
+            valid = rows >= 0
+            prices[valid, col] = bid_ask_df[column].to_numpy()[rows[valid]]
+        return prices
+
+    def get_bids_matrix(self, dts, assets):
+        """
+        Obtain the bid prices of a list of assets at each of a
+        list of timestamps.
+
+        Parameters
+        ----------
+        dts : `list[pd.Timestamp]` or `pd.DatetimeIndex`
+            When to obtain the bid prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the bid prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The (timestamp x asset) bid prices.
+        """
+        if self.price_store is not None:
+            return self.price_store.get_bids_matrix(dts, assets)
+        return self._get_price_matrix(
+            dts, assets, self.bid_column, self.get_bids
+        )
+
+    def get_asks_matrix(self, dts, assets):
+        """
+        Obtain the ask prices of a list of assets at each of a
+        list of timestamps.
+
+        Parameters
+        ----------
+        dts : `list[pd.Timestamp]` or `pd.DatetimeIndex`
+            When to obtain the ask prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the ask prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The (timestamp x asset) ask prices.
+        """
+        if self.price_store is not None:
+            return self.price_store.get_asks_matrix(dts, assets)
+        return self._get_price_matrix(
+            dts, assets, self.ask_column, self.get_asks
+        )
+
+    def _obtain_close_panel(self, assets, adjusted=False):
+        """
+        Obtain the aligned, date-indexed panel of closing prices with
+        asset symbols as columns, ensuring that it contains all of the
+        provided assets that have pricing data.
+
+        The panel is built once and subsequently only extended with
+        the closing prices of assets not already present within it.
+        Its prices are held within a single read-only array, such that
+        views of the panel returned to callers cannot modify it.
+
+        In lazy mode the panel retains the closing prices of every
+        asset ever loaded, irrespective of any eviction of the asset
+        DataFrames, and so is not bounded by `max_memory`.
+
+        Parameters
+        ----------
+        assets : `list[str]`
+            The list of asset symbols required within the panel.
+        adjusted : `Boolean`, optional
+            Whether to use corporate-action adjusted closing prices.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The multi-asset closing prices panel.
+        """
+        close_column = 'Adj Close' if adjusted else 'Close'
+        if self.asset_streams is not None:
+            # The retained streamed bars change as the simulation
+            # advances, so the panel cannot be reused between calls
+            self.close_panels.clear()
+        panel = self.close_panels.get(close_column)
+
+        missing_assets = [
+            asset for asset in assets
+            if asset in self.asset_bar_frames and (
+                panel is None or asset not in panel.columns
+            )
+        ]
+        if len(missing_assets) > 0:
+            close_series = [
+                self.asset_bar_frames[asset][close_column].rename(asset)
+                for asset in missing_assets
+            ]
+            if panel is not None:
+                close_series.insert(0, panel)
+            panel = pd.concat(close_series, axis=1).sort_index()
+            close_prices = panel.to_numpy()
+            close_prices.flags.writeable = False
+            panel = pd.DataFrame(
+                close_prices, index=panel.index, columns=panel.columns,
+                copy=False
+            )
+            self.close_panels[close_column] = panel
+
+        if panel is None:
+            panel = pd.DataFrame(index=pd.DatetimeIndex([], name='Date'))
+        return panel
+
+    def get_assets_historical_closes(
+        self, start_dt, end_dt, assets, adjusted=False
+    ):
+        """
+        Obtain a multi-asset historical range of closing prices as a DataFrame,
+        indexed by timestamp with asset symbols as columns.
+
+        The range is sliced from a cached aligned panel of closing prices,
+        such that no copy is made if all of the panel's assets are requested
+        (in the panel order) and none of the range's rows are missing. The
+        returned DataFrame may therefore be a read-only view of the panel,
+        which must be copied prior to any in-place modification.
+
+        In lazy mode the panel retains the closing prices of every loaded
+        asset and is not bounded by `max_memory`.
+
+        Parameters
+        ----------
+        start_dt : `pd.Timestamp`
+            The starting datetime of the range to obtain.
+        end_dt : `pd.Timestamp`
+            The ending datetime of the range to obtain.
+        assets : `list[str]`
+            The list of asset symbols to obtain closing prices for.
+        adjusted : `Boolean`, optional
+            Whether to use corporate-action adjusted closing prices.
+            Defaults to False.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The multi-asset closing prices DataFrame.
+        """
+        panel = self._obtain_close_panel(assets, adjusted=adjusted)
+        prices_df = panel.loc[start_dt:end_dt]
+
+        columns = [asset for asset in assets if asset in panel.columns]
+        if columns != list(panel.columns):
+            prices_df = prices_df[columns]
+
+        # Remove dates where none of the requested assets has a price
+        has_prices = prices_df.notna().any(axis=1).to_numpy()
+        if not has_prices.all():
+            prices_df = prices_df[has_prices]
+        return prices_df
@@ -1,17 +1,147 @@
+import concurrent.futures
 import functools
 import os
 import pathlib
 from pathlib import Path
 
-import numpy as np
 import pandas as pd
 import pytz
 from qstrader.asset.asset import Asset
 
 from qstrader import settings
+from qstrader.data.cache import BarDataCache
+from qstrader.data.daily_bar import (
+    DEFAULT_MARKET_CLOSE, DEFAULT_MARKET_OPEN, DailyBarDataSource
+)
+from qstrader.data.lazy_frames import LazyAssetFrameLoader, LazyAssetFrames
+from qstrader.data.streaming import StreamingAssetBars, StreamingAssetFrames
 
 
-class CSVDailyBarDataSource(object):
+def _read_csv_file(csv_path):
+    """
+    Loads a CSV file into a Pandas DataFrame with dates parsed
+    and localised to UTC. The rows retain their order within the
+    file, such that any unsorted dates can be validated.
+
+    Parameters
+    ----------
+    csv_path : `str`
+        The full path to the CSV file.
+
+    Returns
+    -------
+    `pd.DataFrame`
+        DataFrame of the CSV file with timestamps localised to UTC.
+    """
+    csv_df = pd.read_csv(csv_path, index_col='Date', parse_dates=True)
+
+    # Ensure all timestamps are set to UTC for consistency
+    return csv_df.set_index(csv_df.index.tz_localize(pytz.UTC))
+
+
+def _load_csv_file(
+    csv_path, adjust_prices=True, price_dtype=None,
+    market_open=DEFAULT_MARKET_OPEN, market_close=DEFAULT_MARKET_CLOSE,
+    calendar=None, validate_data=False, max_gap_days=7, cache_dir=None,
+    session_times=None
+):
+    """
+    Loads a CSV file of daily 'bars' into its bar DataFrame and its
+    individually-timestamped bid/ask DataFrame, validating the raw bars,
+    if requested, prior to them being sorted, adjusted and converted.
+
+    If a cache directory is provided the DataFrames, and validation
+    report, are loaded from the cache when available, otherwise they
+    are stored in it. Bars failing the validation are not converted.
+
+    This is a module-level function, taking every loading parameter
+    explicitly, such that loading CSV files within worker processes
+    only requires these parameters to be sent to each worker, rather
+    than the whole data source.
+
+    Parameters
+    ----------
+    csv_path : `str`
+        The full path to the CSV file.
+    adjust_prices : `Boolean`, optional
+        Whether to utilise corporate-action adjusted prices.
+    price_dtype : `str` or `np.dtype`, optional
+        The dtype of compact mid prices, if utilised.
+    market_open : `str`, optional
+        The (UTC) time of the opening price of each bar.
+    market_close : `str`, optional
+        The (UTC) time of the closing price of each bar.
+    calendar : `ExchangeCalendar`, optional
+        The exchange calendar determining the times of the opening
+        and closing prices of each bar, if utilised.
+    validate_data : `Boolean`, optional
+        Whether to validate the raw bars. Defaults to False.
+    max_gap_days : `int`, optional
+        The maximum number of calendar days between consecutive bars
+        before the gap is reported by the validation.
+    cache_dir : `str`, optional
+        The directory of the on-disk cache, if utilised.
+    session_times : `tuple(str)`, optional
+        The session times of the data source, keying the cache entry.
+
+    Returns
+    -------
+    `tuple(pd.DataFrame, pd.DataFrame, dict)`
+        The bar and bid/ask DataFrames, which are None if the bars
+        failed validation, along with the validation report, which
+        is None if not validated.
+    """
+    cache = BarDataCache(cache_dir) if cache_dir is not None else None
+    params = {'max_gap_days': max_gap_days}
+    if cache is not None:
+        cached_frames = cache.load(
+            csv_path, adjust_prices, price_dtype=price_dtype,
+            session_times=session_times
+        )
+        report = None
+        if cached_frames is not None and validate_data:
+            report = cache.load_report(
+                csv_path, adjust_prices, params, price_dtype=price_dtype,
+                session_times=session_times
+            )
+        if cached_frames is not None and (
+            report is not None or not validate_data
+        ):
+            return cached_frames + (report,)
+
+    # A bare data source, without any loaded bars, performs the
+    # conversion with the provided parameters
+    converter = DailyBarDataSource(
+        None, adjust_prices=adjust_prices, price_dtype=price_dtype,
+        price_cache_size=0, validate_data=validate_data,
+        max_gap_days=max_gap_days, market_open=market_open,
+        market_close=market_close, calendar=calendar
+    )
+    csv_df = _read_csv_file(csv_path)
+    report = None
+    if validate_data:
+        report = converter.validator.validate(
+            csv_df, adjust_prices=adjust_prices
+        )
+        if len(report['errors']) > 0:
+            return None, None, report
+
+    bar_df = converter._adjust_bar_frame(csv_df.sort_index())
+    bid_ask_df = converter._convert_bar_frame_into_bid_ask_df(bar_df)
+    if cache is not None:
+        cache.save(
+            csv_path, adjust_prices, bar_df, bid_ask_df,
+            price_dtype=price_dtype, session_times=session_times
+        )
+        if report is not None:
+            cache.save_report(
+                csv_path, adjust_prices, params, report,
+                price_dtype=price_dtype, session_times=session_times
+            )
+    return bar_df, bid_ask_df, report
+
+
+class CSVDailyBarDataSource(DailyBarDataSource):
     """
     Encapsulates loading, preparation and querying of CSV files of
     daily 'bar' OHLCV data. The CSV files are converted into a intraday
@@ -34,17 +164,150 @@ class CSVDailyBarDataSource(object):
         An optional list of CSV symbols to restrict the data source to.
         The alternative is to convert all CSVs found within the
         provided directory.
+    array_store : `Boolean`, optional
+        Whether to additionally hold all bid/ask prices within a single
+        time x asset `ArrayPriceStore`, which is used to answer bid/ask
+        queries. Defaults to False.
+    cache : `Boolean`, optional
+        Whether to store the prepared bar and bid/ask DataFrames in an
+        on-disk binary cache, which is used in place of the CSV files on
+        subsequent loads until they are modified. Defaults to False.
+    cache_dir : `str`, optional
+        The directory of the on-disk cache. Defaults to a '.qstrader_cache'
+        subdirectory of the CSV directory.
+    max_workers : `int`, optional
+        The number of worker processes used to load and convert the
+        CSV files concurrently. Defaults to None, which loads the
+        files sequentially within the current process.
+    lazy : `Boolean`, optional
+        Whether to only index the CSV filenames at construction and
+        load each asset's CSV file upon the first request for its
+        prices. Defaults to False. Cannot be used with `array_store`.
+    max_memory : `int`, optional
+        In lazy mode, the maximum number of bytes of loaded DataFrames
+        to retain, beyond which the least recently used assets are
+        evicted. Defaults to None, meaning no assets are evicted. The
+        panel of closing prices used for historical range queries
+        retains the closes of every loaded asset and is not bounded.
+    chunksize : `int`, optional
+        If provided, the CSV files are streamed in chunks of this many
+        bars in step with the simulation clock, rather than being loaded
+        in full. Requires CSV files sorted in ascending date order and
+        queries in increasing time order. Cannot be used with
+        `array_store` or `lazy`.
+    window : `int`, optional
+        In streaming mode, the number of bars prior to the latest query
+        to retain in memory per asset. Defaults to 252.
+    price_dtype : `str` or `np.dtype`, optional
+        If provided, stores the (identical) bid and ask prices as a
+        single 'Mid' price column of this dtype, e.g. 'float32' to
+        quarter the memory of the bid/ask prices. Defaults to None,
+        meaning separate double precision 'Bid' and 'Ask' columns.
+    max_precision_error : `float`, optional
+        If provided, the maximum relative pricing error permitted to
+        be introduced by the price dtype, validated upon loading.
+    price_cache_size : `int`, optional
+        The maximum number of bid and of ask prices to cache for
+        repeated queries. Defaults to 1024 * 1024. If None the
+        caches are unbounded, while if zero no prices are cached.
+    validate_data : `Boolean`, optional
+        Whether to check the quality of all loaded bars prior to their
+        usage, raising an error for missing pricing columns, duplicate
+        or unsorted dates and non-positive prices. If the cache is
+        utilised the validation report of each CSV file is also cached.
+        Not applicable in lazy or streaming mode. Defaults to True.
+    max_gap_days : `int`, optional
+        The maximum number of calendar days between consecutive bars
+        before the gap is reported by the validation. Defaults to 7.
+    market_open : `str`, optional
+        The (UTC) time of the opening price of each bar, in 'HH:MM:SS'
+        format. Defaults to '14:30:00'.
+    market_close : `str`, optional
+        The (UTC) time of the closing price of each bar, in 'HH:MM:SS'
+        format. Defaults to '21:00:00'.
+    calendar : `ExchangeCalendar`, optional
+        If provided, the opening and closing prices of each bar are
+        timestamped at the market open and close times of its session
+        within the exchange calendar, in place of the market open and
+        close times parameters.
+    registry : `AssetRegistry`, optional
+        The registry of the asset IDs keying the price caches, in
+        which the loaded assets are registered. Defaults to the shared
+        registry.
     """
 
     def __init__(self, csv_dir, asset_type: type[Asset], adjust_prices=True,
-                 csv_symbols=None):
+                 csv_symbols=None, array_store=False, cache=False,
+                 cache_dir=None, max_workers=None, lazy=False,
+                 max_memory=None, chunksize=None, window=252,
+                 price_dtype=None, max_precision_error=None,
+                 price_cache_size=1024 * 1024, validate_data=True,
+                 max_gap_days=7, market_open=DEFAULT_MARKET_OPEN,
+                 market_close=DEFAULT_MARKET_CLOSE, calendar=None,
+                 registry=None):
+        if lazy and array_store:
+            raise ValueError(
+                "Unable to create a lazily loaded CSVDailyBarDataSource "
+                "with an array-backed price store, since the price store "
+                "requires all assets to be loaded."
+            )
+        if chunksize is not None and (lazy or array_store):
+            raise ValueError(
+                "Unable to create a streamed CSVDailyBarDataSource that "
+                "is also lazily loaded or has an array-backed price store."
+            )
+
+        super().__init__(
+            asset_type, adjust_prices=adjust_prices, array_store=array_store,
+            price_dtype=price_dtype, max_precision_error=max_precision_error,
+            price_cache_size=price_cache_size, validate_data=validate_data,
+            max_gap_days=max_gap_days, market_open=market_open,
+            market_close=market_close, calendar=calendar, registry=registry
+        )
         self.csv_dir = csv_dir
         self.asset_type:type[Asset] = asset_type
-        self.adjust_prices = adjust_prices
         self.csv_symbols = csv_symbols
+        self.cache = self._create_cache(cache, cache_dir)
+        self.max_workers = max_workers
+        self.lazy = lazy
+        self.max_memory = max_memory
+        self.chunksize = chunksize
+        self.window = window
+
+        if self.chunksize is not None:
+            self.asset_bar_frames, self.asset_bid_ask_frames = \
+                self._stream_asset_frames()
+        elif self.lazy:
+            self.asset_bar_frames, self.asset_bid_ask_frames = \
+                self._index_asset_frames()
+        else:
+            self.asset_bar_frames, self.asset_bid_ask_frames = \
+                self._load_asset_frames()
+        self._prepare_price_data()
 
-        self.asset_bar_frames = self._load_csvs_into_dfs()
-        self.asset_bid_ask_frames = self._convert_bars_into_bid_ask_dfs()
+    def _create_cache(self, cache, cache_dir):
+        """
+        Create the on-disk binary cache of prepared DataFrames, if
+        requested.
+
+        Parameters
+        ----------
+        cache : `Boolean`
+            Whether to utilise the cache.
+        cache_dir : `str` or None
+            The directory of the cache, defaulting to a subdirectory
+            of the CSV directory.
+
+        Returns
+        -------
+        `BarDataCache` or None
+            The cache, or None if not utilised.
+        """
+        if not cache:
+            return None
+        if cache_dir is None:
+            cache_dir = os.path.join(self.csv_dir, '.qstrader_cache')
+        return BarDataCache(cache_dir)
 
     def _obtain_asset_csv_files(self):
         """
@@ -55,10 +318,10 @@ class CSVDailyBarDataSource(object):
         `list[str]`
             The list of all CSV filenames.
         """
-        return [
+        return sorted(
             file for file in os.listdir(self.csv_dir)
             if file.endswith('.csv')
-        ]
+        )
 
     def _obtain_asset_symbol_from_filename(self, csv_file):
         """
@@ -76,12 +339,13 @@ class CSVDailyBarDataSource(object):
         `str`
             The QSTrader symbology of the asset. e.g. 'EQ:SPY'.
         """
-        return 'EQ:%s' % csv_file.replace('.csv', '')
+        return self._obtain_asset_symbol(csv_file.replace('.csv', ''))
 
     def _load_csv_into_df(self, csv_file):
         """
-        Loads the CSV file into a Pandas DataFrame with dates parsed,
-        sorted on datetime localised to UTC.
+        Loads the CSV file into a Pandas DataFrame with dates parsed
+        and localised to UTC. The rows retain their order within the
+        file, such that any unsorted dates can be validated.
 
         Parameters
         ----------
@@ -93,199 +357,236 @@ class CSVDailyBarDataSource(object):
         `pd.DataFrame`
             DataFrame of the CSV file with timestamps localised to UTC.
         """
+        return _read_csv_file(os.path.join(self.csv_dir, csv_file))
 
-        # csv_dir: Path = pathlib.Path(self.csv_dir)
-        # file_path: Path = pathlib.Path(csv_dir, csv_file)
-        csv_df = pd.read_csv(
-            os.path.join(self.csv_dir, csv_file),
-            index_col='Date',
-            parse_dates=True
-        ).sort_index()
+    def _validate_bar_frame(self, asset, bar_df):
+        """
+        Check the quality of the daily 'bar' DataFrame of an asset,
+        reusing the cached validation report of its CSV file if the
+        cache is utilised and the file is unmodified.
 
-        # Ensure all timestamps are set to UTC for consistency
-        csv_df = csv_df.set_index(csv_df.index.tz_localize(pytz.UTC))
-        return csv_df
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol of the bars.
+        bar_df : `pd.DataFrame`
+            The daily 'bar' OHLCV DataFrame.
 
-    def _load_csvs_into_dfs(self):
+        Returns
+        -------
+        `dict`
+            The validation report of the bars.
         """
-        Load all CSVs in the CSV directory into Pandas DataFrames.
+        if self.cache is None:
+            return super()._validate_bar_frame(asset, bar_df)
+
+        csv_path = os.path.join(self.csv_dir, '%s.csv' % asset.split(':', 1)[1])
+        if not os.path.exists(csv_path):
+            return super()._validate_bar_frame(asset, bar_df)
+        params = {'max_gap_days': self.validator.max_gap_days}
+        report = self.cache.load_report(
+            csv_path, self.adjust_prices, params, price_dtype=self.price_dtype,
+            session_times=self.session_times
+        )
+        if report is None:
+            report = super()._validate_bar_frame(asset, bar_df)
+            self.cache.save_report(
+                csv_path, self.adjust_prices, params, report,
+                price_dtype=self.price_dtype, session_times=self.session_times
+            )
+        return report
+
+    def _obtain_csv_files(self):
+        """
+        Obtain the list of CSV filenames to load, either from the
+        provided CSV symbols or from the CSV directory.
 
         Returns
         -------
-        `dict{pd.DataFrame}`
-            The asset-symbol keyed dictionary of Pandas DataFrames
-            containing the timestamped price/volume data.
+        `list[str]`
+            The list of CSV filenames.
         """
-        if settings.PRINT_EVENTS:
-            print("Loading CSV files into DataFrames...")
         if self.csv_symbols is not None:
             # TODO/NOTE: This assumes existence of CSV symbols
             # within the provided directory.
-            csv_files = ['%s.csv' % symbol for symbol in self.csv_symbols]
-        else:
-            csv_files = self._obtain_asset_csv_files()
-
-        asset_frames = {}
-        for csv_file in csv_files:
-            asset_symbol = self._obtain_asset_symbol_from_filename(csv_file)
-            if settings.PRINT_EVENTS:
-                print("Loading CSV file for symbol '%s'..." % asset_symbol)
-            csv_df = self._load_csv_into_df(csv_file)
-            asset_frames[asset_symbol] = csv_df
-        return asset_frames
+            return ['%s.csv' % symbol for symbol in self.csv_symbols]
+        return self._obtain_asset_csv_files()
 
-    def _convert_bar_frame_into_bid_ask_df(self, bar_df):
+    def _csv_file_loader(self, validate_data):
         """
-        Converts the DataFrame from daily OHLCV 'bars' into a DataFrame
-        of open and closing price timestamps.
+        Create the function loading a CSV file, by its full path, into
+        its daily 'bar' and bid/ask DataFrames along with its validation
+        report. See `_load_csv_file`.
 
-        Optionally adjusts the open/close prices for corporate actions
-        using any provided 'Adjusted Close' column.
+        The loading parameters of the data source are bound explicitly,
+        such that only these, rather than the data source itself, are
+        sent to any worker processes.
 
         Parameters
         ----------
-        `pd.DataFrame`
-            The daily 'bar' OHLCV DataFrame.
+        validate_data : `Boolean`
+            Whether to validate the raw bars of the CSV file.
 
         Returns
         -------
-        `pd.DataFrame`
-            The individually-timestamped open/closing prices, optionally
-            adjusted for corporate actions.
+        `functools.partial`
+            The picklable CSV file loading function.
         """
-        bar_df = bar_df.sort_index()
-        if self.adjust_prices:
-            if 'Adj Close' not in bar_df.columns:
-                raise ValueError(
-                    "Unable to locate Adjusted Close pricing column in CSV "
-                    "data file. "
-                    "Prices cannot be adjusted. Exiting."
-                )
+        return functools.partial(
+            _load_csv_file,
+            adjust_prices=self.adjust_prices,
+            price_dtype=self.price_dtype,
+            market_open=self.market_open,
+            market_close=self.market_close,
+            calendar=self.calendar,
+            validate_data=validate_data,
+            max_gap_days=self.validator.max_gap_days,
+            cache_dir=self.cache.cache_dir if self.cache is not None else None,
+            session_times=self.session_times
+        )
+
+    def _load_csv_into_bar_and_bid_ask_dfs(self, csv_file):
+        """
+        Loads a CSV file into its daily 'bar' DataFrame and converts
+        this into the individually-timestamped bid/ask DataFrame.
 
-            # Restrict solely to the open/closing prices
-            oc_df = bar_df.loc[:, ['Open', 'Close', 'Adj Close']]
+        If the cache is utilised the DataFrames are loaded from the
+        cache when available, otherwise they are stored in it.
 
-            # Adjust opening prices
-            oc_df['Adj Open'] = (oc_df['Adj Close'] / oc_df['Close']) * oc_df[
-                'Open']
-            oc_df = oc_df.loc[:, ['Adj Open', 'Adj Close']]
-            oc_df.columns = ['Open', 'Close']
-        else:
-            oc_df = bar_df.loc[:, ['Open', 'Close']]
-
-        # Convert bars into separate rows for open/close prices
-        # appropriately timestamped
-        seq_oc_df = oc_df.T.unstack(level=0).reset_index()
-        seq_oc_df.columns = ['Date', 'Market', 'Price']
-        seq_oc_df.loc[seq_oc_df['Market'] == 'Open', 'Date'] += pd.Timedelta(
-            hours=14, minutes=30)
-        seq_oc_df.loc[seq_oc_df['Market'] == 'Close', 'Date'] += pd.Timedelta(
-            hours=21, minutes=00)
-
-        # TODO: Unable to distinguish between Bid/Ask, implement later
-        dp_df = seq_oc_df[['Date', 'Price']]
-        dp_df['Bid'] = dp_df['Price']
-        dp_df['Ask'] = dp_df['Price']
-        dp_df = dp_df.loc[:, ['Date', 'Bid', 'Ask']].fillna(
-            method='ffill').set_index('Date').sort_index()
-        return dp_df
-
-    def _convert_bars_into_bid_ask_dfs(self):
-        """
-        Convert all of the daily OHLCV 'bar' based DataFrames into
-        individually-timestamped open/closing price DataFrames.
+        Parameters
+        ----------
+        csv_file : `str`
+            The name of the CSV file.
 
         Returns
         -------
-        `dict{pd.DataFrame}`
-            The converted DataFrames.
+        `tuple(pd.DataFrame, pd.DataFrame)`
+            The bar and bid/ask DataFrames.
         """
-        if settings.PRINT_EVENTS:
-            print("Adjusting pricing in CSV files...")
-        asset_bid_ask_frames = {}
-        for asset_symbol, bar_df in self.asset_bar_frames.items():
-            if settings.PRINT_EVENTS:
-                print("Adjusting CSV file for symbol '%s'..." % asset_symbol)
-            asset_bid_ask_frames[asset_symbol] = \
-                self._convert_bar_frame_into_bid_ask_df(bar_df)
-        return asset_bid_ask_frames
+        bar_df, bid_ask_df, _ = self._csv_file_loader(False)(
+            os.path.join(self.csv_dir, csv_file)
+        )
+        return bar_df, bid_ask_df
 
-    @functools.lru_cache(maxsize=1024 * 1024)
-    def get_bid(self, dt, asset):
+    def _load_asset_frames(self):
         """
-        Obtain the bid price of an asset at the provided timestamp.
+        Load all CSVs into Pandas DataFrames and convert the daily
+        OHLCV 'bar' DataFrames into individually-timestamped
+        open/closing price DataFrames.
 
-        Parameters
-        ----------
-        dt : `pd.Timestamp`
-            When to obtain the bid price for.
-        asset : `str`
-            The asset symbol to obtain the bid price for.
+        If data validation is utilised the raw bars of every CSV file
+        are validated prior to being converted, raising a single error
+        describing every invalid asset once all files are loaded.
 
         Returns
         -------
-        `float`
-            The bid price.
-        """
-        bid_ask_df = self.asset_bid_ask_frames[asset]
-        try:
-            bid = bid_ask_df.iloc[bid_ask_df.index.get_loc(dt, method='pad')][
-                'Bid']
-        except KeyError:  # Before start date
-            return np.NaN
-        return bid
-
-    @functools.lru_cache(maxsize=1024 * 1024)
-    def get_ask(self, dt, asset):
+        `tuple(dict{pd.DataFrame}, dict{pd.DataFrame})`
+            The asset-symbol keyed dictionaries of bar DataFrames
+            and of bid/ask DataFrames.
         """
-        Obtain the ask price of an asset at the provided timestamp.
+        if settings.PRINT_EVENTS:
+            print("Loading CSV files into DataFrames...")
+        csv_files = self._obtain_csv_files()
+        csv_paths = [
+            os.path.join(self.csv_dir, csv_file) for csv_file in csv_files
+        ]
+        loader = self._csv_file_loader(self.validate_data)
 
-        Parameters
-        ----------
-        dt : `pd.Timestamp`
-            When to obtain the ask price for.
-        asset : `str`
-            The asset symbol to obtain the ask price for.
+        if self.max_workers is not None and len(csv_files) > 1:
+            if settings.PRINT_EVENTS:
+                print(
+                    "Loading %s CSV files with %s worker processes..." % (
+                        len(csv_files), self.max_workers
+                    )
+                )
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.max_workers
+            ) as executor:
+                # Results are returned in the order of the CSV files
+                # such that the DataFrames are merged deterministically.
+                # Files are sent in chunks such that the bound loading
+                # parameters are sent once per chunk rather than per file.
+                chunksize = max(1, len(csv_paths) // (4 * self.max_workers))
+                frames = list(
+                    executor.map(loader, csv_paths, chunksize=chunksize)
+                )
+        else:
+            frames = []
+            for csv_file, csv_path in zip(csv_files, csv_paths):
+                if settings.PRINT_EVENTS:
+                    print(
+                        "Loading CSV file for symbol '%s'..." %
+                        self._obtain_asset_symbol_from_filename(csv_file)
+                    )
+                frames.append(loader(csv_path))
+
+        asset_bar_frames = {}
+        asset_bid_ask_frames = {}
+        report = {}
+        for csv_file, (bar_df, bid_ask_df, asset_report) in zip(
+            csv_files, frames
+        ):
+            asset_symbol = self._obtain_asset_symbol_from_filename(csv_file)
+            asset_bar_frames[asset_symbol] = bar_df
+            asset_bid_ask_frames[asset_symbol] = bid_ask_df
+            report[asset_symbol] = asset_report
+        if self.validate_data:
+            if settings.PRINT_EVENTS:
+                print("Validating daily bar data...")
+            self.validator.check(report)
+            self.validation_report = report
+        return asset_bar_frames, asset_bid_ask_frames
+
+    def _index_asset_frames(self):
+        """
+        Index the CSV filenames by asset symbol, without loading
+        them, such that each CSV file is only loaded and converted
+        upon the first request for its asset.
 
         Returns
         -------
-        `float`
-            The ask price.
+        `tuple(LazyAssetFrames, LazyAssetFrames)`
+            The asset-symbol keyed lazily loaded mappings of bar
+            DataFrames and of bid/ask DataFrames.
         """
-        bid_ask_df = self.asset_bid_ask_frames[asset]
-        try:
-            ask = bid_ask_df.iloc[bid_ask_df.index.get_loc(dt, method='pad')][
-                'Ask']
-        except KeyError:  # Before start date
-            return np.NaN
-        return ask
-
-    def get_assets_historical_closes(self, start_dt, end_dt, assets):
+        if settings.PRINT_EVENTS:
+            print("Indexing CSV files for lazy loading...")
+        asset_files = {
+            self._obtain_asset_symbol_from_filename(csv_file): csv_file
+            for csv_file in self._obtain_csv_files()
+        }
+        self.frame_loader = LazyAssetFrameLoader(
+            asset_files, self._load_csv_into_bar_and_bid_ask_dfs,
+            max_memory=self.max_memory
+        )
+        return (
+            LazyAssetFrames(self.frame_loader, 0),
+            LazyAssetFrames(self.frame_loader, 1)
+        )
+
+    def _stream_asset_frames(self):
         """
-        Obtain a multi-asset historical range of closing prices as a DataFrame,
-        indexed by timestamp with asset symbols as columns.
-
-        Parameters
-        ----------
-        start_dt : `pd.Timestamp`
-            The starting datetime of the range to obtain.
-        end_dt : `pd.Timestamp`
-            The ending datetime of the range to obtain.
-        assets : `list[str]`
-            The list of asset symbols to obtain closing prices for.
+        Open each CSV file for streaming in chunks, without loading
+        any bars until the first request for its asset.
 
         Returns
         -------
-        `pd.DataFrame`
-            The multi-asset closing prices DataFrame.
+        `tuple(StreamingAssetFrames, StreamingAssetFrames)`
+            The asset-symbol keyed mappings of the currently retained
+            bar DataFrames and bid/ask DataFrames.
         """
-        close_series = []
-        for asset in assets:
-            if asset in self.asset_bar_frames.keys():
-                asset_close_prices = self.asset_bar_frames[asset][['Close']]
-                asset_close_prices.columns = [asset]
-                close_series.append(asset_close_prices)
-
-        prices_df = pd.concat(close_series, axis=1).dropna(how='all')
-        prices_df = prices_df.loc[start_dt:end_dt]
-        return prices_df
+        if settings.PRINT_EVENTS:
+            print("Opening CSV files for streaming...")
+        self.asset_streams = {}
+        for csv_file in self._obtain_csv_files():
+            asset_symbol = self._obtain_asset_symbol_from_filename(csv_file)
+            self.asset_streams[asset_symbol] = StreamingAssetBars(
+                os.path.join(self.csv_dir, csv_file),
+                self._convert_bar_frame_into_bid_ask_df,
+                self.chunksize, self.window,
+                prepare_func=self._adjust_bar_frame
+            )
+        return (
+            StreamingAssetFrames(self.asset_streams, 'bar_df'),
+            StreamingAssetFrames(self.asset_streams, 'bid_ask_df')
+        )
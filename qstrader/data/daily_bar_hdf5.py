@@ -0,0 +1,107 @@
+import pandas as pd
+import pytz
+
+from qstrader import settings
+from qstrader.data.daily_bar import DailyBarDataSource
+
+
+class HDF5DailyBarDataSource(DailyBarDataSource):
+    """
+    Encapsulates loading, preparation and querying of daily 'bar'
+    OHLCV data stored within an HDF5 file.
+
+    Each symbol is stored under its own key (e.g. '/SPY') as a
+    date-indexed DataFrame in the (queryable) 'table' format, i.e.
+    written via `df.to_hdf(path, key=symbol, format='table')`. The
+    symbol filter selects the keys to read, while the date range
+    filter is pushed down into the HDF5 reader as a 'where' clause,
+    such that only the requested bars are read.
+
+    Requires the optional 'tables' (PyTables) dependency.
+
+    Parameters
+    ----------
+    path : `str`
+        The full path to the HDF5 file.
+    asset_type : `str`
+        The asset type that the price/volume data is for.
+        TODO: Unused at this stage and currently hardcoded to Equity.
+    symbols : `list[str]`, optional
+        An optional list of symbols to restrict the data source to.
+        Defaults to all symbols within the file.
+    start_dt : `pd.Timestamp`, optional
+        The optional earliest date of the bars to load.
+    end_dt : `pd.Timestamp`, optional
+        The optional latest date of the bars to load.
+    **kwargs
+        The preparation options of `DailyBarDataSource`, e.g.
+        `adjust_prices`, `array_store` and `price_dtype`.
+    """
+
+    def __init__(
+        self, path, asset_type, symbols=None, start_dt=None, end_dt=None,
+        **kwargs
+    ):
+        super().__init__(asset_type, **kwargs)
+        self.path = path
+        self.symbols = symbols
+        self.start_dt = start_dt
+        self.end_dt = end_dt
+
+        self.asset_bar_frames, self.asset_bid_ask_frames = \
+            self._convert_bar_frames(self._load_bar_frames())
+        self._prepare_price_data()
+
+    def _create_where(self):
+        """
+        Create the date range 'where' clause of the HDF5 reader.
+
+        Returns
+        -------
+        `list[str]` or None
+            The 'where' conditions, or None if all bars are to be read.
+        """
+        where = []
+        if self.start_dt is not None:
+            where.append(
+                "index >= '%s'" % pd.Timestamp(self.start_dt).strftime(
+                    '%Y-%m-%d'
+                )
+            )
+        if self.end_dt is not None:
+            where.append(
+                "index <= '%s'" % pd.Timestamp(self.end_dt).strftime(
+                    '%Y-%m-%d'
+                )
+            )
+        return where if len(where) > 0 else None
+
+    def _load_bar_frames(self):
+        """
+        Load the filtered daily bars from the HDF5 file.
+
+        Returns
+        -------
+        `dict{str: pd.DataFrame}`
+            The asset-symbol keyed dictionary of bar DataFrames.
+        """
+        if settings.PRINT_EVENTS:
+            print("Loading daily bars from HDF5 file...")
+        where = self._create_where()
+        bar_frames = {}
+        with pd.HDFStore(self.path, mode='r') as store:
+            if self.symbols is not None:
+                symbols = list(self.symbols)
+            else:
+                symbols = sorted(key.lstrip('/') for key in store.keys())
+            for symbol in symbols:
+                bar_df = store.select(symbol, where=where)
+                bar_df.index.name = 'Date'
+
+                # Ensure all timestamps are set to UTC for consistency
+                if bar_df.index.tz is None:
+                    bar_df = bar_df.set_index(
+                        bar_df.index.tz_localize(pytz.UTC)
+                    )
+                bar_frames[self._obtain_asset_symbol(symbol)] = bar_df
+        return bar_frames
@@ -0,0 +1,102 @@
+import pandas as pd
+
+from qstrader import settings
+from qstrader.data.daily_bar import DailyBarDataSource
+
+
+class ParquetDailyBarDataSource(DailyBarDataSource):
+    """
+    Encapsulates loading, preparation and querying of daily 'bar'
+    OHLCV data stored within a (optionally partitioned) Parquet
+    dataset.
+
+    The dataset is in long format, with one row per symbol and date,
+    containing 'Symbol' and 'Date' columns along with the price/volume
+    columns, e.g. 'Open', 'Close' and 'Adj Close'. It is typically
+    partitioned by symbol (e.g. 'Symbol=SPY' subdirectories). The
+    symbol and date range filters are pushed down into the Parquet
+    reader, such that only the matching partitions and row groups
+    are read.
+
+    Requires the optional 'pyarrow' dependency.
+
+    Parameters
+    ----------
+    path : `str`
+        The full path to the Parquet file or dataset directory.
+    asset_type : `str`
+        The asset type that the price/volume data is for.
+        TODO: Unused at this stage and currently hardcoded to Equity.
+    symbols : `list[str]`, optional
+        An optional list of symbols to restrict the data source to.
+        Defaults to all symbols within the dataset.
+    start_dt : `pd.Timestamp`, optional
+        The optional earliest date of the bars to load.
+    end_dt : `pd.Timestamp`, optional
+        The optional latest date of the bars to load.
+    columns : `list[str]`, optional
+        An optional list of price/volume columns to read, in
+        addition to the 'Symbol' and 'Date' columns.
+    **kwargs
+        The preparation options of `DailyBarDataSource`, e.g.
+        `adjust_prices`, `array_store` and `price_dtype`.
+    """
+
+    def __init__(
+        self, path, asset_type, symbols=None, start_dt=None, end_dt=None,
+        columns=None, **kwargs
+    ):
+        super().__init__(asset_type, **kwargs)
+        self.path = path
+        self.symbols = symbols
+        self.start_dt = start_dt
+        self.end_dt = end_dt
+        self.columns = columns
+
+        self.asset_bar_frames, self.asset_bid_ask_frames = \
+            self._convert_bar_frames(self._load_bar_frames())
+        self._prepare_price_data()
+
+    def _create_filters(self):
+        """
+        Create the symbol and date range filters of the Parquet reader.
+
+        Returns
+        -------
+        `list[tuple]` or None
+            The filters, or None if all bars are to be read.
+        """
+        filters = []
+        if self.symbols is not None:
+            filters.append(('Symbol', 'in', list(self.symbols)))
+        if self.start_dt is not None:
+            filters.append(
+                ('Date', '>=', pd.Timestamp(self.start_dt).tz_localize(None))
+            )
+        if self.end_dt is not None:
+            filters.append(
+                ('Date', '<=', pd.Timestamp(self.end_dt).tz_localize(None))
+            )
+        return filters if len(filters) > 0 else None
+
+    def _load_bar_frames(self):
+        """
+        Load the filtered daily bars from the Parquet dataset.
+
+        Returns
+        -------
+        `dict{str: pd.DataFrame}`
+            The asset-symbol keyed dictionary of bar DataFrames.
+        """
+        if settings.PRINT_EVENTS:
+            print("Loading daily bars from Parquet dataset...")
+        columns = None
+        if self.columns is not None:
+            columns = ['Symbol', 'Date'] + list(self.columns)
+        bars_df = pd.read_parquet(
+            self.path, engine='pyarrow', columns=columns,
+            filters=self._create_filters()
+        )
+        # Partition columns are read as categoricals
+        bars_df['Symbol'] = bars_df['Symbol'].astype(str)
+        return self._split_bars_by_symbol(bars_df)
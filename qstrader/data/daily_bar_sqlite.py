@@ -0,0 +1,100 @@
+import sqlite3
+
+import pandas as pd
+
+from qstrader import settings
+from qstrader.data.daily_bar import DailyBarDataSource
+
+
+class SQLiteDailyBarDataSource(DailyBarDataSource):
+    """
+    Encapsulates loading, preparation and querying of daily 'bar'
+    OHLCV data stored within a table of a local SQLite database.
+
+    The table is in long format, with one row per symbol and date,
+    containing 'Symbol' and 'Date' (ISO 8601 'YYYY-MM-DD' text)
+    columns along with the price/volume columns, e.g. 'Open',
+    'Close' and 'Adj Close'. The symbol and date range filters are
+    applied within the SQL query, such that only the requested bars
+    are read. An index on ('Symbol', 'Date') is recommended.
+
+    Parameters
+    ----------
+    db_path : `str`
+        The full path to the SQLite database file.
+    asset_type : `str`
+        The asset type that the price/volume data is for.
+        TODO: Unused at this stage and currently hardcoded to Equity.
+    table : `str`, optional
+        The name of the table of daily bars. Defaults to 'daily_bars'.
+    symbols : `list[str]`, optional
+        An optional list of symbols to restrict the data source to.
+        Defaults to all symbols within the table.
+    start_dt : `pd.Timestamp`, optional
+        The optional earliest date of the bars to load.
+    end_dt : `pd.Timestamp`, optional
+        The optional latest date of the bars to load.
+    **kwargs
+        The preparation options of `DailyBarDataSource`, e.g.
+        `adjust_prices`, `array_store` and `price_dtype`.
+    """
+
+    def __init__(
+        self, db_path, asset_type, table='daily_bars', symbols=None,
+        start_dt=None, end_dt=None, **kwargs
+    ):
+        super().__init__(asset_type, **kwargs)
+        self.db_path = db_path
+        self.table = table
+        self.symbols = symbols
+        self.start_dt = start_dt
+        self.end_dt = end_dt
+
+        self.asset_bar_frames, self.asset_bid_ask_frames = \
+            self._convert_bar_frames(self._load_bar_frames())
+        self._prepare_price_data()
+
+    def _create_query(self):
+        """
+        Create the parameterised SQL query of the daily bars, with
+        the symbol and date range filters applied.
+
+        Returns
+        -------
+        `tuple(str, list)`
+            The SQL query and its parameters.
+        """
+        conditions = []
+        params = []
+        if self.symbols is not None:
+            conditions.append(
+                '"Symbol" IN (%s)' % ', '.join('?' for _ in self.symbols)
+            )
+            params.extend(self.symbols)
+        if self.start_dt is not None:
+            conditions.append('"Date" >= ?')
+            params.append(pd.Timestamp(self.start_dt).strftime('%Y-%m-%d'))
+        if self.end_dt is not None:
+            conditions.append('"Date" <= ?')
+            params.append(pd.Timestamp(self.end_dt).strftime('%Y-%m-%d'))
+
+        query = 'SELECT * FROM "%s"' % self.table
+        if len(conditions) > 0:
+            query += ' WHERE %s' % ' AND '.join(conditions)
+        return query, params
+
+    def _load_bar_frames(self):
+        """
+        Load the filtered daily bars from the SQLite database.
+
+        Returns
+        -------
+        `dict{str: pd.DataFrame}`
+            The asset-symbol keyed dictionary of bar DataFrames.
+        """
+        if settings.PRINT_EVENTS:
+            print("Loading daily bars from SQLite database...")
+        query, params = self._create_query()
+        with sqlite3.connect(self.db_path) as conn:
+            bars_df = pd.read_sql_query(query, conn, params=params)
+        return self._split_bars_by_symbol(bars_df)
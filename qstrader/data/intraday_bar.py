@@ -0,0 +1,438 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from qstrader import settings
+from qstrader.data.price_store import ArrayPriceStore
+
+
+class IntradayBarDataSource(object):
+    """
+    Encapsulates loading, preparation and querying of intraday (e.g.
+    minute or hourly) bars or quotes with separate bid and ask prices,
+    stored within CSV files.
+
+    Each CSV file contains a timestamp column along with bid and ask
+    price columns, e.g. 'Time', 'Bid' and 'Ask', and optionally a
+    symbol column, e.g. 'Ticker', in which case a file may contain the
+    prices of several assets and an asset may span several files.
+    Otherwise the symbol is taken from the filename.
+
+    Timestamps are the (UTC) times at which each bid/ask price becomes
+    known, i.e. the end of each bar. If a bar frequency is provided the
+    prices are resampled onto bars of that frequency, each taking the
+    last bid/ask price within the bar and labelled at the end of the bar,
+    such that no price is known before it was quoted.
+
+    All prices are held within a single time x asset `ArrayPriceStore`,
+    such that a query at any time is a single binary search (or a
+    constant time step when queried in increasing time order) followed
+    by an array index, regardless of the number of bars or assets.
+
+    Parameters
+    ----------
+    csv_dir : `str`
+        The full path to the directory where the CSVs are located.
+    asset_type : `str`
+        The asset type that the price data is for.
+        TODO: Unused at this stage and currently hardcoded to Equity.
+    csv_files : `list[str]`, optional
+        An optional list of CSV filenames to load. Defaults to all
+        CSV files within the provided directory.
+    csv_symbols : `list[str]`, optional
+        An optional list of symbols to restrict the data source to.
+    freq : `str`, optional
+        An optional Pandas frequency string of the bars to resample
+        the prices onto, e.g. '1min' or '1H'. Defaults to None,
+        meaning the prices are used as provided.
+    time_column : `str`, optional
+        The name of the timestamp column. Defaults to 'Time'.
+    time_format : `str`, optional
+        The optional strftime format of the timestamps, e.g.
+        '%d.%m.%Y %H:%M:%S.%f'. Defaults to None, which infers it.
+    symbol_column : `str`, optional
+        The name of the optional symbol column. Defaults to 'Ticker'.
+    bid_column : `str`, optional
+        The name of the bid price column. Defaults to 'Bid'.
+    ask_column : `str`, optional
+        The name of the ask price column. Defaults to 'Ask'.
+    price_dtype : `str` or `np.dtype`, optional
+        If provided, stores the bid and ask prices at this dtype, e.g.
+        'float32' to halve the memory of the prices. Defaults to None,
+        meaning double precision prices.
+    """
+
+    def __init__(
+        self, csv_dir, asset_type, csv_files=None, csv_symbols=None,
+        freq=None, time_column='Time', time_format=None,
+        symbol_column='Ticker', bid_column='Bid', ask_column='Ask',
+        price_dtype=None
+    ):
+        self.csv_dir = csv_dir
+        self.asset_type = asset_type
+        self.csv_files = csv_files
+        self.csv_symbols = csv_symbols
+        self.freq = freq
+        self.time_column = time_column
+        self.time_format = time_format
+        self.symbol_column = symbol_column
+        self.bid_column = bid_column
+        self.ask_column = ask_column
+        self.price_dtype = price_dtype
+
+        self.asset_bid_ask_frames = self._load_asset_frames()
+        self.price_store = self._create_price_store()
+
+    def _obtain_asset_symbol(self, symbol):
+        """
+        Return the QSTrader symbology for the asset.
+
+        TODO: Remove hardcoding to Equity asset types.
+
+        Parameters
+        ----------
+        symbol : `str`
+            The ticker symbol of the asset, e.g. 'SPY'.
+
+        Returns
+        -------
+        `str`
+            The QSTrader symbology of the asset. e.g. 'EQ:SPY'.
+        """
+        return 'EQ:%s' % symbol
+
+    def _obtain_csv_files(self):
+        """
+        Obtain the list of CSV filenames to load.
+
+        Returns
+        -------
+        `list[str]`
+            The list of CSV filenames.
+        """
+        if self.csv_files is not None:
+            return list(self.csv_files)
+        return sorted(
+            file for file in os.listdir(self.csv_dir)
+            if file.endswith('.csv')
+        )
+
+    def _load_csv_into_df(self, csv_file):
+        """
+        Loads the CSV file into a long-format Pandas DataFrame of
+        UTC timestamped bid/ask prices with a symbol column.
+
+        Parameters
+        ----------
+        csv_file : `str`
+            The name of the CSV file.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The 'Symbol', 'Date', 'Bid' and 'Ask' prices of the file.
+        """
+        csv_df = pd.read_csv(os.path.join(self.csv_dir, csv_file))
+        missing_columns = [
+            column for column in (
+                self.time_column, self.bid_column, self.ask_column
+            ) if column not in csv_df.columns
+        ]
+        if len(missing_columns) > 0:
+            raise ValueError(
+                "Unable to locate the '%s' column(s) in intraday data "
+                "file '%s'." % ("', '".join(missing_columns), csv_file)
+            )
+
+        if self.symbol_column in csv_df.columns:
+            symbols = csv_df[self.symbol_column].astype(str)
+        else:
+            symbols = csv_file.replace('.csv', '')
+        dates = pd.to_datetime(
+            csv_df[self.time_column], format=self.time_format
+        )
+        if dates.dt.tz is None:
+            dates = dates.dt.tz_localize(pytz.UTC)
+        return pd.DataFrame({
+            'Symbol': symbols,
+            'Date': dates,
+            'Bid': csv_df[self.bid_column].to_numpy(dtype=np.float64),
+            'Ask': csv_df[self.ask_column].to_numpy(dtype=np.float64)
+        })
+
+    def _prepare_bid_ask_df(self, asset, bid_ask_df):
+        """
+        Sorts, deduplicates, validates and optionally resamples
+        the bid/ask prices of a single asset.
+
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol.
+        bid_ask_df : `pd.DataFrame`
+            The timestamp-indexed 'Bid' and 'Ask' prices.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The prepared timestamp-indexed 'Bid' and 'Ask' prices.
+        """
+        bid_ask_df = bid_ask_df.sort_index(kind='stable')
+        # Retain the last price of any duplicated timestamps
+        bid_ask_df = bid_ask_df[
+            ~bid_ask_df.index.duplicated(keep='last')
+        ].dropna()
+
+        bids = bid_ask_df['Bid'].to_numpy()
+        asks = bid_ask_df['Ask'].to_numpy()
+        if np.any(bids <= 0.0) or np.any(asks <= 0.0):
+            raise ValueError(
+                "Unable to load non-positive bid/ask prices for "
+                "Asset '%s'." % asset
+            )
+        if np.any(asks < bids):
+            raise ValueError(
+                "Unable to load crossed bid/ask prices, with an ask "
+                "price below the bid price, for Asset '%s'." % asset
+            )
+
+        if self.freq is not None:
+            bid_ask_df = bid_ask_df.resample(
+                self.freq, closed='right', label='right'
+            ).last().dropna()
+        bid_ask_df.index.name = 'Date'
+        return bid_ask_df
+
+    def _load_asset_frames(self):
+        """
+        Load all CSVs into per-asset Pandas DataFrames of bid and ask
+        prices.
+
+        Returns
+        -------
+        `dict{str: pd.DataFrame}`
+            The asset-symbol keyed dictionary of bid/ask DataFrames.
+        """
+        if settings.PRINT_EVENTS:
+            print("Loading intraday CSV files into DataFrames...")
+        prices_df = pd.concat(
+            [
+                self._load_csv_into_df(csv_file)
+                for csv_file in self._obtain_csv_files()
+            ],
+            ignore_index=True
+        )
+        if self.csv_symbols is not None:
+            prices_df = prices_df[prices_df['Symbol'].isin(self.csv_symbols)]
+
+        asset_bid_ask_frames = {}
+        for symbol, symbol_df in prices_df.groupby('Symbol', sort=True):
+            asset = self._obtain_asset_symbol(symbol)
+            asset_bid_ask_frames[asset] = self._prepare_bid_ask_df(
+                asset, symbol_df.drop(columns='Symbol').set_index('Date')
+            )
+        return asset_bid_ask_frames
+
+    def _create_price_store(self):
+        """
+        Create the time x asset array-backed price store from the
+        bid/ask DataFrames, at the provided price dtype.
+
+        Returns
+        -------
+        `ArrayPriceStore`
+            The price store.
+        """
+        if settings.PRINT_EVENTS:
+            print("Creating array-backed intraday price store...")
+        store = ArrayPriceStore.from_bid_ask_frames(self.asset_bid_ask_frames)
+        if self.price_dtype is None:
+            return store
+        return ArrayPriceStore(
+            store.timestamps, store.assets,
+            store.bid.astype(self.price_dtype),
+            store.ask.astype(self.price_dtype),
+            first_valid=store.first_valid
+        )
+
+    def has_asset(self, asset):
+        """
+        Whether the data source provides prices for the asset.
+
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol.
+
+        Returns
+        -------
+        `Boolean`
+            Whether the asset has pricing data.
+        """
+        return asset in self.price_store.asset_index
+
+    def get_bid(self, dt, asset):
+        """
+        Obtain the bid price of an asset at the provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the bid price for.
+        asset : `str`
+            The asset symbol to obtain the bid price for.
+
+        Returns
+        -------
+        `float`
+            The bid price.
+        """
+        return self.price_store.get_bid(dt, asset)
+
+    def get_ask(self, dt, asset):
+        """
+        Obtain the ask price of an asset at the provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the ask price for.
+        asset : `str`
+            The asset symbol to obtain the ask price for.
+
+        Returns
+        -------
+        `float`
+            The ask price.
+        """
+        return self.price_store.get_ask(dt, asset)
+
+    def get_bids(self, dt, assets):
+        """
+        Obtain the bid prices of a list of assets at the provided
+        timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the bid prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the bid prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The bid prices, in the order of the provided assets.
+        """
+        return self.price_store.get_bids(dt, assets)
+
+    def get_asks(self, dt, assets):
+        """
+        Obtain the ask prices of a list of assets at the provided
+        timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the ask prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the ask prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The ask prices, in the order of the provided assets.
+        """
+        return self.price_store.get_asks(dt, assets)
+
+    def get_bids_matrix(self, dts, assets):
+        """
+        Obtain the bid prices of a list of assets at each of a
+        list of timestamps.
+
+        Parameters
+        ----------
+        dts : `list[pd.Timestamp]` or `pd.DatetimeIndex`
+            When to obtain the bid prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the bid prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The (timestamp x asset) bid prices.
+        """
+        return self.price_store.get_bids_matrix(dts, assets)
+
+    def get_asks_matrix(self, dts, assets):
+        """
+        Obtain the ask prices of a list of assets at each of a
+        list of timestamps.
+
+        Parameters
+        ----------
+        dts : `list[pd.Timestamp]` or `pd.DatetimeIndex`
+            When to obtain the ask prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the ask prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The (timestamp x asset) ask prices.
+        """
+        return self.price_store.get_asks_matrix(dts, assets)
+
+    def get_assets_historical_closes(
+        self, start_dt, end_dt, assets, adjusted=False
+    ):
+        """
+        Obtain a multi-asset historical range of bar closing (mid)
+        prices as a DataFrame, indexed by timestamp with asset symbols
+        as columns.
+
+        Parameters
+        ----------
+        start_dt : `pd.Timestamp`
+            The starting datetime of the range to obtain.
+        end_dt : `pd.Timestamp`
+            The ending datetime of the range to obtain.
+        assets : `list[str]`
+            The list of asset symbols to obtain closing prices for.
+        adjusted : `Boolean`, optional
+            Unused, as intraday prices are not adjusted for
+            corporate actions.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The multi-asset closing (mid) prices DataFrame.
+        """
+        store = self.price_store
+        start_row, end_row = np.searchsorted(
+            store.timestamps,
+            [pd.Timestamp(start_dt).value, pd.Timestamp(end_dt).value],
+            side='left'
+        )
+        if end_row < len(store.timestamps) and \
+                store.timestamps[end_row] == pd.Timestamp(end_dt).value:
+            end_row += 1
+
+        columns = [asset for asset in assets if asset in store.asset_index]
+        cols = [store.asset_index[asset] for asset in columns]
+        mids = (
+            store.bid[start_row:end_row, cols].astype(np.float64) +
+            store.ask[start_row:end_row, cols].astype(np.float64)
+        ) / 2.0
+        index = pd.DatetimeIndex(
+            store.timestamps[start_row:end_row], name='Date'
+        ).tz_localize(pytz.UTC)
+        prices_df = pd.DataFrame(mids, index=index, columns=columns)
+
+        # Remove timestamps where none of the requested assets has a price
+        has_prices = prices_df.notna().any(axis=1).to_numpy()
+        if not has_prices.all():
+            prices_df = prices_df[has_prices]
+        return prices_df
@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from collections.abc import Mapping
+
+
+class LazyAssetFrameLoader(object):
+    """
+    Loads the bar and bid/ask DataFrames of an asset on first
+    request, retaining recently used assets in memory.
+
+    If a memory cap is provided the least recently used assets
+    are evicted once the total memory usage of the loaded
+    DataFrames exceeds it. The most recently requested asset
+    is always retained.
+
+    Parameters
+    ----------
+    asset_files : `dict{str: str}`
+        Map of asset symbol to the file containing its data.
+    load_func : `callable`
+        Loads a file, returning a (bar, bid/ask) DataFrame tuple.
+    max_memory : `int`, optional
+        The maximum number of bytes of loaded DataFrames to retain.
+        Defaults to None, meaning no assets are evicted.
+    """
+
+    def __init__(self, asset_files, load_func, max_memory=None):
+        self.asset_files = asset_files
+        self.load_func = load_func
+        self.max_memory = max_memory
+        self.loaded = OrderedDict()
+        self.memory_usage = 0
+
+    @staticmethod
+    def _frames_memory_usage(frames):
+        """
+        Calculate the memory usage of a tuple of DataFrames.
+
+        Parameters
+        ----------
+        frames : `tuple(pd.DataFrame)`
+            The DataFrames.
+
+        Returns
+        -------
+        `int`
+            The memory usage in bytes.
+        """
+        return int(sum(df.memory_usage(index=True).sum() for df in frames))
+
+    def _evict(self):
+        """
+        Evict the least recently used assets until the memory usage
+        falls within the memory cap.
+        """
+        if self.max_memory is None:
+            return
+        while self.memory_usage > self.max_memory and len(self.loaded) > 1:
+            _, (_, nbytes) = self.loaded.popitem(last=False)
+            self.memory_usage -= nbytes
+
+    def get(self, asset):
+        """
+        Obtain the DataFrames of an asset, loading them if necessary.
+
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol.
+
+        Returns
+        -------
+        `tuple(pd.DataFrame, pd.DataFrame)`
+            The bar and bid/ask DataFrames.
+        """
+        if asset in self.loaded:
+            self.loaded.move_to_end(asset)
+            return self.loaded[asset][0]
+        if asset not in self.asset_files:
+            raise KeyError(asset)
+
+        frames = self.load_func(self.asset_files[asset])
+        nbytes = self._frames_memory_usage(frames)
+        self.loaded[asset] = (frames, nbytes)
+        self.memory_usage += nbytes
+        self._evict()
+        return frames
+
+
+class LazyAssetFrames(Mapping):
+    """
+    A read-only asset symbol keyed mapping of DataFrames that are
+    loaded on demand via a shared `LazyAssetFrameLoader`.
+
+    Parameters
+    ----------
+    loader : `LazyAssetFrameLoader`
+        The loader of the asset DataFrames.
+    frame_idx : `int`
+        The position of the DataFrame within the tuple returned
+        by the loader.
+    """
+
+    def __init__(self, loader, frame_idx):
+        self.loader = loader
+        self.frame_idx = frame_idx
+
+    def __getitem__(self, asset):
+        return self.loader.get(asset)[self.frame_idx]
+
+    def __contains__(self, asset):
+        return asset in self.loader.asset_files
+
+    def __iter__(self):
+        return iter(self.loader.asset_files)
+
+    def __len__(self):
+        return len(self.loader.asset_files)
@@ -0,0 +1,95 @@
+from collections import OrderedDict
+
+
+class PriceCache(object):
+    """
+    A bounded least-recently-used cache of prices, keyed on the
+    integer nanosecond (UTC) timestamp and the integer index of
+    an asset, which records hit and miss statistics.
+
+    Each data source owns its own cache, such that the cached
+    prices are released along with the data source.
+
+    Parameters
+    ----------
+    max_size : `int`, optional
+        The maximum number of prices to retain. Defaults to
+        1024 * 1024. If None, the cache is unbounded.
+    """
+
+    def __init__(self, max_size=1024 * 1024):
+        self.max_size = max_size
+        self.prices = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.prices)
+
+    def get(self, dt_ns, asset_idx):
+        """
+        Obtain a cached price, recording a hit or miss.
+
+        Parameters
+        ----------
+        dt_ns : `int`
+            The nanosecond timestamp of the price.
+        asset_idx : `int`
+            The index of the asset.
+
+        Returns
+        -------
+        `float` or None
+            The cached price, or None if it is not cached.
+        """
+        key = (dt_ns, asset_idx)
+        price = self.prices.get(key)
+        if price is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.prices.move_to_end(key)
+        return price
+
+    def put(self, dt_ns, asset_idx, price):
+        """
+        Cache a price, evicting the least recently used price
+        if the cache is full.
+
+        Parameters
+        ----------
+        dt_ns : `int`
+            The nanosecond timestamp of the price.
+        asset_idx : `int`
+            The index of the asset.
+        price : `float`
+            The price to cache.
+        """
+        self.prices[(dt_ns, asset_idx)] = price
+        if self.max_size is not None and len(self.prices) > self.max_size:
+            self.prices.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all cached prices and reset the statistics.
+        """
+        self.prices.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        Obtain the cache usage statistics.
+
+        Returns
+        -------
+        `dict`
+            The number of hits, misses, cached prices and the hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.prices),
+            'hit_rate': self.hits / lookups if lookups > 0 else 0.0
+        }
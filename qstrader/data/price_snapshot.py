@@ -0,0 +1,72 @@
+import numpy as np
+
+
+class PriceSnapshot(object):
+    """
+    The bid and ask prices of a set of assets at a single simulation
+    timestamp, stored as arrays aligned on the asset list.
+
+    A snapshot is created once per simulation event such that every
+    consumer of prices at that timestamp (broker, signals and
+    portfolio construction) shares a single resolution of each price.
+
+    Parameters
+    ----------
+    dt : `pd.Timestamp`
+        The timestamp of the prices.
+    assets : `list[str]`
+        The asset symbols.
+    bids : `np.ndarray`
+        The bid prices, in the order of the asset symbols.
+    asks : `np.ndarray`
+        The ask prices, in the order of the asset symbols.
+    """
+
+    def __init__(self, dt, assets, bids, asks):
+        self.dt = dt
+        self.assets = list(assets)
+        self.asset_index = {
+            asset: idx for idx, asset in enumerate(self.assets)
+        }
+        self.bids = np.asarray(bids, dtype=np.float64)
+        self.asks = np.asarray(asks, dtype=np.float64)
+
+    def locate(self, assets):
+        """
+        Obtain the positions of a list of assets within the snapshot.
+
+        Parameters
+        ----------
+        assets : `list[str]`
+            The asset symbols.
+
+        Returns
+        -------
+        `np.ndarray`
+            The positions, with -1 for assets not in the snapshot.
+        """
+        return np.array(
+            [self.asset_index.get(asset, -1) for asset in assets],
+            dtype=np.int64
+        )
+
+    def get_prices(self, prices, cols):
+        """
+        Obtain the prices at the provided snapshot positions.
+
+        Parameters
+        ----------
+        prices : `np.ndarray`
+            The snapshot bid or ask prices.
+        cols : `np.ndarray`
+            The positions, with -1 for assets not in the snapshot.
+
+        Returns
+        -------
+        `np.ndarray`
+            The prices, with NaN for assets not in the snapshot.
+        """
+        result = np.full(len(cols), np.NaN)
+        known = cols >= 0
+        result[known] = prices[cols[known]]
+        return result
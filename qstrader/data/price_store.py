@@ -0,0 +1,673 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+class ArrayPriceStore(object):
+    """
+    Stores bid and ask prices for a set of assets against a single
+    shared timestamp index, using contiguous NumPy arrays rather
+    than a separate Pandas DataFrame per asset.
+
+    Each asset occupies a column of the (time x asset) price
+    matrices. Prices are forward-filled onto the shared index
+    so that a lookup at any timestamp reduces to a single binary
+    search on the timestamp array followed by an array index.
+
+    Exposes the same `get_bid`/`get_ask` interface as the other
+    data sources so that it can be queried by a
+    `BacktestDataHandler`.
+
+    The store can be saved to a directory of NumPy '.npy' files
+    once and subsequently loaded memory-mapped and read-only by
+    any number of processes, such that parallel backtests share a
+    single copy of the prices via the operating system page cache.
+
+    The position of the first valid price of each asset on the
+    shared index is recorded, such that queries prior to the start
+    of an asset's prices are answered without inspecting the prices.
+
+    If only mid prices are available the bid and ask matrices can
+    be the same array, in which case only a single copy of the
+    prices is held (and saved).
+
+    Parameters
+    ----------
+    timestamps : `np.ndarray`
+        The sorted int64 nanosecond (UTC) timestamps shared by
+        all assets.
+    assets : `list[str]`
+        The asset symbols, in column order of the price matrices.
+    bid : `np.ndarray`
+        The (time x asset) floating point matrix of bid prices.
+    ask : `np.ndarray`
+        The (time x asset) floating point matrix of ask prices,
+        which may be the bid price matrix itself.
+    first_valid : `np.ndarray`, optional
+        The row position of the first valid price of each asset,
+        which is calculated from the bid prices if not provided.
+    """
+
+    def __init__(self, timestamps, assets, bid, ask, first_valid=None):
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.assets = list(assets)
+        self.asset_index = {
+            asset: idx for idx, asset in enumerate(self.assets)
+        }
+        self.bid = self._as_price_array(bid)
+        self.ask = self.bid if ask is bid else self._as_price_array(ask)
+        if first_valid is None:
+            first_valid = self._calculate_first_valid(self.bid)
+        self.first_valid = np.asarray(first_valid, dtype=np.int64)
+
+        # The most recently located timestamp and its row position,
+        # as consecutive queries are usually made at the same time
+        self.last_dt_ns = None
+        self.last_row = -1
+
+    @staticmethod
+    def _calculate_first_valid(prices):
+        """
+        Calculate the row position of the first valid (non-NaN)
+        price of each asset.
+
+        Parameters
+        ----------
+        prices : `np.ndarray`
+            The (time x asset) price matrix.
+
+        Returns
+        -------
+        `np.ndarray`
+            The row positions, equal to the number of rows for
+            assets without any valid prices.
+        """
+        valid = ~np.isnan(prices)
+        first_valid = np.argmax(valid, axis=0).astype(np.int64)
+        first_valid[~valid.any(axis=0)] = prices.shape[0]
+        return first_valid
+
+    @staticmethod
+    def _as_price_array(prices):
+        """
+        Convert prices into a floating point array, retaining
+        reduced precision (e.g. float32) floating point prices.
+
+        Parameters
+        ----------
+        prices : `np.ndarray`
+            The prices.
+
+        Returns
+        -------
+        `np.ndarray`
+            The floating point prices.
+        """
+        prices = np.asarray(prices)
+        if np.issubdtype(prices.dtype, np.floating):
+            return prices
+        return prices.astype(np.float64)
+
+    @classmethod
+    def from_bid_ask_frames(cls, bid_ask_frames):
+        """
+        Create the price store from a dictionary of per-asset
+        timestamp-indexed DataFrames with 'Bid' and 'Ask' columns,
+        or with a single 'Mid' column, in which case the bid and ask
+        prices share a single matrix of the same precision.
+
+        Each asset is forward-filled onto the union of all of the
+        asset timestamps, such that a lookup on the store returns
+        the same price as a 'pad' lookup on the original DataFrame.
+        Timestamps prior to the first available price of an asset
+        are stored as NaN. Raises a ValueError if the timestamps of
+        an asset are not unique and sorted.
+
+        Parameters
+        ----------
+        bid_ask_frames : `dict{str: pd.DataFrame}`
+            The asset symbol keyed bid/ask DataFrames.
+
+        Returns
+        -------
+        `ArrayPriceStore`
+            The populated price store.
+        """
+        assets = list(bid_ask_frames.keys())
+        asset_timestamps = [
+            bid_ask_frames[asset].index.asi8 for asset in assets
+        ]
+        for asset, timestamps in zip(assets, asset_timestamps):
+            if np.any(np.diff(timestamps) <= 0):
+                raise ValueError(
+                    "Unable to align the prices of '%s' as its timestamps "
+                    "are not unique and sorted in ascending order." % asset
+                )
+        if len(asset_timestamps) > 0:
+            timestamps = np.unique(np.concatenate(asset_timestamps))
+        else:
+            timestamps = np.array([], dtype=np.int64)
+
+        mid_only = len(assets) > 0 and all(
+            'Mid' in bid_ask_frames[asset].columns for asset in assets
+        )
+        if mid_only:
+            dtype = np.result_type(
+                *[bid_ask_frames[asset]['Mid'].dtype for asset in assets]
+            )
+            bid = np.full((len(timestamps), len(assets)), np.NaN, dtype=dtype)
+            ask = bid
+        else:
+            bid = np.full((len(timestamps), len(assets)), np.NaN)
+            ask = np.full((len(timestamps), len(assets)), np.NaN)
+        first_valid = np.zeros(len(assets), dtype=np.int64)
+        for col, asset in enumerate(assets):
+            bid_ask_df = bid_ask_frames[asset]
+            pad_idx = np.searchsorted(
+                asset_timestamps[col], timestamps, side='right'
+            ) - 1
+            valid = pad_idx >= 0
+            first_valid[col] = np.argmax(valid) if valid.any() \
+                else len(timestamps)
+            if mid_only:
+                bid[valid, col] = bid_ask_df['Mid'].to_numpy()[pad_idx[valid]]
+                continue
+            bid[valid, col] = bid_ask_df['Bid'].to_numpy()[pad_idx[valid]]
+            ask[valid, col] = bid_ask_df['Ask'].to_numpy()[pad_idx[valid]]
+        return cls(timestamps, assets, bid, ask, first_valid=first_valid)
+
+    @classmethod
+    def merge(cls, stores):
+        """
+        Merge a list of price stores into a single store aligned on
+        the union of their timestamps.
+
+        Each price is taken from the first store in the list that
+        provides a (non-NaN) price of the asset at that timestamp,
+        such that subsequent stores only backfill missing prices.
+
+        If all of the stores only hold mid prices then so does the
+        merged store.
+
+        Parameters
+        ----------
+        stores : `list[ArrayPriceStore]`
+            The price stores, in order of priority.
+
+        Returns
+        -------
+        `ArrayPriceStore`
+            The merged price store.
+        """
+        assets = []
+        for store in stores:
+            assets.extend(
+                asset for asset in store.assets if asset not in assets
+            )
+        asset_index = {asset: idx for idx, asset in enumerate(assets)}
+        if len(stores) > 0:
+            timestamps = np.unique(
+                np.concatenate([store.timestamps for store in stores])
+            )
+        else:
+            timestamps = np.array([], dtype=np.int64)
+
+        mid_only = len(stores) > 0 and all(
+            store.ask is store.bid for store in stores
+        )
+        if mid_only:
+            dtype = np.result_type(*[store.bid.dtype for store in stores])
+            bid = np.full((len(timestamps), len(assets)), np.NaN, dtype=dtype)
+            ask = bid
+        else:
+            bid = np.full((len(timestamps), len(assets)), np.NaN)
+            ask = np.full((len(timestamps), len(assets)), np.NaN)
+        for store in stores:
+            pad_idx = np.searchsorted(
+                store.timestamps, timestamps, side='right'
+            ) - 1
+            valid = pad_idx >= 0
+            for col, asset in enumerate(store.assets):
+                merged_col = asset_index[asset]
+                missing = valid & np.isnan(bid[:, merged_col])
+                bid[missing, merged_col] = store.bid[pad_idx[missing], col]
+                if not mid_only:
+                    ask[missing, merged_col] = store.ask[pad_idx[missing], col]
+        return cls(timestamps, assets, bid, ask)
+
+    def append(self, bid_ask_frames):
+        """
+        Extend the store in place with the new prices of a set of
+        assets, such as the latest day of data in a nightly run,
+        without re-aligning the existing prices.
+
+        The new prices of each asset must follow all of its existing
+        prices. New timestamps after the end of the store are appended
+        as rows forward-filled from the prior prices, while the prices
+        of each asset from its first new timestamp onwards are replaced
+        by (forward-filled) new prices. Previously unseen assets are
+        appended as columns.
+
+        New timestamps lying before the end of the store that are not
+        already present would require the existing rows to be re-aligned,
+        as would a change between mid-only and bid/ask prices, in which
+        case the store is left unmodified.
+
+        Parameters
+        ----------
+        bid_ask_frames : `dict{str: pd.DataFrame}`
+            The asset symbol keyed DataFrames of the new 'Bid' and
+            'Ask' (or 'Mid') prices of each asset.
+
+        Returns
+        -------
+        `Boolean`
+            Whether the store was extended, or else must be recreated.
+        """
+        bid_ask_frames = {
+            asset: bid_ask_df for asset, bid_ask_df in bid_ask_frames.items()
+            if len(bid_ask_df) > 0
+        }
+        if len(bid_ask_frames) == 0:
+            return True
+        mid_only = self.ask is self.bid
+        for asset, bid_ask_df in bid_ask_frames.items():
+            if ('Mid' in bid_ask_df.columns) != mid_only:
+                return False
+            if np.any(np.diff(bid_ask_df.index.asi8) <= 0):
+                raise ValueError(
+                    "Unable to align the prices of '%s' as its timestamps "
+                    "are not unique and sorted in ascending order." % asset
+                )
+        new_timestamps = np.unique(np.concatenate([
+            bid_ask_df.index.asi8 for bid_ask_df in bid_ask_frames.values()
+        ]))
+        num_rows = len(self.timestamps)
+        if num_rows > 0:
+            existing = new_timestamps[new_timestamps <= self.timestamps[-1]]
+            if not np.isin(existing, self.timestamps).all():
+                return False
+            new_timestamps = new_timestamps[
+                new_timestamps > self.timestamps[-1]
+            ]
+
+        new_assets = [
+            asset for asset in bid_ask_frames if asset not in self.asset_index
+        ]
+        extra_rows = len(new_timestamps)
+        extra_cols = len(new_assets)
+
+        def extend(prices):
+            if extra_rows == 0 and extra_cols == 0:
+                # Memory-mapped stores are read-only
+                return prices if prices.flags.writeable else prices.copy()
+            extended = np.full(
+                (num_rows + extra_rows, prices.shape[1] + extra_cols),
+                np.NaN, dtype=prices.dtype
+            )
+            extended[:num_rows, :prices.shape[1]] = prices
+            if num_rows > 0:
+                extended[num_rows:, :prices.shape[1]] = prices[-1]
+            return extended
+
+        self.bid = extend(self.bid)
+        self.ask = self.bid if mid_only else extend(self.ask)
+        self.timestamps = np.concatenate([self.timestamps, new_timestamps])
+        num_rows = len(self.timestamps)
+        for asset in new_assets:
+            self.asset_index[asset] = len(self.assets)
+            self.assets.append(asset)
+        self.first_valid = np.concatenate([
+            self.first_valid, np.full(extra_cols, num_rows, dtype=np.int64)
+        ])
+
+        for asset, bid_ask_df in bid_ask_frames.items():
+            col = self.asset_index[asset]
+            asset_timestamps = bid_ask_df.index.asi8
+            start_row = int(np.searchsorted(self.timestamps, asset_timestamps[0]))
+            pad_idx = np.searchsorted(
+                asset_timestamps, self.timestamps[start_row:], side='right'
+            ) - 1
+            if mid_only:
+                self.bid[start_row:, col] = bid_ask_df['Mid'].to_numpy()[pad_idx]
+            else:
+                self.bid[start_row:, col] = bid_ask_df['Bid'].to_numpy()[pad_idx]
+                self.ask[start_row:, col] = bid_ask_df['Ask'].to_numpy()[pad_idx]
+            self.first_valid[col] = min(self.first_valid[col], start_row)
+
+        self.last_dt_ns = None
+        self.last_row = -1
+        return True
+
+    def save(self, store_dir):
+        """
+        Save the price store to a directory of NumPy '.npy' files,
+        which can subsequently be memory-mapped via `load`.
+
+        Parameters
+        ----------
+        store_dir : `str`
+            The full path to the directory in which to store the prices.
+        """
+        os.makedirs(store_dir, exist_ok=True)
+        np.save(os.path.join(store_dir, 'timestamps.npy'), self.timestamps)
+        np.save(os.path.join(store_dir, 'bid.npy'), self.bid)
+        np.save(os.path.join(store_dir, 'first_valid.npy'), self.first_valid)
+        ask_path = os.path.join(store_dir, 'ask.npy')
+        if self.ask is not self.bid:
+            np.save(ask_path, self.ask)
+        elif os.path.exists(ask_path):
+            os.remove(ask_path)
+        with open(os.path.join(store_dir, 'assets.json'), 'w') as assets_file:
+            json.dump(self.assets, assets_file)
+
+    @classmethod
+    def load(cls, store_dir, mmap=True):
+        """
+        Load a price store previously saved via `save`.
+
+        Parameters
+        ----------
+        store_dir : `str`
+            The full path to the directory in which the prices are stored.
+        mmap : `Boolean`, optional
+            Whether to memory-map the price matrices read-only rather
+            than reading them into memory. Defaults to True.
+
+        Returns
+        -------
+        `ArrayPriceStore`
+            The loaded price store.
+        """
+        mmap_mode = 'r' if mmap else None
+        with open(os.path.join(store_dir, 'assets.json'), 'r') as assets_file:
+            assets = json.load(assets_file)
+        bid = np.load(os.path.join(store_dir, 'bid.npy'), mmap_mode=mmap_mode)
+        ask_path = os.path.join(store_dir, 'ask.npy')
+        if os.path.exists(ask_path):
+            ask = np.load(ask_path, mmap_mode=mmap_mode)
+        else:  # Mid prices only
+            ask = bid
+        first_valid_path = os.path.join(store_dir, 'first_valid.npy')
+        first_valid = None
+        if os.path.exists(first_valid_path):
+            first_valid = np.load(first_valid_path)
+        return cls(
+            np.load(os.path.join(store_dir, 'timestamps.npy')),
+            assets, bid, ask, first_valid=first_valid
+        )
+
+    @staticmethod
+    def _timestamp_to_ns(dt):
+        """
+        Convert a timestamp into integer nanoseconds since the epoch.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to convert.
+
+        Returns
+        -------
+        `int`
+            The nanosecond representation of the timestamp.
+        """
+        return pd.Timestamp(dt).value
+
+    def locate(self, dt):
+        """
+        Obtain the row of the price matrices that is current
+        at the provided timestamp, i.e. the last row whose
+        timestamp does not exceed it. The row is shared by
+        all of the assets.
+
+        As simulation time advances monotonically, the row is
+        found in constant time from the previously located row
+        where possible, falling back to a binary search otherwise.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to locate.
+
+        Returns
+        -------
+        `int`
+            The row position, or -1 if the timestamp is prior to
+            the start of the store.
+        """
+        dt_ns = self._timestamp_to_ns(dt)
+        if dt_ns == self.last_dt_ns:
+            return self.last_row
+
+        row = self.last_row
+        num_rows = len(self.timestamps)
+        if self.last_dt_ns is not None and dt_ns > self.last_dt_ns:
+            # Time has advanced, so check whether the row is unchanged
+            # or has moved onto the next row before searching
+            if row + 1 >= num_rows or self.timestamps[row + 1] > dt_ns:
+                pass
+            elif row + 2 >= num_rows or self.timestamps[row + 2] > dt_ns:
+                row += 1
+            else:
+                row = int(
+                    np.searchsorted(self.timestamps, dt_ns, side='right')
+                ) - 1
+        else:
+            row = int(
+                np.searchsorted(self.timestamps, dt_ns, side='right')
+            ) - 1
+        self.last_row = row
+        self.last_dt_ns = dt_ns
+        return row
+
+    def _get_price(self, prices, dt, asset):
+        """
+        Obtain a single price of an asset at the provided timestamp
+        from the provided price matrix.
+
+        Parameters
+        ----------
+        prices : `np.ndarray`
+            The (time x asset) price matrix.
+        dt : `pd.Timestamp`
+            When to obtain the price for.
+        asset : `str`
+            The asset symbol to obtain the price for.
+
+        Returns
+        -------
+        `float`
+            The price, or NaN if prior to the start date.
+        """
+        col = self.asset_index[asset]
+        row = self.locate(dt)
+        if row < self.first_valid[col]:  # Before start date
+            return np.NaN
+        # Reduced precision prices are returned as double precision
+        return float(prices[row, col])
+
+    def _get_prices(self, prices, dt, assets):
+        """
+        Obtain the prices of a list of assets at the provided
+        timestamp from the provided price matrix.
+
+        Assets not present within the store are returned as NaN.
+
+        Parameters
+        ----------
+        prices : `np.ndarray`
+            The (time x asset) price matrix.
+        dt : `pd.Timestamp`
+            When to obtain the prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The prices, in the order of the provided assets.
+        """
+        cols = np.array(
+            [self.asset_index.get(asset, -1) for asset in assets],
+            dtype=np.int64
+        )
+        result = np.full(len(cols), np.NaN)
+        row = self.locate(dt)
+        if row < 0:  # Before start date
+            return result
+        known = cols >= 0
+        known[known] = row >= self.first_valid[cols[known]]
+        result[known] = prices[row, cols[known]]
+        return result
+
+    def get_bid(self, dt, asset):
+        """
+        Obtain the bid price of an asset at the provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the bid price for.
+        asset : `str`
+            The asset symbol to obtain the bid price for.
+
+        Returns
+        -------
+        `float`
+            The bid price.
+        """
+        return self._get_price(self.bid, dt, asset)
+
+    def get_ask(self, dt, asset):
+        """
+        Obtain the ask price of an asset at the provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the ask price for.
+        asset : `str`
+            The asset symbol to obtain the ask price for.
+
+        Returns
+        -------
+        `float`
+            The ask price.
+        """
+        return self._get_price(self.ask, dt, asset)
+
+    def get_bids(self, dt, assets):
+        """
+        Obtain the bid prices of a list of assets at the
+        provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the bid prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the bid prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The bid prices, in the order of the provided assets.
+        """
+        return self._get_prices(self.bid, dt, assets)
+
+    def get_asks(self, dt, assets):
+        """
+        Obtain the ask prices of a list of assets at the
+        provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the ask prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the ask prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The ask prices, in the order of the provided assets.
+        """
+        return self._get_prices(self.ask, dt, assets)
+
+    def _get_price_matrix(self, prices, dts, assets):
+        """
+        Obtain the prices of a list of assets at each of a sorted
+        list of timestamps from the provided price matrix, using a
+        single vectorised search over all of the timestamps.
+
+        Assets not present within the store are returned as NaN.
+
+        Parameters
+        ----------
+        prices : `np.ndarray`
+            The (time x asset) price matrix.
+        dts : `list[pd.Timestamp]` or `pd.DatetimeIndex`
+            When to obtain the prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The (timestamp x asset) prices, in the order of the
+            provided timestamps and assets.
+        """
+        dts_ns = pd.DatetimeIndex(dts).asi8
+        cols = np.array(
+            [self.asset_index.get(asset, -1) for asset in assets],
+            dtype=np.int64
+        )
+        rows = np.searchsorted(self.timestamps, dts_ns, side='right') - 1
+        result = np.full((len(rows), len(cols)), np.NaN)
+        known = cols >= 0
+        known_cols = cols[known]
+        valid = rows[:, np.newaxis] >= self.first_valid[known_cols]
+        known_prices = prices[np.ix_(np.maximum(rows, 0), known_cols)]
+        result[:, known] = np.where(valid, known_prices, np.NaN)
+        return result
+
+    def get_bids_matrix(self, dts, assets):
+        """
+        Obtain the bid prices of a list of assets at each of a
+        list of timestamps.
+
+        Parameters
+        ----------
+        dts : `list[pd.Timestamp]` or `pd.DatetimeIndex`
+            When to obtain the bid prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the bid prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The (timestamp x asset) bid prices.
+        """
+        return self._get_price_matrix(self.bid, dts, assets)
+
+    def get_asks_matrix(self, dts, assets):
+        """
+        Obtain the ask prices of a list of assets at each of a
+        list of timestamps.
+
+        Parameters
+        ----------
+        dts : `list[pd.Timestamp]` or `pd.DatetimeIndex`
+            When to obtain the ask prices for.
+        assets : `list[str]`
+            The asset symbols to obtain the ask prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The (timestamp x asset) ask prices.
+        """
+        return self._get_price_matrix(self.ask, dts, assets)
@@ -0,0 +1,239 @@
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+import pytz
+
+
+class StreamingAssetBars(object):
+    """
+    Reads the daily 'bar' CSV file of a single asset in chunks,
+    advancing through the file in step with the simulation clock
+    and retaining only a bounded window of bars in memory.
+
+    The CSV file must be sorted in ascending date order. Queries
+    must be made in (non-strictly) increasing time order, with
+    queries earlier than the retained window raising a ValueError.
+
+    At most `window` bars prior to the latest query time are
+    retained, along with the remainder of the most recently
+    read chunk, such that memory usage is independent of the
+    length of the history within the file.
+
+    Parameters
+    ----------
+    csv_path : `str`
+        The full path to the CSV file.
+    convert_func : `callable`
+        Converts a daily 'bar' DataFrame into a bid/ask DataFrame.
+    chunksize : `int`
+        The number of bars to read from the CSV file at a time.
+    window : `int`
+        The number of bars prior to the latest query to retain.
+    prepare_func : `callable`, optional
+        Prepares each chunk of daily 'bar' DataFrame prior to
+        conversion, such as adding adjusted prices.
+    """
+
+    def __init__(
+        self, csv_path, convert_func, chunksize, window, prepare_func=None
+    ):
+        self.csv_path = csv_path
+        self.convert_func = convert_func
+        self.prepare_func = prepare_func
+        self.chunksize = chunksize
+        self.window = window
+
+        self.reader = pd.read_csv(
+            csv_path, index_col='Date', parse_dates=True, chunksize=chunksize
+        )
+        self.exhausted = False
+        self.trimmed = False
+        self.bar_df = None
+        self.bid_ask_df = None
+
+    def _read_chunk(self):
+        """
+        Read the next chunk of bars from the CSV file, convert it
+        into bid/ask prices and append both to the retained bars.
+        """
+        try:
+            chunk_df = next(self.reader)
+        except StopIteration:
+            self.exhausted = True
+            self.reader.close()
+            return
+
+        # Ensure all timestamps are set to UTC for consistency
+        chunk_df = chunk_df.set_index(chunk_df.index.tz_localize(pytz.UTC))
+        if (
+            not chunk_df.index.is_monotonic_increasing or (
+                self.bar_df is not None and len(self.bar_df) > 0 and
+                chunk_df.index[0] <= self.bar_df.index[-1]
+            )
+        ):
+            raise ValueError(
+                "CSV file '%s' is not sorted in ascending date order and "
+                "so cannot be streamed in chunks." % self.csv_path
+            )
+
+        if self.prepare_func is not None:
+            chunk_df = self.prepare_func(chunk_df)
+        chunk_bid_ask_df = self.convert_func(chunk_df)
+        if self.bid_ask_df is not None and len(self.bid_ask_df) > 0:
+            # Forward-fill any leading missing prices of the chunk
+            # from the last price of the previous chunk
+            chunk_bid_ask_df = chunk_bid_ask_df.fillna(
+                self.bid_ask_df.iloc[-1]
+            )
+            self.bar_df = pd.concat([self.bar_df, chunk_df])
+            self.bid_ask_df = pd.concat([self.bid_ask_df, chunk_bid_ask_df])
+        else:
+            self.bar_df = chunk_df
+            self.bid_ask_df = chunk_bid_ask_df
+
+    def _trim(self, row):
+        """
+        Discard all bars more than the window size prior to the
+        bid/ask row that is current at the latest query time.
+
+        Parameters
+        ----------
+        row : `int`
+            The current bid/ask row position.
+        """
+        # Each bar provides two bid/ask rows (open and close)
+        first_row = row - (2 * self.window) + 1
+        if first_row <= 0:
+            return
+        first_dt = self.bid_ask_df.index[first_row].normalize()
+        self.bid_ask_df = self.bid_ask_df.iloc[first_row:]
+        self.bar_df = self.bar_df.loc[first_dt:]
+        self.trimmed = True
+
+    def advance(self, dt):
+        """
+        Read chunks from the CSV file until bars beyond the provided
+        time are retained (or the file is exhausted) and trim the
+        retained bars to the window.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The time to advance to.
+
+        Returns
+        -------
+        `int`
+            The bid/ask row position current at the provided time,
+            or -1 if prior to the first available price.
+        """
+        dt_ns = pd.Timestamp(dt).value
+        while not self.exhausted and (
+            self.bid_ask_df is None or
+            len(self.bid_ask_df) == 0 or
+            self.bid_ask_df.index.asi8[-1] <= dt_ns
+        ):
+            self._read_chunk()
+        if self.bid_ask_df is None:
+            return -1
+
+        timestamps = self.bid_ask_df.index.asi8
+        if self.trimmed and (len(timestamps) == 0 or dt_ns < timestamps[0]):
+            raise ValueError(
+                "Unable to obtain prices for '%s' at '%s' as it is earlier "
+                "than the window of bars retained when streaming." % (
+                    self.csv_path, dt
+                )
+            )
+        row = int(np.searchsorted(timestamps, dt_ns, side='right')) - 1
+        self._trim(row)
+        return row - max(0, row - (2 * self.window) + 1)
+
+    def _get_price(self, dt, column):
+        """
+        Obtain the bid or ask price at the provided time.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the price for.
+        column : `str`
+            The price column, 'Bid' or 'Ask'.
+
+        Returns
+        -------
+        `float`
+            The price, or NaN if prior to the start date.
+        """
+        row = self.advance(dt)
+        if row < 0:  # Before start date
+            return np.NaN
+        if column not in self.bid_ask_df.columns:  # Mid prices only
+            column = 'Mid'
+        return float(self.bid_ask_df[column].iloc[row])
+
+    def get_bid(self, dt):
+        """
+        Obtain the bid price at the provided time.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the bid price for.
+
+        Returns
+        -------
+        `float`
+            The bid price.
+        """
+        return self._get_price(dt, 'Bid')
+
+    def get_ask(self, dt):
+        """
+        Obtain the ask price at the provided time.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            When to obtain the ask price for.
+
+        Returns
+        -------
+        `float`
+            The ask price.
+        """
+        return self._get_price(dt, 'Ask')
+
+
+class StreamingAssetFrames(Mapping):
+    """
+    A read-only asset symbol keyed mapping of the currently
+    retained bar or bid/ask DataFrames of streamed assets.
+
+    Parameters
+    ----------
+    asset_streams : `dict{str: StreamingAssetBars}`
+        Map of asset symbol to its streamed bars.
+    frame_attr : `str`
+        The retained DataFrame attribute, 'bar_df' or 'bid_ask_df'.
+    """
+
+    def __init__(self, asset_streams, frame_attr):
+        self.asset_streams = asset_streams
+        self.frame_attr = frame_attr
+
+    def __getitem__(self, asset):
+        stream = self.asset_streams[asset]
+        while getattr(stream, self.frame_attr) is None and not stream.exhausted:
+            stream._read_chunk()
+        return getattr(stream, self.frame_attr)
+
+    def __contains__(self, asset):
+        return asset in self.asset_streams
+
+    def __iter__(self):
+        return iter(self.asset_streams)
+
+    def __len__(self):
+        return len(self.asset_streams)
@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+
+
+# The nanoseconds within a day, used to calculate date gaps
+DAY_NS = 24 * 60 * 60 * 1000000000
+
+
+class BarDataValidator(object):
+    """
+    Performs vectorised data-quality checks of daily 'bar' OHLCV
+    DataFrames, such that bad data is detected prior to the start of
+    a backtest rather than part way through the simulation.
+
+    The following are considered errors, which prevent the data
+    from being utilised:
+
+    * Missing 'Open'/'Close' columns, or a missing 'Adj Close'
+      column if prices are to be adjusted.
+    * Duplicate or unsorted dates.
+    * Non-positive prices.
+
+    Missing (NaN) prices, which are forward-filled, and gaps between
+    consecutive dates exceeding the maximum gap are reported but are
+    not considered errors.
+
+    Parameters
+    ----------
+    max_gap_days : `int`, optional
+        The maximum number of calendar days between consecutive bars
+        before the gap is reported. Defaults to 7.
+    """
+
+    price_columns = ['Open', 'High', 'Low', 'Close', 'Adj Close']
+
+    def __init__(self, max_gap_days=7):
+        self.max_gap_days = max_gap_days
+
+    def validate(self, bar_df, adjust_prices=True):
+        """
+        Check the quality of a single daily 'bar' DataFrame.
+
+        Parameters
+        ----------
+        bar_df : `pd.DataFrame`
+            The date-indexed daily 'bar' OHLCV DataFrame.
+        adjust_prices : `Boolean`, optional
+            Whether the prices are to be adjusted, requiring an
+            'Adj Close' column. Defaults to True.
+
+        Returns
+        -------
+        `dict`
+            The JSON serialisable report of the checks, including
+            the list of any 'errors'.
+        """
+        required_columns = ['Open', 'Close']
+        if adjust_prices:
+            required_columns.append('Adj Close')
+        missing_columns = [
+            column for column in required_columns
+            if column not in bar_df.columns
+        ]
+
+        dates = bar_df.index.asi8
+        date_diffs = np.diff(dates)
+        duplicate_dates = int((date_diffs == 0).sum())
+        unsorted = bool((date_diffs < 0).any())
+        gap_days = date_diffs / DAY_NS
+        max_gap_days = float(gap_days.max()) if len(gap_days) > 0 else 0.0
+        gaps = int((gap_days > self.max_gap_days).sum())
+
+        columns = [
+            column for column in self.price_columns
+            if column in bar_df.columns
+        ]
+        prices = bar_df[columns].to_numpy(dtype=np.float64)
+        nan_prices = np.isnan(prices)
+        with np.errstate(invalid='ignore'):
+            non_positive_prices = (prices <= 0.0) & ~nan_prices
+
+        errors = []
+        if len(missing_columns) > 0:
+            errors.append(
+                "Missing pricing columns: %s" % ', '.join(missing_columns)
+            )
+        if duplicate_dates > 0:
+            errors.append("%s duplicate dates" % duplicate_dates)
+        if unsorted:
+            errors.append("Dates are not sorted")
+        if non_positive_prices.any():
+            first_row = int(np.argmax(non_positive_prices.any(axis=1)))
+            errors.append(
+                "%s non-positive prices, the first on %s" % (
+                    int(non_positive_prices.sum()),
+                    bar_df.index[first_row].isoformat()
+                )
+            )
+
+        return {
+            'rows': len(bar_df),
+            'start': bar_df.index[0].isoformat() if len(bar_df) > 0 else None,
+            'end': bar_df.index[-1].isoformat() if len(bar_df) > 0 else None,
+            'missing_columns': missing_columns,
+            'duplicate_dates': duplicate_dates,
+            'unsorted': unsorted,
+            'nan_prices': dict(zip(columns, nan_prices.sum(axis=0).tolist())),
+            'non_positive_prices': dict(
+                zip(columns, non_positive_prices.sum(axis=0).tolist())
+            ),
+            'max_gap_days': max_gap_days,
+            'gaps': gaps,
+            'errors': errors
+        }
+
+    def validate_frames(self, bar_frames, adjust_prices=True):
+        """
+        Check the quality of each of the daily 'bar' DataFrames.
+
+        Parameters
+        ----------
+        bar_frames : `dict{str: pd.DataFrame}`
+            The asset-symbol keyed dictionary of bar DataFrames.
+        adjust_prices : `Boolean`, optional
+            Whether the prices are to be adjusted. Defaults to True.
+
+        Returns
+        -------
+        `dict{str: dict}`
+            The asset-symbol keyed reports.
+        """
+        return {
+            asset: self.validate(bar_df, adjust_prices=adjust_prices)
+            for asset, bar_df in bar_frames.items()
+        }
+
+    @staticmethod
+    def check(report):
+        """
+        Raise an error describing every asset whose report
+        contains errors.
+
+        Parameters
+        ----------
+        report : `dict{str: dict}`
+            The asset-symbol keyed reports.
+        """
+        invalid_assets = [
+            '%s (%s)' % (asset, '; '.join(asset_report['errors']))
+            for asset, asset_report in report.items()
+            if len(asset_report['errors']) > 0
+        ]
+        if len(invalid_assets) > 0:
+            raise ValueError(
+                "Daily bar data failed validation for %s asset(s): %s" % (
+                    len(invalid_assets), ', '.join(invalid_assets)
+                )
+            )
+
+    @staticmethod
+    def summary(report):
+        """
+        Create a DataFrame summarising the per-asset reports.
+
+        Parameters
+        ----------
+        report : `dict{str: dict}`
+            The asset-symbol keyed reports.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The asset-indexed summary of the reports.
+        """
+        return pd.DataFrame.from_dict(
+            {
+                asset: {
+                    'rows': asset_report['rows'],
+                    'start': asset_report['start'],
+                    'end': asset_report['end'],
+                    'duplicate_dates': asset_report['duplicate_dates'],
+                    'nan_prices': sum(asset_report['nan_prices'].values()),
+                    'non_positive_prices': sum(
+                        asset_report['non_positive_prices'].values()
+                    ),
+                    'max_gap_days': asset_report['max_gap_days'],
+                    'gaps': asset_report['gaps'],
+                    'errors': len(asset_report['errors'])
+                }
+                for asset, asset_report in report.items()
+            },
+            orient='index'
+        )
@@ -0,0 +1,438 @@
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import (
+    GoodFriday, Holiday, USLaborDay, USMemorialDay, USPresidentsDay,
+    USThanksgivingDay, nearest_workday, sunday_to_monday
+)
+from pandas.tseries.offsets import DateOffset, Day
+from dateutil.relativedelta import MO, TH
+
+NS_PER_DAY = 24 * 60 * 60 * 1000 * 1000 * 1000
+
+DEFAULT_MARKET_OPEN = '14:30:00'
+DEFAULT_MARKET_CLOSE = '21:00:00'
+DEFAULT_WEEKMASK = 'Mon Tue Wed Thu Fri'
+
+
+class ExchangeCalendar(object):
+    """
+    The trading calendar of an exchange, consisting of the session
+    (trading day) dates along with the (UTC) market open and market
+    close times of each session, accounting for weekends, exchange
+    holidays and early closes.
+
+    The sessions are precomputed, for whole calendar years at a time,
+    into a session table that is cached upon the calendar instance and
+    extended only when a date outside of the cached years is requested.
+    The open and close times of every calendar day of the cached years
+    are additionally held within contiguous lists, indexed by the
+    number of days since the first cached day, such that checking
+    whether the exchange is open at a timestamp is an O(1) lookup
+    rather than any date arithmetic.
+
+    Without any holiday or early close rules the calendar consists
+    of every weekday, i.e. the same days as a `BDay` date range.
+
+    Parameters
+    ----------
+    name : `str`, optional
+        The name of the exchange calendar, e.g. 'NYSE'.
+    market_open : `str`, optional
+        The (UTC) time of the market open, in 'HH:MM:SS' format.
+        Defaults to '14:30:00'.
+    market_close : `str`, optional
+        The (UTC) time of the market close, in 'HH:MM:SS' format.
+        Defaults to '21:00:00'.
+    early_close : `str`, optional
+        The (UTC) time of the market close on early close sessions,
+        in 'HH:MM:SS' format. Defaults to the market close time.
+    holiday_rules : `list[Holiday]`, optional
+        The Pandas holiday rules of the regular exchange holidays.
+    adhoc_holidays : `list[str]`, optional
+        The dates of any irregular (e.g. unscheduled) exchange closures.
+    early_close_rules : `list[Holiday]`, optional
+        The Pandas holiday rules of the regular early close sessions.
+    adhoc_early_closes : `list[str]`, optional
+        The dates of any irregular early close sessions.
+    weekmask : `str`, optional
+        The weekdays on which the exchange trades. Defaults to
+        'Mon Tue Wed Thu Fri'.
+    """
+
+    def __init__(
+        self, name='BDAY', market_open=DEFAULT_MARKET_OPEN,
+        market_close=DEFAULT_MARKET_CLOSE, early_close=None,
+        holiday_rules=None, adhoc_holidays=None, early_close_rules=None,
+        adhoc_early_closes=None, weekmask=DEFAULT_WEEKMASK
+    ):
+        self.name = name
+        self.market_open = pd.Timedelta(market_open)
+        self.market_close = pd.Timedelta(market_close)
+        self.early_close = (
+            self.market_close if early_close is None
+            else pd.Timedelta(early_close)
+        )
+        if not (
+            pd.Timedelta(0) <= self.market_open < self.early_close <=
+            self.market_close < pd.Timedelta(days=1)
+        ):
+            raise ValueError(
+                "Market open time '%s' must precede the early close time "
+                "'%s' and market close time '%s' within the same day. "
+                "Cannot create ExchangeCalendar instance." % (
+                    market_open, early_close, market_close
+                )
+            )
+        self.holiday_rules = list(holiday_rules or [])
+        self.adhoc_holidays = pd.DatetimeIndex(adhoc_holidays or [])
+        self.early_close_rules = list(early_close_rules or [])
+        self.adhoc_early_closes = pd.DatetimeIndex(adhoc_early_closes or [])
+        self.weekmask = weekmask
+
+        self.first_year = None
+        self.last_year = None
+        self.session_table = None
+        self.first_day = None
+        self.day_opens = None
+        self.day_closes = None
+
+    @staticmethod
+    def _to_utc_date(dt):
+        """
+        Obtain the (UTC) date of a timestamp, as a timezone-naive
+        midnight timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp` or `str`
+            The timestamp.
+
+        Returns
+        -------
+        `pd.Timestamp`
+            The midnight timestamp of the date.
+        """
+        dt = pd.Timestamp(dt)
+        if dt.tz is not None:
+            dt = dt.tz_convert('UTC').tz_localize(None)
+        return dt.normalize()
+
+    @staticmethod
+    def _rule_dates(rules, adhoc_dates, start, end):
+        """
+        Obtain the dates of a collection of holiday rules, along
+        with any adhoc dates, between the provided dates.
+
+        Parameters
+        ----------
+        rules : `list[Holiday]`
+            The Pandas holiday rules.
+        adhoc_dates : `pd.DatetimeIndex`
+            The adhoc dates.
+        start : `pd.Timestamp`
+            The starting date.
+        end : `pd.Timestamp`
+            The ending date.
+
+        Returns
+        -------
+        `pd.DatetimeIndex`
+            The sorted, unique dates.
+        """
+        dates = adhoc_dates[(adhoc_dates >= start) & (adhoc_dates <= end)]
+        for rule in rules:
+            dates = dates.append(rule.dates(start, end))
+        return dates.unique().sort_values()
+
+    def _build_sessions(self, first_year, last_year):
+        """
+        Precompute the session table, and the daily open and close
+        lists, of all calendar days of the provided years.
+
+        Parameters
+        ----------
+        first_year : `int`
+            The first year of the sessions.
+        last_year : `int`
+            The last year of the sessions.
+        """
+        start = pd.Timestamp(first_year, 1, 1)
+        end = pd.Timestamp(last_year, 12, 31)
+
+        holidays = self._rule_dates(
+            self.holiday_rules, self.adhoc_holidays, start, end
+        )
+        days = pd.bdate_range(
+            start, end, freq='C', weekmask=self.weekmask,
+            holidays=list(holidays), name='Date'
+        )
+        midnights = days.asi8
+        early_closes = np.isin(
+            midnights,
+            self._rule_dates(
+                self.early_close_rules, self.adhoc_early_closes, start, end
+            ).asi8
+        )
+
+        opens = midnights + self.market_open.value
+        closes = midnights + np.where(
+            early_closes, self.early_close.value, self.market_close.value
+        )
+        self.session_table = pd.DataFrame(
+            {
+                'market_open': pd.DatetimeIndex(opens).tz_localize('UTC'),
+                'market_close': pd.DatetimeIndex(closes).tz_localize('UTC'),
+                'early_close': early_closes
+            },
+            index=days
+        )
+
+        # Non-session days have identical (zero) open and close times,
+        # such that no timestamp lies within them. These are held as
+        # lists of Python integers, which are faster to index and
+        # compare individually than NumPy scalars.
+        self.first_day = start.value // NS_PER_DAY
+        num_days = (end - start).days + 1
+        day_idx = midnights // NS_PER_DAY - self.first_day
+        day_opens = np.zeros(num_days, dtype=np.int64)
+        day_closes = np.zeros(num_days, dtype=np.int64)
+        day_opens[day_idx] = opens
+        day_closes[day_idx] = closes
+        self.day_opens = day_opens.tolist()
+        self.day_closes = day_closes.tolist()
+
+        self.first_year = first_year
+        self.last_year = last_year
+
+    def _ensure_years(self, first_year, last_year):
+        """
+        Ensure that the cached sessions cover the provided years,
+        recomputing them over the combined years if not.
+
+        Parameters
+        ----------
+        first_year : `int`
+            The first required year.
+        last_year : `int`
+            The last required year.
+        """
+        if self.session_table is not None:
+            if self.first_year <= first_year and last_year <= self.last_year:
+                return
+            first_year = min(first_year, self.first_year)
+            last_year = max(last_year, self.last_year)
+        self._build_sessions(first_year, last_year)
+
+    def sessions(self, start_dt, end_dt):
+        """
+        Obtain the session table between the (UTC) dates of the
+        provided timestamps, inclusive.
+
+        Parameters
+        ----------
+        start_dt : `pd.Timestamp`
+            The starting timestamp.
+        end_dt : `pd.Timestamp`
+            The ending timestamp.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The 'market_open' and 'market_close' (UTC) timestamps, and
+            whether the session closes early, indexed by session date.
+        """
+        start = self._to_utc_date(start_dt)
+        end = self._to_utc_date(end_dt)
+        self._ensure_years(start.year, max(start.year, end.year))
+        return self.session_table.loc[start:end]
+
+    def is_session(self, dt):
+        """
+        Check whether the (UTC) date of the provided timestamp
+        is a trading session of the exchange.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to check.
+
+        Returns
+        -------
+        `Boolean`
+            Whether the date is a session.
+        """
+        day = self._to_utc_date(dt)
+        self._ensure_years(day.year, day.year)
+        day_idx = day.value // NS_PER_DAY - self.first_day
+        return self.day_opens[day_idx] != self.day_closes[day_idx]
+
+    def is_open(self, dt):
+        """
+        Check whether the exchange is open at the provided timestamp,
+        that is within the market open (inclusive) and market close
+        (exclusive) of a session.
+
+        Timezone-naive timestamps are assumed to be UTC.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp` or `datetime.datetime`
+            The timestamp to check.
+
+        Returns
+        -------
+        `Boolean`
+            Whether the exchange is open at this timestamp.
+        """
+        if not isinstance(dt, pd.Timestamp):
+            dt = pd.Timestamp(dt)
+        value = dt.value
+        if self.first_day is not None:
+            day_idx = value // NS_PER_DAY - self.first_day
+            if 0 <= day_idx < len(self.day_opens):
+                return (
+                    self.day_opens[day_idx] <= value < self.day_closes[day_idx]
+                )
+
+        # Extend the cached sessions to the year of the timestamp
+        year = self._to_utc_date(dt).year
+        self._ensure_years(year, year)
+        return self.is_open(dt)
+
+    def open_mask(self, dts):
+        """
+        Check whether the exchange is open at each of the provided
+        timestamps, in a single vectorised lookup of the precomputed
+        session open and close times.
+
+        Timezone-naive timestamps are assumed to be UTC.
+
+        Parameters
+        ----------
+        dts : `pd.DatetimeIndex` or `np.ndarray`
+            The timestamps to check.
+
+        Returns
+        -------
+        `np.ndarray`
+            The boolean mask of whether the exchange is open at
+            each timestamp.
+        """
+        dts = pd.DatetimeIndex(dts)
+        if dts.tz is not None:
+            dts = dts.tz_convert('UTC').tz_localize(None)
+        if len(dts) == 0:
+            return np.zeros(0, dtype=bool)
+        self._ensure_years(dts.min().year, dts.max().year)
+
+        values = dts.asi8
+        day_idx = values // NS_PER_DAY - self.first_day
+        day_opens = np.asarray(self.day_opens, dtype=np.int64)[day_idx]
+        day_closes = np.asarray(self.day_closes, dtype=np.int64)[day_idx]
+        return (day_opens <= values) & (values < day_closes)
+
+
+# The regular holidays of the New York Stock Exchange
+NYSE_HOLIDAY_RULES = [
+    Holiday(
+        'New Years Day', month=1, day=1, observance=sunday_to_monday
+    ),
+    Holiday(
+        'Martin Luther King Jr. Day', start_date='1998-01-01',
+        month=1, day=1, offset=DateOffset(weekday=MO(3))
+    ),
+    USPresidentsDay,
+    GoodFriday,
+    USMemorialDay,
+    Holiday(
+        'Juneteenth', start_date='2022-01-01', month=6, day=19,
+        observance=nearest_workday
+    ),
+    Holiday(
+        'Independence Day', month=7, day=4, observance=nearest_workday
+    ),
+    USLaborDay,
+    USThanksgivingDay,
+    Holiday('Christmas Day', month=12, day=25, observance=nearest_workday)
+]
+
+# Unscheduled closures of the New York Stock Exchange
+NYSE_ADHOC_HOLIDAYS = [
+    '1994-04-27',  # Funeral of President Nixon
+    '2001-09-11', '2001-09-12', '2001-09-13', '2001-09-14',  # 9/11
+    '2004-06-11',  # Funeral of President Reagan
+    '2007-01-02',  # Funeral of President Ford
+    '2012-10-29', '2012-10-30',  # Hurricane Sandy
+    '2018-12-05',  # Funeral of President George H. W. Bush
+    '2025-01-09'  # Funeral of President Carter
+]
+
+# The regular early close (13:00 ET) sessions of the New York
+# Stock Exchange, excluding those on which the holiday is observed
+NYSE_EARLY_CLOSE_RULES = [
+    Holiday(
+        'Day before Independence Day', month=7, day=3,
+        days_of_week=(0, 1, 2, 3)
+    ),
+    Holiday(
+        'Day after Thanksgiving', month=11, day=1,
+        offset=[DateOffset(weekday=TH(4)), Day(1)]
+    ),
+    Holiday(
+        'Christmas Eve', month=12, day=24, days_of_week=(0, 1, 2, 3)
+    )
+]
+
+
+def _create_nyse_calendar():
+    """
+    Create the New York Stock Exchange calendar, with session times
+    consistent with the (UTC) default market open and close times.
+
+    Returns
+    -------
+    `ExchangeCalendar`
+        The NYSE calendar.
+    """
+    return ExchangeCalendar(
+        name='NYSE', market_open=DEFAULT_MARKET_OPEN,
+        market_close=DEFAULT_MARKET_CLOSE, early_close='18:00:00',
+        holiday_rules=NYSE_HOLIDAY_RULES,
+        adhoc_holidays=NYSE_ADHOC_HOLIDAYS,
+        early_close_rules=NYSE_EARLY_CLOSE_RULES
+    )
+
+
+EXCHANGE_CALENDARS = {
+    'NYSE': _create_nyse_calendar
+}
+
+# The calendar instances shared between all components, such that
+# the session table of each exchange is computed only once
+_calendar_cache = {}
+
+
+def get_exchange_calendar(name):
+    """
+    Obtain the shared calendar instance of an exchange.
+
+    Parameters
+    ----------
+    name : `str`
+        The name of the exchange, e.g. 'NYSE'.
+
+    Returns
+    -------
+    `ExchangeCalendar`
+        The exchange calendar.
+    """
+    if name not in _calendar_cache:
+        try:
+            create_calendar = EXCHANGE_CALENDARS[name]
+        except KeyError:
+            raise ValueError(
+                "Unknown exchange calendar '%s'. Available calendars "
+                "are: %s" % (name, ', '.join(sorted(EXCHANGE_CALENDARS)))
+            )
+        _calendar_cache[name] = create_calendar()
+    return _calendar_cache[name]
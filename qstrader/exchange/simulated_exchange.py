@@ -1,6 +1,5 @@
-import datetime
-
 from qstrader.exchange.exchange import Exchange
+from qstrader.exchange.exchange_calendar import ExchangeCalendar
 
 
 class SimulatedExchange(Exchange):
@@ -16,26 +15,24 @@ class SimulatedExchange(Exchange):
     ----------
     start_dt : `pd.Timestamp`
         The starting time of the simulated exchange.
+    calendar : `ExchangeCalendar`, optional
+        The trading calendar of the exchange, determining its
+        sessions, holidays and early closes. Defaults to a calendar
+        of every weekday between the (UTC) times of 14:30 and 21:00.
     """
 
-    def __init__(self, start_dt):
+    def __init__(self, start_dt, calendar=None):
         self.start_dt = start_dt
-
-        # TODO: Eliminate hardcoding of NYSE
-        # TODO: Make these timezone-aware
-        self.open_dt = datetime.time(14, 30)
-        self.close_dt = datetime.time(21, 00)
+        self.calendar = calendar if calendar is not None else ExchangeCalendar()
 
     def is_open_at_datetime(self, dt):
         """
         Check if the SimulatedExchange is open at a particular
         provided pandas Timestamp.
 
-        This logic is simplistic in that it only checks whether
-        the provided time is between market hours on a weekday.
-
-        There is no historical calendar handling or concept of
-        exchange holidays.
+        This is an O(1) lookup of the precomputed session open
+        and close times of the date of the timestamp within the
+        exchange calendar.
 
         Parameters
         ----------
@@ -47,6 +44,22 @@ class SimulatedExchange(Exchange):
         `Boolean`
             Whether the exchange is open at this timestamp.
         """
-        if dt.weekday() > 4:
-            return False
-        return self.open_dt <= dt.time() and dt.time() < self.close_dt
+        return self.calendar.is_open(dt)
+
+    def is_open_at_datetimes(self, dts):
+        """
+        Check if the SimulatedExchange is open at each of the
+        provided timestamps, in a single vectorised lookup.
+
+        Parameters
+        ----------
+        dts : `pd.DatetimeIndex` or `np.ndarray`
+            The timestamps to check for open market hours.
+
+        Returns
+        -------
+        `np.ndarray`
+            The boolean mask of whether the exchange is open at
+            each timestamp.
+        """
+        return self.calendar.open_mask(dts)
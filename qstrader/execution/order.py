@@ -1,7 +1,11 @@
-import uuid
+import itertools
 
 import numpy as np
 
+# Monotonically increasing source of unique order IDs, which is
+# considerably cheaper than generating a UUID for every order
+_order_id_counter = itertools.count(1)
+
 
 class Order(object):
     """
@@ -10,7 +14,12 @@ class Order(object):
 
     A commission can be added here to override the commission
     model, if known. An order_id can be added if required,
-    otherwise it will be randomly assigned.
+    otherwise it will be assigned from a monotonically
+    increasing counter.
+
+    Attributes are stored within `__slots__`, rather than a
+    per-instance `__dict__`, to reduce the memory and allocation
+    cost of the many orders created during large backtests.
 
     Parameters
     ----------
@@ -23,10 +32,15 @@ class Order(object):
         A negative quantity means a short.
     commission : `float`, optional
         If commission is known it can be added.
-    order_id : `str`, optional
+    order_id : `int` or `str`, optional
         The order ID of the order, if known.
     """
 
+    __slots__ = (
+        'created_dt', 'cur_dt', 'asset', 'quantity',
+        'commission', 'direction', 'order_id'
+    )
+
     def __init__(
         self,
         dt,
@@ -93,19 +107,20 @@ class Order(object):
 
     def _set_or_generate_order_id(self, order_id=None):
         """
-        Sets or generates a unique order ID for the order, using a UUID.
+        Sets or generates a unique order ID for the order, using
+        the next value of a monotonically increasing counter.
 
         Parameters
         ----------
-        order_id : `str`, optional
+        order_id : `int` or `str`, optional
             An optional order ID override.
 
         Returns
         -------
-        `str`
-            The order ID string for the Order.
+        `int` or `str`
+            The order ID for the Order.
         """
         if order_id is None:
-            return uuid.uuid4().hex
+            return next(_order_id_counter)
         else:
             return order_id
@@ -133,8 +133,14 @@ class LongShortLeveragedOrderSizer(OrderSizer):
         # Scale weights to take into account gross exposure and leverage
         normalised_weights = self._normalise_weights(weights)
 
+        # Obtain the latest ask prices for all assets in one query
+        sorted_weights = sorted(normalised_weights.items())
+        asset_prices = self.data_handler.get_assets_latest_ask_prices(
+            dt, [asset for asset, weight in sorted_weights]
+        )
+
         target_portfolio = {}
-        for asset, weight in sorted(normalised_weights.items()):
+        for (asset, weight), asset_price in zip(sorted_weights, asset_prices):
             pre_cost_dollar_weight = total_equity * weight
 
             # Estimate broker fees for this asset
@@ -145,9 +151,6 @@ class LongShortLeveragedOrderSizer(OrderSizer):
 
             # Calculate integral target asset quantity assuming broker costs
             after_cost_dollar_weight = pre_cost_dollar_weight - est_costs
-            asset_price = self.data_handler.get_asset_latest_ask_price(
-                dt, asset
-            )
 
             if np.isnan(asset_price):
                 raise ValueError(
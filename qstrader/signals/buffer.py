@@ -1,5 +1,7 @@
 from collections import deque
 
+from qstrader.asset.registry import AssetRegistry
+
 
 class AssetPriceBuffers(object):
     """
@@ -7,23 +9,37 @@ class AssetPriceBuffers(object):
     based price buffers for usage in lookback-based
     indicator calculations.
 
+    The buffers of each asset are held within a list indexed by
+    the integer ID of the asset within an `AssetRegistry`, with
+    one buffer per lookback period.
+
     Parameters
     ----------
     assets : `list[str]`
         The list of assets to create price buffers for.
     lookbacks : `list[int]`, optional
         The number of lookback periods to store prices for.
+    registry : `AssetRegistry`, optional
+        The registry of asset IDs. Defaults to a registry private to
+        the buffers, such that the buffers are only sized by their
+        own assets.
     """
 
-    def __init__(self, assets, lookbacks=[12]):
+    def __init__(self, assets, lookbacks=[12], registry=None):
         self.assets = assets
         self.lookbacks = lookbacks
-        self.prices = self._create_all_assets_prices_buffer_dict()
+        self.lookback_index = {
+            lookback: idx for idx, lookback in enumerate(self.lookbacks)
+        }
+        self.registry = registry if registry is not None else AssetRegistry()
+        self.buffers = []
+        for asset in self.assets:
+            self._create_single_asset_prices_buffers(asset)
 
     @staticmethod
     def _asset_lookback_key(asset, lookback):
         """
-        Create the buffer dictionary lookup key based
+        Create the legacy buffer dictionary lookup key based
         on asset name and lookback period.
 
         Parameters
@@ -40,10 +56,35 @@ class AssetPriceBuffers(object):
         """
         return '%s_%s' % (asset, lookback)
 
-    def _create_single_asset_prices_buffer_dict(self, asset):
+    def _create_single_asset_prices_buffers(self, asset):
+        """
+        Creates the price buffers of each lookback period
+        for a single asset.
+
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol name.
+
+        Returns
+        -------
+        `list[deque[float]]`
+            The price buffers, in the order of the lookbacks.
+        """
+        asset_id = self.registry.get_id(asset)
+        if asset_id >= len(self.buffers):
+            self.buffers.extend([None] * (asset_id + 1 - len(self.buffers)))
+        asset_buffers = [
+            deque(maxlen=lookback) for lookback in self.lookbacks
+        ]
+        self.buffers[asset_id] = asset_buffers
+        return asset_buffers
+
+    @property
+    def prices(self):
         """
-        Creates a dictionary of asset-lookback pair
-        price buffers for a single asset.
+        The price buffers of all assets, keyed by the legacy
+        asset-lookback string keys, e.g. 'EQ:SPY_12'.
 
         Returns
         -------
@@ -52,25 +93,36 @@ class AssetPriceBuffers(object):
         """
         return {
             AssetPriceBuffers._asset_lookback_key(
-                asset, lookback
-            ): deque(maxlen=lookback)
-            for lookback in self.lookbacks
+                self.registry.get_symbol(asset_id), lookback
+            ): asset_buffers[idx]
+            for asset_id, asset_buffers in enumerate(self.buffers)
+            if asset_buffers is not None
+            for idx, lookback in enumerate(self.lookbacks)
         }
 
-    def _create_all_assets_prices_buffer_dict(self):
+    def get_prices(self, asset, lookback):
         """
-        Creates a dictionary of asset-lookback pair
-        price buffers for all assets.
+        Obtain the price buffer of an asset for a lookback period.
+
+        Parameters
+        ----------
+        asset : `str`
+            The asset symbol name.
+        lookback : `int`
+            The lookback period.
 
         Returns
         -------
-        `dict{str: deque[float]}`
-            The price buffer dictionary.
+        `deque[float]`
+            The price buffer.
         """
-        prices = {}
-        for asset in self.assets:
-            prices.update(self._create_single_asset_prices_buffer_dict(asset))
-        return prices
+        asset_id = self.registry.get(asset)
+        asset_buffers = None
+        if asset_id is not None and asset_id < len(self.buffers):
+            asset_buffers = self.buffers[asset_id]
+        if asset_buffers is None:
+            raise KeyError(self._asset_lookback_key(asset, lookback))
+        return asset_buffers[self.lookback_index[lookback]]
 
     def add_asset(self, asset):
         """
@@ -89,7 +141,7 @@ class AssetPriceBuffers(object):
                 'exists in this price buffer.' % asset
             )
         else:
-            self.prices.update(self._create_single_asset_prices_buffer_dict(asset))
+            self._create_single_asset_prices_buffers(asset)
 
     def append(self, asset, price):
         """
@@ -112,13 +164,12 @@ class AssetPriceBuffers(object):
         # The asset may have been added to the universe subsequent
         # to the beginning of the backtest and as such needs a
         # newly created pricing buffer
-        asset_lookback_key = AssetPriceBuffers._asset_lookback_key(asset, self.lookbacks[0])
-        if asset_lookback_key not in self.prices:
-            self.prices.update(self._create_single_asset_prices_buffer_dict(asset))
-
-        for lookback in self.lookbacks:
-            self.prices[
-                AssetPriceBuffers._asset_lookback_key(
-                    asset, lookback
-                )
-            ].append(price)
+        asset_id = self.registry.get_id(asset)
+        asset_buffers = None
+        if asset_id < len(self.buffers):
+            asset_buffers = self.buffers[asset_id]
+        if asset_buffers is None:
+            asset_buffers = self._create_single_asset_prices_buffers(asset)
+
+        for asset_buffer in asset_buffers:
+            asset_buffer.append(price)
@@ -28,26 +28,6 @@ class MomentumSignal(Signal):
         bumped_lookbacks = [lookback + 1 for lookback in lookbacks]
         super().__init__(start_dt, universe, bumped_lookbacks)
 
-    @staticmethod
-    def _asset_lookback_key(asset, lookback):
-        """
-        Create the buffer dictionary lookup key based
-        on asset name and lookback period.
-
-        Parameters
-        ----------
-        asset : `str`
-            The asset symbol name.
-        lookback : `int`
-            The lookback period.
-
-        Returns
-        -------
-        `str`
-            The lookup key.
-        """
-        return '%s_%s' % (asset, lookback + 1)
-
     def _cumulative_return(self, asset, lookback):
         """
         Calculate the cumulative returns for the provided
@@ -67,7 +47,7 @@ class MomentumSignal(Signal):
             The cumulative return ('momentum') for the period.
         """
         series = pd.Series(
-            self.buffers.prices[MomentumSignal._asset_lookback_key(asset, lookback)]
+            self.buffers.get_prices(asset, lookback + 1)
         )
         returns = series.pct_change().dropna().to_numpy()
 
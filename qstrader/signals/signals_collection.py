@@ -61,8 +61,8 @@ class SignalsCollection(object):
 
         # Update all of the signals with new prices
         for name, signal in self.signals.items():
-            assets = signal.assets
-            for asset in assets:
-                price = self.data_handler.get_asset_latest_mid_price(dt, asset)
+            assets = list(signal.assets)
+            prices = self.data_handler.get_assets_latest_mid_prices(dt, assets)
+            for asset, price in zip(assets, prices):
                 self.signals[name].append(asset, price)
         self.warmup += 1
@@ -27,26 +27,6 @@ class VolatilitySignal(Signal):
         bumped_lookbacks = [lookback + 1 for lookback in lookbacks]
         super().__init__(start_dt, universe, bumped_lookbacks)
 
-    @staticmethod
-    def _asset_lookback_key(asset, lookback):
-        """
-        Create the buffer dictionary lookup key based
-        on asset name and lookback period.
-
-        Parameters
-        ----------
-        asset : `str`
-            The asset symbol name.
-        lookback : `int`
-            The lookback period.
-
-        Returns
-        -------
-        `str`
-            The lookup key.
-        """
-        return '%s_%s' % (asset, lookback + 1)
-
     def _annualised_vol(self, asset, lookback):
         """
         Calculate the annualised volatility for the provided
@@ -66,11 +46,7 @@ class VolatilitySignal(Signal):
             The annualised volatility of returns.
         """
         series = pd.Series(
-            self.buffers.prices[
-                VolatilitySignal._asset_lookback_key(
-                    asset, lookback
-                )
-            ]
+            self.buffers.get_prices(asset, lookback + 1)
         )
         returns = series.pct_change().dropna().to_numpy()
 
@@ -1,11 +1,10 @@
-import datetime
-
+import numpy as np
 import pandas as pd
-from pandas.tseries.offsets import BDay
-import pytz
 
+from qstrader.exchange.exchange_calendar import ExchangeCalendar
 from qstrader.simulation.sim_engine import SimulationEngine
 from qstrader.simulation.event import SimulationEvent
+from qstrader.simulation.timeline import EventTimeline
 
 
 class DailyBusinessDaySimulationEngine(SimulationEngine):
@@ -14,9 +13,12 @@ class DailyBusinessDaySimulationEngine(SimulationEngine):
     frequency defaulting to typical business days, that is
     Monday-Friday.
 
-    In particular it does not take into account any specific
-    regional holidays, such as Federal Holidays in the USA or
-    Bank Holidays in the UK.
+    By default it does not take into account any specific regional
+    holidays, such as Federal Holidays in the USA or Bank Holidays in
+    the UK. If an exchange calendar is provided the events are instead
+    generated from its precomputed session table, such that exchange
+    holidays are skipped and the market close event of early close
+    sessions occurs at the early close time.
 
     It produces a pre-market event, a market open event,
     a market closing event and a post-market event for every day
@@ -32,9 +34,28 @@ class DailyBusinessDaySimulationEngine(SimulationEngine):
         Whether to include a pre-market event
     post_market : `Boolean`, optional
         Whether to include a post-market event
+    market_open : `str`, optional
+        The (UTC) time of the market open event, in 'HH:MM:SS' format.
+        Defaults to '14:30:00'.
+    market_close : `str`, optional
+        The (UTC) time of the market close event, in 'HH:MM:SS' format.
+        Defaults to '21:00:00'.
+    precompute : `Boolean`, optional
+        Whether to precompute the full schedule of events once as an
+        `EventTimeline`, which is iterated in place of generating each
+        event individually. Defaults to False.
+    calendar : `ExchangeCalendar`, optional
+        The exchange calendar determining the sessions, and their
+        market open and close times, in which case the market open and
+        close times parameters are ignored. Defaults to a calendar of
+        every business day with the provided market open and close times.
     """
 
-    def __init__(self, starting_day, ending_day, pre_market=True, post_market=True):
+    def __init__(
+        self, starting_day, ending_day, pre_market=True, post_market=True,
+        market_open='14:30:00', market_close='21:00:00', precompute=False,
+        calendar=None
+    ):
         if ending_day < starting_day:
             raise ValueError(
                 "Ending date time %s is earlier than starting date time %s. "
@@ -46,22 +67,107 @@ class DailyBusinessDaySimulationEngine(SimulationEngine):
         self.ending_day = ending_day
         self.pre_market = pre_market
         self.post_market = post_market
+        if calendar is None:
+            if not (
+                pd.Timedelta(0) <= pd.Timedelta(market_open) <
+                pd.Timedelta(market_close) < pd.Timedelta(days=1)
+            ):
+                raise ValueError(
+                    "Market open time %s must precede the market close time "
+                    "%s within the same day. Cannot create simulation engine "
+                    "instance." % (market_open, market_close)
+                )
+            calendar = ExchangeCalendar(
+                market_open=market_open, market_close=market_close
+            )
+        self.calendar = calendar
+        self.market_open = self.calendar.market_open
+        self.market_close = self.calendar.market_close
+        self.sessions = self.calendar.sessions(starting_day, ending_day)
         self.business_days = self._generate_business_days()
+        self.precompute = precompute
+        self.timeline = None
+        if self.precompute:
+            self.timeline = self._generate_timeline()
 
     def _generate_business_days(self):
         """
-        Generate the list of business days using midnight UTC as
-        the timestamp.
+        Generate the list of business days, i.e. the exchange
+        calendar sessions, using midnight UTC as the timestamp.
 
         Returns
         -------
-        `list[pd.Timestamp]`
+        `pd.DatetimeIndex`
             The business day range list.
         """
-        days = pd.date_range(
-            self.starting_day, self.ending_day, freq=BDay()
+        return self.sessions.index.tz_localize('UTC')
+
+    def _generate_session_offsets(self, offsets, event_types):
+        """
+        Generate the offsets from midnight of the events of every
+        business day, replacing the regular market open and close
+        offsets with those of each session of the exchange calendar.
+
+        Parameters
+        ----------
+        offsets : `list[pd.Timedelta]`
+            The regular offsets from midnight of the events of each day.
+        event_types : `list[str]`
+            The event type of each offset.
+
+        Returns
+        -------
+        `np.ndarray`
+            The (business days x events) int64 nanosecond offsets.
+        """
+        midnights = self.sessions.index.asi8
+        day_offsets = np.tile(
+            pd.TimedeltaIndex(offsets).asi8, (len(midnights), 1)
+        )
+        day_offsets[:, event_types.index('market_open')] = (
+            self.sessions['market_open'].array.asi8 - midnights
+        )
+        day_offsets[:, event_types.index('market_close')] = (
+            self.sessions['market_close'].array.asi8 - midnights
+        )
+        return day_offsets
+
+    def _generate_event_offsets(self):
+        """
+        Generate the offsets from midnight, and event types, of the
+        events of each business day.
+
+        Returns
+        -------
+        `tuple(list[pd.Timedelta], list[str])`
+            The event offsets and event types, in time order.
+        """
+        offsets = [self.market_open, self.market_close]
+        event_types = ['market_open', 'market_close']
+        if self.pre_market:
+            offsets.insert(0, pd.Timedelta(0))
+            event_types.insert(0, 'pre_market')
+        if self.post_market:
+            offsets.append(pd.Timedelta(hours=23, minutes=59))
+            event_types.append('post_market')
+        return offsets, event_types
+
+    def _generate_timeline(self):
+        """
+        Precompute the full schedule of events, as vectorised
+        offsets from each of the business day sessions.
+
+        Returns
+        -------
+        `EventTimeline`
+            The timeline of all simulation events.
+        """
+        offsets, event_types = self._generate_event_offsets()
+        return EventTimeline.from_days(
+            self.business_days,
+            self._generate_session_offsets(offsets, event_types),
+            event_types
         )
-        return days
 
     def __iter__(self):
         """
@@ -73,35 +179,23 @@ class DailyBusinessDaySimulationEngine(SimulationEngine):
         `SimulationEvent`
             Market time simulation event to yield
         """
-        for index, bday in enumerate(self.business_days):
-            year = bday.year
-            month = bday.month
-            day = bday.day
-
+        if self.timeline is not None:
+            yield from self.timeline
+            return
+
+        for bday, market_open, market_close in zip(
+            self.business_days, self.sessions['market_open'],
+            self.sessions['market_close']
+        ):
             if self.pre_market:
-                yield SimulationEvent(
-                    pd.Timestamp(
-                        datetime.datetime(year, month, day), tz='UTC'
-                    ), event_type="pre_market"
-                )
+                yield SimulationEvent(bday, event_type="pre_market")
 
-            yield SimulationEvent(
-                pd.Timestamp(
-                    datetime.datetime(year, month, day, 14, 30),
-                    tz=pytz.utc
-                ), event_type="market_open"
-            )
+            yield SimulationEvent(market_open, event_type="market_open")
 
-            yield SimulationEvent(
-                pd.Timestamp(
-                    datetime.datetime(year, month, day, 21, 00),
-                    tz=pytz.utc
-                ), event_type="market_close"
-            )
+            yield SimulationEvent(market_close, event_type="market_close")
 
             if self.post_market:
                 yield SimulationEvent(
-                    pd.Timestamp(
-                        datetime.datetime(year, month, day, 23, 59), tz='UTC'
-                    ), event_type="post_market"
+                    bday + pd.Timedelta(hours=23, minutes=59),
+                    event_type="post_market"
                 )
@@ -16,6 +16,8 @@ class SimulationEvent(object):
         The event type string.
     """
 
+    __slots__ = ('ts', 'event_type')
+
     def __init__(self, ts: pd.Timestamp, event_type: str):
         self.ts: pd.Timestamp = ts
         self.event_type: str = event_type
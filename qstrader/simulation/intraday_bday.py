@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+
+from qstrader.simulation.daily_bday import DailyBusinessDaySimulationEngine
+from qstrader.simulation.event import SimulationEvent
+
+
+class IntradayBusinessDaySimulationEngine(DailyBusinessDaySimulationEngine):
+    """
+    A SimulationEngine subclass that generates events at an intraday
+    frequency (e.g. every minute or hour) during the market session of
+    typical business days, that is Monday-Friday.
+
+    As with the daily engine it does not take into account any specific
+    regional holidays, unless an exchange calendar is provided, in which
+    case no bar events are generated at or after the early close time
+    of early close sessions.
+
+    It produces a pre-market event, a market open event, a 'market_bar'
+    event at every bar interval after the open and prior to the close, a
+    market closing event and a post-market event for every day between
+    the starting and ending dates. Bar events are timestamped at the
+    end of each bar interval.
+
+    Parameters
+    ----------
+    starting_day : `pd.Timestamp`
+        The starting day of the simulation.
+    ending_day : `pd.Timestamp`
+        The ending day of the simulation.
+    freq : `str`, optional
+        The bar interval as a Pandas frequency string, e.g. '1min',
+        '5min' or '1H'. Defaults to '1min'.
+    pre_market : `Boolean`, optional
+        Whether to include a pre-market event
+    post_market : `Boolean`, optional
+        Whether to include a post-market event
+    market_open : `str`, optional
+        The (UTC) time of the market open event, in 'HH:MM:SS' format.
+        Defaults to '14:30:00'.
+    market_close : `str`, optional
+        The (UTC) time of the market close event, in 'HH:MM:SS' format.
+        Defaults to '21:00:00'.
+    precompute : `Boolean`, optional
+        Whether to precompute the full schedule of events once as an
+        `EventTimeline`, which is iterated in place of generating each
+        event individually. Defaults to False.
+    calendar : `ExchangeCalendar`, optional
+        The exchange calendar determining the sessions, and their
+        market open and close times, in which case the market open and
+        close times parameters are ignored. Defaults to a calendar of
+        every business day with the provided market open and close times.
+    """
+
+    def __init__(
+        self, starting_day, ending_day, freq='1min', pre_market=True,
+        post_market=True, market_open='14:30:00', market_close='21:00:00',
+        precompute=False, calendar=None
+    ):
+        self.freq = freq
+        super().__init__(
+            starting_day, ending_day, pre_market=pre_market,
+            post_market=post_market, market_open=market_open,
+            market_close=market_close, precompute=False, calendar=calendar
+        )
+
+        # The bar offsets depend upon the calendar session times and
+        # are required prior to any precomputation
+        self.bar_offsets = self._generate_bar_offsets()
+        self.precompute = precompute
+        if self.precompute:
+            self.timeline = self._generate_timeline()
+
+    def _generate_bar_offsets(self):
+        """
+        Generate the offsets from midnight of the bar events of each
+        day, strictly between the market open and market close.
+
+        Returns
+        -------
+        `pd.TimedeltaIndex`
+            The bar event offsets.
+        """
+        interval = pd.Timedelta(pd.tseries.frequencies.to_offset(self.freq))
+        if interval <= pd.Timedelta(0):
+            raise ValueError(
+                "Bar frequency %s must be a positive interval. Cannot "
+                "create IntradayBusinessDaySimulationEngine "
+                "instance." % self.freq
+            )
+        offsets = pd.timedelta_range(
+            self.market_open + interval, self.market_close, freq=interval
+        )
+        return offsets[offsets < self.market_close]
+
+    def _generate_event_offsets(self):
+        """
+        Generate the offsets from midnight, and event types, of the
+        events of each business day, including the bar events.
+
+        Returns
+        -------
+        `tuple(list[pd.Timedelta], list[str])`
+            The event offsets and event types, in time order.
+        """
+        offsets, event_types = super()._generate_event_offsets()
+        close_idx = event_types.index('market_close')
+        offsets[close_idx:close_idx] = list(self.bar_offsets)
+        event_types[close_idx:close_idx] = ['market_bar'] * len(
+            self.bar_offsets
+        )
+        return offsets, event_types
+
+    def _generate_timeline(self):
+        """
+        Precompute the full schedule of events, removing any bar
+        events lying outside of their (e.g. early close) session.
+
+        Returns
+        -------
+        `EventTimeline`
+            The timeline of all simulation events.
+        """
+        timeline = super()._generate_timeline()
+        events_per_day = len(timeline) // max(len(self.sessions), 1)
+        opens = np.repeat(
+            self.sessions['market_open'].array.asi8, events_per_day
+        )
+        closes = np.repeat(
+            self.sessions['market_close'].array.asi8, events_per_day
+        )
+        timestamps = timeline.timestamps.view(np.int64)
+        outside_session = timeline.event_type_mask('market_bar') & (
+            (timestamps <= opens) | (timestamps >= closes)
+        )
+        if not outside_session.any():
+            return timeline
+        return timeline[~outside_session]
+
+    def __iter__(self):
+        """
+        Generate the intraday timestamps and event information for
+        pre-market, market open, market bars, market close and
+        post-market.
+
+        Yields
+        ------
+        `SimulationEvent`
+            Market time simulation event to yield
+        """
+        if self.timeline is not None:
+            yield from self.timeline
+            return
+
+        for bday, market_open, market_close in zip(
+            self.business_days, self.sessions['market_open'],
+            self.sessions['market_close']
+        ):
+            if self.pre_market:
+                yield SimulationEvent(bday, event_type="pre_market")
+
+            yield SimulationEvent(market_open, event_type="market_open")
+
+            for bar_dt in bday + self.bar_offsets:
+                if market_open < bar_dt < market_close:
+                    yield SimulationEvent(bar_dt, event_type="market_bar")
+
+            yield SimulationEvent(market_close, event_type="market_close")
+
+            if self.post_market:
+                yield SimulationEvent(
+                    bday + pd.Timedelta(hours=23, minutes=59),
+                    event_type="post_market"
+                )
@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+
+from qstrader.simulation.event import SimulationEvent
+
+
+class EventTimeline(object):
+    """
+    An immutable, precomputed schedule of simulation events, held as
+    a sorted NumPy `datetime64[ns]` (UTC) array of event timestamps
+    along with an integer array of event type codes.
+
+    The timeline is computed once, via vectorised offsets from each
+    day, rather than constructing timestamps event by event, and can
+    be iterated, indexed and sliced without recomputation. The
+    timestamp and event type code arrays are read-only, such that
+    the timeline can be safely shared between many simulation engines
+    or backtest sessions without any consumer modifying the schedule.
+    Slices of the timeline are likewise read-only.
+
+    Only the compact arrays are held in memory. The SimulationEvent
+    instances are created on demand when iterating or indexing, as
+    holding an event object per event of a long intraday timeline
+    would require far more memory than the arrays themselves.
+
+    Parameters
+    ----------
+    timestamps : `np.ndarray`
+        The sorted `datetime64[ns]` (UTC) timestamps of the events.
+    codes : `np.ndarray`
+        The integer event type code of each event, indexing into
+        the event types.
+    event_types : `list[str]`
+        The event type strings, e.g. 'market_open'.
+    """
+
+    def __init__(self, timestamps, codes, event_types):
+        self.timestamps = self._as_read_only(timestamps, 'datetime64[ns]')
+        self.codes = self._as_read_only(codes, np.int8)
+        self.event_types = tuple(event_types)
+        if len(self.timestamps) != len(self.codes):
+            raise ValueError(
+                "Number of event timestamps (%s) does not match the number "
+                "of event type codes (%s). Cannot create EventTimeline "
+                "instance." % (len(self.timestamps), len(self.codes))
+            )
+        self.index = pd.DatetimeIndex(self.timestamps).tz_localize('UTC')
+
+    @staticmethod
+    def _as_read_only(values, dtype):
+        """
+        Convert values into a read-only array of the provided dtype,
+        copying any writeable array such that the caller retains no
+        writeable reference to the timeline.
+
+        Parameters
+        ----------
+        values : `np.ndarray` or `list`
+            The values.
+        dtype : `np.dtype`
+            The dtype of the array.
+
+        Returns
+        -------
+        `np.ndarray`
+            The read-only array.
+        """
+        array = np.asarray(values, dtype=dtype)
+        if array.flags.writeable:
+            array = array.copy()
+            array.flags.writeable = False
+        return array
+
+    @classmethod
+    def from_days(cls, days, offsets, event_types):
+        """
+        Create the timeline of events occurring at offsets from
+        midnight (UTC) on each of the provided days.
+
+        Parameters
+        ----------
+        days : `pd.DatetimeIndex`
+            The days of the events, in ascending order.
+        offsets : `list[pd.Timedelta]` or `np.ndarray`
+            The offsets from midnight of the events of each day, in
+            ascending order, or a (days x events) array of the int64
+            nanosecond offsets of the events of every day.
+        event_types : `list[str]`
+            The event type of each offset.
+
+        Returns
+        -------
+        `EventTimeline`
+            The timeline of events.
+        """
+        days = pd.DatetimeIndex(days)
+        if days.tz is not None:
+            days = days.tz_convert('UTC').tz_localize(None)
+        midnights = days.normalize().asi8
+
+        if isinstance(offsets, np.ndarray) and offsets.ndim == 2:
+            offsets = offsets.astype(np.int64)
+        else:
+            offsets = pd.TimedeltaIndex(offsets).asi8[np.newaxis, :]
+        unique_types = list(dict.fromkeys(event_types))
+        type_codes = np.array(
+            [unique_types.index(event_type) for event_type in event_types],
+            dtype=np.int8
+        )
+
+        timestamps = (midnights[:, np.newaxis] + offsets).ravel()
+        codes = np.tile(type_codes, len(midnights))
+        return cls(timestamps.view('datetime64[ns]'), codes, unique_types)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __iter__(self):
+        """
+        Iterate over the events of the timeline.
+
+        Yields
+        ------
+        `SimulationEvent`
+            The simulation event.
+        """
+        event_types = self.event_types
+        for ts, code in zip(self.index, self.codes.tolist()):
+            yield SimulationEvent(ts, event_types[code])
+
+    def __getitem__(self, key):
+        """
+        Obtain a single event, or a slice of the timeline.
+
+        Parameters
+        ----------
+        key : `int`, `slice` or `np.ndarray`
+            The position of the event, or the slice of events, or a
+            boolean mask of the events to select.
+
+        Returns
+        -------
+        `SimulationEvent` or `EventTimeline`
+            The event at the position, or the sliced timeline.
+        """
+        if isinstance(key, (slice, np.ndarray)):
+            return EventTimeline(
+                self.timestamps[key], self.codes[key], self.event_types
+            )
+        return SimulationEvent(
+            self.index[key], self.event_types[self.codes[key]]
+        )
+
+    def event_type_mask(self, event_type):
+        """
+        Obtain a boolean mask of the events of the provided type.
+
+        Parameters
+        ----------
+        event_type : `str`
+            The event type, e.g. 'market_close'.
+
+        Returns
+        -------
+        `np.ndarray`
+            Whether each event is of the provided type.
+        """
+        if event_type not in self.event_types:
+            return np.zeros(len(self), dtype=bool)
+        return self.codes == self.event_types.index(event_type)
+
+    def locate(self, dt):
+        """
+        Obtain the position of the first event at or after the
+        provided timestamp.
+
+        Parameters
+        ----------
+        dt : `pd.Timestamp`
+            The timestamp to locate.
+
+        Returns
+        -------
+        `int`
+            The position of the event, equal to the length of the
+            timeline if all events occur before the timestamp.
+        """
+        return int(
+            np.searchsorted(self.index.asi8, pd.Timestamp(dt).value, side='left')
+        )
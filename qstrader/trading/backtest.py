@@ -1,14 +1,23 @@
+from collections import OrderedDict
 import os
 
+import numpy as np
 import pandas as pd
 
 from qstrader.asset.equity import Equity
+from qstrader.asset.registry import AssetRegistry
 from qstrader.broker.simulated_broker import SimulatedBroker
 from qstrader.broker.fee_model.zero_fee_model import ZeroFeeModel
 from qstrader.data.backtest_data_handler import BacktestDataHandler
 from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+from qstrader.exchange.exchange_calendar import (
+    NS_PER_DAY, get_exchange_calendar
+)
 from qstrader.exchange.simulated_exchange import SimulatedExchange
 from qstrader.simulation.daily_bday import DailyBusinessDaySimulationEngine
+from qstrader.simulation.intraday_bday import (
+    IntradayBusinessDaySimulationEngine
+)
 from qstrader.system.qts import QuantTradingSystem
 from qstrader.system.rebalance.buy_and_hold import BuyAndHoldRebalance
 from qstrader.system.rebalance.daily import DailyRebalance
@@ -62,6 +71,39 @@ class BacktestTradingSession(TradingSession):
     burn_in_dt : `pd.Timestamp`, optional
         The optional date provided to begin tracking strategy statistics,
         which is used for strategies requiring a period of data 'burn in'
+    data_handler : `DataHandler`, optional
+        The data handler providing the asset prices, defaulting to a
+        BacktestDataHandler of daily bar CSV data. If the data handler
+        provides an `advance` method it is called at every event to
+        advance its data cursors to the event time, and if it provides
+        an `update_snapshot` method it is called at every event to
+        resolve the prices of the Universe once, otherwise prices are
+        queried from the data handler directly.
+    frequency : `str`, optional
+        The frequency of the simulation events, either 'daily' (the
+        default) or an intraday Pandas frequency string such as '1min'
+        or '1H', which additionally generates 'market_bar' events
+        at that interval during each market session.
+    sparse : `Boolean`, optional
+        Whether to only process the simulation events at which the
+        state of the backtest can change, i.e. rebalances, the
+        subsequent execution of their orders and (if signals are
+        utilised) the signal updates within the signal lookbacks of
+        each rebalance. The equity curve at all other market closes is
+        valued in bulk from the unchanged holdings. Produces
+        the same equity curve as processing every event. Defaults to
+        False.
+    calendar : `str` or `ExchangeCalendar`, optional
+        The exchange calendar, or the name of a built-in calendar such
+        as 'NYSE', determining the trading sessions (including holidays
+        and early closes) of the simulation, the exchange, the rebalance
+        schedule and any default data source. Defaults to every business
+        day.
+    array_positions : `Boolean`, optional
+        Whether the simulated broker holds the positions of each
+        portfolio within an array-backed ArrayPositionBook, which
+        values and marks all positions to market in single vectorised
+        operations. Defaults to False.
     """
 
     def __init__(
@@ -81,6 +123,10 @@ class BacktestTradingSession(TradingSession):
         fee_model=ZeroFeeModel(),
         burn_in_dt=None,
         data_handler=None,
+        frequency='daily',
+        sparse=False,
+        calendar=None,
+        array_positions=False,
         **kwargs
     ):
         self.start_dt = start_dt
@@ -97,6 +143,16 @@ class BacktestTradingSession(TradingSession):
         self.long_only = long_only
         self.fee_model = fee_model
         self.burn_in_dt = burn_in_dt
+        self.frequency = frequency
+        self.sparse = sparse
+        if isinstance(calendar, str):
+            calendar = get_exchange_calendar(calendar)
+        self.calendar = calendar
+        self.array_positions = array_positions
+
+        # The asset IDs of this backtest alone, such that the registry
+        # and the arrays sized by it do not grow across backtests
+        self.registry = AssetRegistry()
 
         self.exchange = self._create_exchange()
         self.data_handler = self._create_data_handler(data_handler)
@@ -146,7 +202,7 @@ class BacktestTradingSession(TradingSession):
         `SimulatedExchanage`
             The simulated exchange instance.
         """
-        return SimulatedExchange(self.start_dt)
+        return SimulatedExchange(self.start_dt, calendar=self.calendar)
 
     def _create_data_handler(self, data_handler):
         """
@@ -185,7 +241,9 @@ class BacktestTradingSession(TradingSession):
             csv_dir = os.environ.get('QSTRADER_CSV_DATA_DIR')
 
         # TODO: Only equities are supported by QSTrader for now.
-        data_source = CSVDailyBarDataSource(csv_dir, Equity)
+        data_source = CSVDailyBarDataSource(
+            csv_dir, Equity, calendar=self.calendar, registry=self.registry
+        )
 
         data_handler = BacktestDataHandler(
             self.universe, data_sources=[data_source]
@@ -208,7 +266,9 @@ class BacktestTradingSession(TradingSession):
             self.data_handler,
             account_id=self.account_name,
             initial_funds=self.initial_cash,
-            fee_model=self.fee_model
+            fee_model=self.fee_model,
+            array_positions=self.array_positions,
+            registry=self.registry
         )
         broker.create_portfolio(self.portfolio_id, self.portfolio_name)
         broker.subscribe_funds_to_portfolio(self.portfolio_id, self.initial_cash)
@@ -219,15 +279,20 @@ class BacktestTradingSession(TradingSession):
         Create a simulation engine instance to generate the events
         used for the quant trading algorithm to act upon.
 
-        TODO: Currently hardcoded to daily events
-
         Returns
         -------
         `SimulationEngine`
             The simulation engine generating simulation timestamps.
         """
-        return DailyBusinessDaySimulationEngine(
-            self.start_dt, self.end_dt, pre_market=False, post_market=False
+        if self.frequency == 'daily':
+            return DailyBusinessDaySimulationEngine(
+                self.start_dt, self.end_dt, pre_market=False,
+                post_market=False, precompute=True, calendar=self.calendar
+            )
+        return IntradayBusinessDaySimulationEngine(
+            self.start_dt, self.end_dt, freq=self.frequency,
+            pre_market=False, post_market=False, precompute=True,
+            calendar=self.calendar
         )
 
     def _create_rebalance_event_times(self):
@@ -235,6 +300,9 @@ class BacktestTradingSession(TradingSession):
         Creates the list of rebalance timestamps used to determine when
         to execute the quant trading strategy throughout the backtest.
 
+        If an exchange calendar is utilised the rebalance timestamps
+        are aligned onto its sessions, see `_align_rebalances_to_sessions`.
+
         Returns
         -------
         `List[pd.Timestamp]`
@@ -256,7 +324,62 @@ class BacktestTradingSession(TradingSession):
             raise ValueError(
                 'Unknown rebalance frequency "%s" provided.' % self.rebalance
             )
-        return rebalancer.rebalances
+        return self._align_rebalances_to_sessions(rebalancer.rebalances)
+
+    def _align_rebalances_to_sessions(self, rebalances):
+        """
+        Align the rebalance timestamps onto the sessions of the exchange
+        calendar, if utilised, such that no rebalance is silently dropped
+        by falling on an exchange holiday or after an early close.
+
+        Each rebalance is moved onto the session on, or else preceding,
+        its date (or the first session of the backtest, if no session of
+        the backtest precedes it). Rebalances at or after the regular
+        market close occur at the market close of the session, including
+        early closes, while those at or before the regular market open
+        occur at its market open. Rebalances moved onto the same session
+        occur once.
+
+        Parameters
+        ----------
+        rebalances : `List[pd.Timestamp]`
+            The rebalance timestamps on regular market hours.
+
+        Returns
+        -------
+        `List[pd.Timestamp]`
+            The sorted rebalance timestamps within the sessions.
+        """
+        if self.calendar is None or len(rebalances) == 0:
+            return rebalances
+        sessions = self.calendar.sessions(
+            min(self.start_dt, rebalances[0]), max(self.end_dt, rebalances[-1])
+        )
+        sessions = sessions[
+            sessions['market_close'] > pd.Timestamp(self.start_dt)
+        ]
+        if len(sessions) == 0:
+            return []
+
+        rebalance_ns = pd.DatetimeIndex(rebalances).asi8
+        date_ns = rebalance_ns - rebalance_ns % NS_PER_DAY
+        time_ns = rebalance_ns - date_ns
+        idx = np.maximum(
+            sessions.index.searchsorted(
+                pd.DatetimeIndex(date_ns), side='right'
+            ) - 1, 0
+        )
+        session_ns = sessions.index.asi8[idx]
+        open_ns = pd.DatetimeIndex(sessions['market_open']).asi8[idx]
+        close_ns = pd.DatetimeIndex(sessions['market_close']).asi8[idx]
+        aligned_ns = np.where(
+            time_ns >= self.calendar.market_close.value, close_ns,
+            np.where(
+                time_ns <= self.calendar.market_open.value, open_ns,
+                np.minimum(session_ns + time_ns, close_ns)
+            )
+        )
+        return list(pd.to_datetime(np.unique(aligned_ns), utc=True))
 
     def _create_quant_trading_system(self, **kwargs):
         """
@@ -365,47 +488,44 @@ class BacktestTradingSession(TradingSession):
             alloc_df = alloc_df[self.burn_in_dt:]
         return alloc_df
 
-    def run(self, results=False):
+    def _process_event(self, event, stats):
         """
-        Execute the simulation engine by iterating over all
-        simulation events, rebalancing the quant trading
-        system at the appropriate schedule.
+        Process a single simulation event, updating the broker and
+        signals, rebalancing the quant trading system if scheduled
+        and recording the equity curve at market closes.
 
         Parameters
         ----------
-        results : `Boolean`, optional
-            Whether to output the current portfolio holdings
+        event : `SimulationEvent`
+            The simulation event to process.
+        stats : `dict`
+            The statistics of the backtest.
         """
+        # Output the system event and timestamp
+        dt = event.ts
         if settings.PRINT_EVENTS:
-            print("Beginning backtest simulation...")
-
-        stats = {'target_allocations': []}
-
-        for event in self.sim_engine:
-            # Output the system event and timestamp
-            dt = event.ts
-            if settings.PRINT_EVENTS:
-                print("(%s) - %s" % (event.ts, event.event_type))
+            print("(%s) - %s" % (event.ts, event.event_type))
+
+        # Resolve the prices of the Universe once per event,
+        # shared by the broker, signals and trading system
+        if hasattr(self.data_handler, 'advance'):
+            self.data_handler.advance(dt)
+        if hasattr(self.data_handler, 'update_snapshot'):
+            self.data_handler.update_snapshot(
+                dt, self.universe.get_assets(dt)
+            )
 
-            # Update the simulated broker
-            self.broker.update(dt)
+        # Update the simulated broker
+        self.broker.update(dt)
 
-            # Update any signals on a daily basis
-            if self.signals is not None and event.event_type == "market_close":
-                self.signals.update(dt)
+        # Update any signals on a daily basis
+        if self.signals is not None and event.event_type == "market_close":
+            self.signals.update(dt)
 
-            # If we have hit a rebalance time then carry
-            # out a full run of the quant trading system
-            if self.burn_in_dt is not None:
-                if dt >= self.burn_in_dt:
-                    if self._is_rebalance_event(dt):
-                        if settings.PRINT_EVENTS:
-                            print(
-                                "(%s) - trading logic "
-                                "and rebalance" % event.ts
-                            )
-                        self.qts(dt, stats=stats)
-            else:
+        # If we have hit a rebalance time then carry
+        # out a full run of the quant trading system
+        if self.burn_in_dt is not None:
+            if dt >= self.burn_in_dt:
                 if self._is_rebalance_event(dt):
                     if settings.PRINT_EVENTS:
                         print(
@@ -413,16 +533,226 @@ class BacktestTradingSession(TradingSession):
                             "and rebalance" % event.ts
                         )
                     self.qts(dt, stats=stats)
-
-            # Out of market hours we want a daily
-            # performance update, but only if we
-            # are past the 'burn in' period
-            if event.event_type == "market_close":
-                if self.burn_in_dt is not None:
-                    if dt >= self.burn_in_dt:
-                        self._update_equity_curve(dt)
-                else:
+        else:
+            if self._is_rebalance_event(dt):
+                if settings.PRINT_EVENTS:
+                    print(
+                        "(%s) - trading logic "
+                        "and rebalance" % event.ts
+                    )
+                self.qts(dt, stats=stats)
+
+        # Out of market hours we want a daily
+        # performance update, but only if we
+        # are past the 'burn in' period
+        if event.event_type == "market_close":
+            if self.burn_in_dt is not None:
+                if dt >= self.burn_in_dt:
                     self._update_equity_curve(dt)
+            else:
+                self._update_equity_curve(dt)
+
+    def _signal_lookback(self):
+        """
+        Obtain the largest lookback period of any signal, i.e. the
+        number of market closes preceding a rebalance whose prices
+        can be utilised by the signals.
+
+        Returns
+        -------
+        `int` or None
+            The largest lookback period, or None if the lookback of
+            any signal is unknown.
+        """
+        lookbacks = []
+        for signal in self.signals.signals.values():
+            signal_lookbacks = getattr(signal, 'lookbacks', None)
+            if not signal_lookbacks:
+                return None
+            lookbacks.extend(signal_lookbacks)
+        return max(lookbacks) if len(lookbacks) > 0 else 0
+
+    def _create_sparse_schedule(self):
+        """
+        Determine the positions, within the precomputed event timeline,
+        of the events that must be processed individually, along with
+        those of the remaining market closes at which the equity curve
+        is valued in bulk.
+
+        Events are processed at each rebalance, at the first subsequent
+        event at which the exchange is open (such that the rebalance
+        orders are executed) and, if signals are utilised, at those
+        market closes whose prices remain within the signal lookbacks
+        at a rebalance. The final event is always processed.
+
+        Returns
+        -------
+        `tuple(np.ndarray, np.ndarray)`
+            The sorted positions of the processed events and of the
+            equity curve valuation events that are not processed.
+        """
+        timeline = self.sim_engine.timeline
+        event_ns = timeline.index.asi8
+        closes = timeline.event_type_mask('market_close')
+
+        rebalance_ns = np.array(
+            [pd.Timestamp(dt).value for dt in self.rebalance_schedule],
+            dtype=np.int64
+        )
+        active = np.isin(event_ns, rebalance_ns)
+        rebalance_rows = np.flatnonzero(active)
+
+        # The orders of each rebalance are executed at the first
+        # subsequent event at which the exchange is open
+        open_rows = np.flatnonzero(
+            self.exchange.is_open_at_datetimes(timeline.timestamps)
+        )
+        exec_idx = np.searchsorted(open_rows, rebalance_rows, side='right')
+        active[open_rows[exec_idx[exec_idx < len(open_rows)]]] = True
+
+        if self.signals is not None:
+            lookback = self._signal_lookback()
+            if lookback is None:
+                active |= closes
+            else:
+                # Only the final 'lookback' closes up to and including
+                # each rebalance remain within the signal buffers
+                close_rows = np.flatnonzero(closes)
+                ends = np.searchsorted(close_rows, rebalance_rows, side='right')
+                starts = np.maximum(ends - lookback, 0)
+                counts = np.zeros(len(close_rows) + 1, dtype=np.int64)
+                np.add.at(counts, starts, 1)
+                np.add.at(counts, ends, -1)
+                active[close_rows[np.cumsum(counts[:-1]) > 0]] = True
+        if len(timeline) > 0:
+            active[-1] = True
+
+        samples = closes & ~active
+        if self.burn_in_dt is not None:
+            samples &= event_ns >= pd.Timestamp(self.burn_in_dt).value
+        return np.flatnonzero(active), np.flatnonzero(samples)
+
+    def _get_mid_prices_matrix(self, dts, assets):
+        """
+        Obtain the latest mid prices of the provided assets at each of
+        the provided times, in bulk if supported by the data handler,
+        otherwise via the same per-time query utilised by the broker.
+
+        Parameters
+        ----------
+        dts : `pd.DatetimeIndex`
+            The times at which to obtain the prices.
+        assets : `list[str]`
+            The asset symbols to obtain the prices for.
+
+        Returns
+        -------
+        `np.ndarray`
+            The mid prices of each asset (column) at each time (row).
+        """
+        if hasattr(self.data_handler, 'get_assets_latest_mid_prices_matrix'):
+            return self.data_handler.get_assets_latest_mid_prices_matrix(
+                dts, assets
+            )
+        mid_prices = np.empty((len(dts), len(assets)))
+        for row, dt in enumerate(dts):
+            mid_prices[row] = self.data_handler.get_assets_latest_mid_prices(
+                dt, assets
+            )
+        return mid_prices
+
+    def _bulk_update_equity_curve(self, dts):
+        """
+        Update the equity curve values at each of the provided times,
+        valuing the current holdings of every portfolio in bulk, which
+        are assumed to be unchanged across these times.
+
+        The holdings are valued in the same order of operations as the
+        account total equity, such that the equity curve is identical
+        to that obtained by processing each of these times.
+
+        Parameters
+        ----------
+        dts : `pd.DatetimeIndex`
+            The times at which the total account equity is obtained.
+        """
+        if len(dts) == 0:
+            return
+        portfolio_assets = [
+            portfolio.pos_handler.assets()
+            for portfolio in self.broker.portfolios.values()
+        ]
+        assets = list(OrderedDict.fromkeys(
+            asset for pf_assets in portfolio_assets for asset in pf_assets
+        ))
+        mid_prices = np.empty((len(dts), 0))
+        if len(assets) > 0:
+            mid_prices = self._get_mid_prices_matrix(dts, assets)
+        columns = {asset: idx for idx, asset in enumerate(assets)}
+
+        equities = np.zeros(len(dts))
+        for portfolio, pf_assets in zip(
+            self.broker.portfolios.values(), portfolio_assets
+        ):
+            market_values = portfolio.pos_handler.total_market_values(
+                pf_assets, mid_prices[:, [columns[asset] for asset in pf_assets]]
+            )
+            equities = equities + (market_values + portfolio.cash)
+        self.equity_curve.extend(zip(dts, equities.tolist()))
+
+    def _run_sparse(self, stats):
+        """
+        Execute the simulation engine by only processing the events
+        at which the state of the backtest can change, valuing the
+        equity curve in bulk between them.
+
+        Parameters
+        ----------
+        stats : `dict`
+            The statistics of the backtest.
+        """
+        timeline = self.sim_engine.timeline
+        active_rows, sample_rows = self._create_sparse_schedule()
+
+        # The number of market closes preceding each event, such that
+        # the signals warmup counts the skipped closes
+        closes = timeline.event_type_mask('market_close')
+        prior_closes = np.cumsum(closes) - closes
+
+        sample_pos = 0
+        for row in active_rows:
+            # The holdings are unchanged since the prior processed event
+            sample_end = int(np.searchsorted(sample_rows, row))
+            self._bulk_update_equity_curve(
+                timeline.index[sample_rows[sample_pos:sample_end]]
+            )
+            sample_pos = sample_end
+            if self.signals is not None:
+                self.signals.warmup = int(prior_closes[row])
+            self._process_event(timeline[int(row)], stats)
+        self._bulk_update_equity_curve(timeline.index[sample_rows[sample_pos:]])
+
+    def run(self, results=False):
+        """
+        Execute the simulation engine by iterating over all
+        simulation events, rebalancing the quant trading
+        system at the appropriate schedule.
+
+        Parameters
+        ----------
+        results : `Boolean`, optional
+            Whether to output the current portfolio holdings
+        """
+        if settings.PRINT_EVENTS:
+            print("Beginning backtest simulation...")
+
+        stats = {'target_allocations': []}
+
+        if self.sparse:
+            self._run_sparse(stats)
+        else:
+            for event in self.sim_engine:
+                self._process_event(event, stats)
 
         self.target_allocations = stats['target_allocations']
 
@@ -29,5 +29,9 @@ setup(
         "numpy>=1.18.4",
         "pandas>=1.3.3",
         "seaborn>=0.10.1"
-    ]
+    ],
+    extras_require={
+        "hdf5": ["tables"],
+        "parquet": ["pyarrow"]
+    }
 )
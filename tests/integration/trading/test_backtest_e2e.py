@@ -1,11 +1,21 @@
 import os
+import shutil
 
 import pandas as pd
+from pandas.tseries.holiday import USMartinLutherKingJr
 import pytz
 import pytest
 
 from qstrader.alpha_model.fixed_signals import FixedSignalsAlphaModel
+from qstrader.asset.equity import Equity
+from qstrader.asset.registry import asset_registry
+from qstrader.asset.universe.dynamic import DynamicUniverse
 from qstrader.asset.universe.static import StaticUniverse
+from qstrader.data.backtest_data_handler import BacktestDataHandler
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+from qstrader.exchange.exchange_calendar import ExchangeCalendar
+from qstrader.signals.momentum import MomentumSignal
+from qstrader.signals.signals_collection import SignalsCollection
 from qstrader.trading.backtest import BacktestTradingSession
 
 
@@ -130,3 +140,438 @@ def test_backtest_long_short_leveraged(etf_filepath):
 
     pd.testing.assert_frame_equal(history_df, expected_df)
     assert portfolio_dict == expected_dict
+
+
+@pytest.mark.parametrize(
+    'rebalance,kwargs',
+    [
+        ('weekly', {'rebalance_weekday': 'WED', 'long_only': True}),
+        ('end_of_month', {'long_only': False, 'gross_leverage': 2.0}),
+        ('buy_and_hold', {'long_only': True}),
+    ]
+)
+def test_backtest_sparse_matches_dense(etf_filepath, rebalance, kwargs):
+    """
+    Ensures that a sparse backtest, which only processes rebalance
+    and order execution events, produces the same equity curve and
+    holdings as processing every simulation event.
+    """
+    os.environ['QSTRADER_CSV_DATA_DIR'] = etf_filepath
+
+    assets = ['EQ:ABC', 'EQ:DEF']
+    universe = StaticUniverse(assets)
+    alpha_model = FixedSignalsAlphaModel({'EQ:ABC': 0.6, 'EQ:DEF': 0.4})
+
+    start_dt = pd.Timestamp('2019-01-01 14:30:00', tz=pytz.UTC)
+    end_dt = pd.Timestamp('2019-01-31 23:59:00', tz=pytz.UTC)
+
+    backtests = []
+    for sparse in [False, True]:
+        backtest = BacktestTradingSession(
+            start_dt,
+            end_dt,
+            universe,
+            alpha_model,
+            portfolio_id='000001',
+            rebalance=rebalance,
+            cash_buffer_percentage=0.05,
+            sparse=sparse,
+            **kwargs
+        )
+        backtest.run(results=False)
+        backtests.append(backtest)
+
+    dense_backtest, sparse_backtest = backtests
+    pd.testing.assert_frame_equal(
+        sparse_backtest.get_equity_curve(), dense_backtest.get_equity_curve()
+    )
+    assert sparse_backtest.broker.portfolios['000001'].portfolio_to_dict() == \
+        dense_backtest.broker.portfolios['000001'].portfolio_to_dict()
+
+
+class _TopMomentumAlphaModel(object):
+    """
+    Allocates fully to the asset with the highest momentum, once
+    the signals have been updated over the momentum lookback.
+    """
+
+    def __init__(self, signals, universe, lookback):
+        self.signals = signals
+        self.universe = universe
+        self.lookback = lookback
+
+    def __call__(self, dt):
+        assets = self.universe.get_assets(dt)
+        weights = {asset: 0.0 for asset in assets}
+        if self.signals.warmup >= self.lookback:
+            top_asset = max(
+                assets,
+                key=lambda asset: self.signals['momentum'](asset, self.lookback)
+            )
+            weights[top_asset] = 1.0
+        return weights
+
+
+def test_backtest_sparse_signals_match_dense(etf_filepath):
+    """
+    Ensures that a sparse backtest utilising signals only processes
+    the market closes within the signal lookback of each rebalance,
+    while producing the same equity curve and holdings as processing
+    every simulation event.
+    """
+    assets = ['EQ:ABC', 'EQ:DEF']
+    universe = StaticUniverse(assets)
+    lookback = 2
+
+    start_dt = pd.Timestamp('2019-01-01 14:30:00', tz=pytz.UTC)
+    end_dt = pd.Timestamp('2019-01-31 23:59:00', tz=pytz.UTC)
+
+    backtests = []
+    for sparse in [False, True]:
+        data_handler = BacktestDataHandler(
+            universe,
+            data_sources=[CSVDailyBarDataSource(etf_filepath, Equity)]
+        )
+        momentum = MomentumSignal(start_dt, universe, lookbacks=[lookback])
+        signals = SignalsCollection({'momentum': momentum}, data_handler)
+        backtest = BacktestTradingSession(
+            start_dt,
+            end_dt,
+            universe,
+            _TopMomentumAlphaModel(signals, universe, lookback),
+            signals=signals,
+            portfolio_id='000001',
+            rebalance='weekly',
+            rebalance_weekday='WED',
+            long_only=True,
+            cash_buffer_percentage=0.05,
+            data_handler=data_handler,
+            sparse=sparse
+        )
+        backtest.run(results=False)
+        backtests.append(backtest)
+
+    dense_backtest, sparse_backtest = backtests
+    pd.testing.assert_frame_equal(
+        sparse_backtest.get_equity_curve(), dense_backtest.get_equity_curve(),
+        check_exact=True
+    )
+    assert sparse_backtest.broker.portfolios['000001'].portfolio_to_dict() == \
+        dense_backtest.broker.portfolios['000001'].portfolio_to_dict()
+    assert sparse_backtest.signals.warmup == dense_backtest.signals.warmup
+    assert len(sparse_backtest.target_allocations) == \
+        len(dense_backtest.target_allocations)
+
+    # Only the momentum lookback (plus one) closes preceding each
+    # rebalance, along with the final event, update the signals
+    timeline = sparse_backtest.sim_engine.timeline
+    closes = timeline.event_type_mask('market_close')
+    active_rows, sample_rows = sparse_backtest._create_sparse_schedule()
+    active_closes = active_rows[closes[active_rows]]
+    assert len(active_closes) < closes.sum()
+    assert len(active_closes) + len(sample_rows) == closes.sum()
+
+
+def test_backtest_exchange_calendar(etf_filepath):
+    """
+    Ensures that a backtest utilising the NYSE exchange calendar
+    does not simulate the exchange holidays.
+    """
+    os.environ['QSTRADER_CSV_DATA_DIR'] = etf_filepath
+
+    assets = ['EQ:ABC', 'EQ:DEF']
+    universe = StaticUniverse(assets)
+    alpha_model = FixedSignalsAlphaModel({'EQ:ABC': 0.6, 'EQ:DEF': 0.4})
+
+    start_dt = pd.Timestamp('2019-01-01 14:30:00', tz=pytz.UTC)
+    end_dt = pd.Timestamp('2019-01-31 23:59:00', tz=pytz.UTC)
+
+    backtest = BacktestTradingSession(
+        start_dt,
+        end_dt,
+        universe,
+        alpha_model,
+        portfolio_id='000001',
+        rebalance='weekly',
+        rebalance_weekday='WED',
+        long_only=True,
+        cash_buffer_percentage=0.05,
+        calendar='NYSE'
+    )
+    backtest.run(results=False)
+
+    equity_dates = pd.DatetimeIndex(
+        backtest.get_equity_curve().index
+    ).strftime('%Y-%m-%d')
+    assert len(equity_dates) == 21
+    assert '2019-01-01' not in equity_dates
+    assert '2019-01-21' not in equity_dates
+
+
+@pytest.mark.parametrize(
+    'rebalance,kwargs,calendar_kwargs,expected_dt',
+    [
+        (
+            'end_of_month', {}, {'adhoc_holidays': ['2019-01-31']},
+            '2019-01-30 21:00:00'
+        ),
+        (
+            'weekly', {'rebalance_weekday': 'WED'},
+            {'early_close': '18:00:00', 'adhoc_early_closes': ['2019-01-09']},
+            '2019-01-09 18:00:00'
+        )
+    ]
+)
+def test_backtest_calendar_rebalances(
+    etf_filepath, rebalance, kwargs, calendar_kwargs, expected_dt
+):
+    """
+    Ensures that rebalances falling on an exchange holiday occur at
+    the close of the previous session, and those falling on an early
+    close session occur at the early close, rather than being dropped.
+    """
+    os.environ['QSTRADER_CSV_DATA_DIR'] = etf_filepath
+
+    assets = ['EQ:ABC', 'EQ:DEF']
+    universe = StaticUniverse(assets)
+    alpha_model = FixedSignalsAlphaModel({'EQ:ABC': 0.6, 'EQ:DEF': 0.4})
+
+    start_dt = pd.Timestamp('2019-01-01 14:30:00', tz=pytz.UTC)
+    end_dt = pd.Timestamp('2019-01-31 23:59:00', tz=pytz.UTC)
+    calendar = ExchangeCalendar(
+        name='TEST', holiday_rules=[USMartinLutherKingJr], **calendar_kwargs
+    )
+
+    backtest = BacktestTradingSession(
+        start_dt,
+        end_dt,
+        universe,
+        alpha_model,
+        portfolio_id='000001',
+        rebalance=rebalance,
+        long_only=True,
+        cash_buffer_percentage=0.05,
+        calendar=calendar,
+        **kwargs
+    )
+    backtest.run(results=False)
+
+    expected_dt = pd.Timestamp(expected_dt, tz=pytz.UTC)
+    assert expected_dt in backtest.rebalance_schedule
+    rebalance_dts = [
+        allocation['Date'] for allocation in backtest.target_allocations
+    ]
+    assert expected_dt in rebalance_dts
+
+
+class _MinimalDataHandler(object):
+    """
+    A user-supplied data handler providing only the price queries,
+    without the optional per-event hooks of the BacktestDataHandler.
+    """
+
+    hooks = ('advance', 'update_snapshot')
+
+    def __init__(self, data_handler):
+        self.data_handler = data_handler
+
+    def __getattr__(self, name):
+        if name in self.hooks:
+            raise AttributeError(name)
+        return getattr(self.data_handler, name)
+
+
+def test_backtest_minimal_data_handler(etf_filepath):
+    """
+    Ensures that a backtest with a user-supplied data handler lacking
+    the optional per-event hooks produces the same equity curve as
+    one utilising the default data handler.
+    """
+    os.environ['QSTRADER_CSV_DATA_DIR'] = etf_filepath
+
+    assets = ['EQ:ABC', 'EQ:DEF']
+    universe = StaticUniverse(assets)
+    alpha_model = FixedSignalsAlphaModel({'EQ:ABC': 0.6, 'EQ:DEF': 0.4})
+
+    start_dt = pd.Timestamp('2019-01-01 14:30:00', tz=pytz.UTC)
+    end_dt = pd.Timestamp('2019-01-31 23:59:00', tz=pytz.UTC)
+
+    backtests = []
+    for minimal in [False, True]:
+        data_handler = BacktestDataHandler(
+            universe,
+            data_sources=[CSVDailyBarDataSource(etf_filepath, Equity)]
+        )
+        if minimal:
+            data_handler = _MinimalDataHandler(data_handler)
+        backtest = BacktestTradingSession(
+            start_dt,
+            end_dt,
+            universe,
+            alpha_model,
+            portfolio_id='000001',
+            rebalance='weekly',
+            rebalance_weekday='WED',
+            long_only=True,
+            cash_buffer_percentage=0.05,
+            data_handler=data_handler
+        )
+        backtest.run(results=False)
+        backtests.append(backtest)
+
+    pd.testing.assert_frame_equal(
+        backtests[1].get_equity_curve(), backtests[0].get_equity_curve()
+    )
+
+
+def test_backtest_array_positions(etf_filepath):
+    """
+    Ensures that holding positions within the array-backed position
+    book produces the same equity curve and holdings as holding
+    individual Position instances.
+    """
+    os.environ['QSTRADER_CSV_DATA_DIR'] = etf_filepath
+
+    assets = ['EQ:ABC', 'EQ:DEF']
+    universe = StaticUniverse(assets)
+    alpha_model = FixedSignalsAlphaModel({'EQ:ABC': 0.6, 'EQ:DEF': -0.7})
+
+    start_dt = pd.Timestamp('2019-01-01 14:30:00', tz=pytz.UTC)
+    end_dt = pd.Timestamp('2019-01-31 23:59:00', tz=pytz.UTC)
+
+    backtests = []
+    for array_positions in [False, True]:
+        backtest = BacktestTradingSession(
+            start_dt,
+            end_dt,
+            universe,
+            alpha_model,
+            portfolio_id='000001',
+            rebalance='weekly',
+            rebalance_weekday='WED',
+            long_only=False,
+            gross_leverage=2.0,
+            array_positions=array_positions
+        )
+        backtest.run(results=False)
+        backtests.append(backtest)
+
+    handler_backtest, book_backtest = backtests
+    pd.testing.assert_frame_equal(
+        book_backtest.get_equity_curve(), handler_backtest.get_equity_curve()
+    )
+    book_dict = book_backtest.broker.portfolios['000001'].portfolio_to_dict()
+    handler_dict = handler_backtest.broker.portfolios['000001'].portfolio_to_dict()
+    assert book_dict.keys() == handler_dict.keys()
+    for asset in handler_dict:
+        assert book_dict[asset] == pytest.approx(handler_dict[asset])
+
+
+class _PerTimePricesDataHandler(_MinimalDataHandler):
+    """
+    A user-supplied data handler without support for querying the
+    prices of multiple times at once.
+    """
+
+    hooks = ('get_assets_latest_mid_prices_matrix',)
+
+
+@pytest.mark.parametrize('array_positions', [False, True])
+@pytest.mark.parametrize('bulk_prices', [True, False])
+def test_backtest_sparse_unpriced_asset(
+    etf_filepath, tmp_path, array_positions, bulk_prices
+):
+    """
+    Ensures that a sparse backtest, including one whose data handler
+    cannot query multiple times at once, produces an identical equity
+    curve to processing every event when an asset of the universe has
+    no price at the earlier valuation times.
+    """
+    csv_dir = str(tmp_path)
+    shutil.copy(os.path.join(etf_filepath, 'ABC.csv'), csv_dir)
+    def_df = pd.read_csv(os.path.join(etf_filepath, 'DEF.csv'))
+    def_df[def_df['Date'] >= '2019-01-15'].to_csv(
+        os.path.join(csv_dir, 'DEF.csv'), index=False
+    )
+
+    start_dt = pd.Timestamp('2019-01-01 14:30:00', tz=pytz.UTC)
+    end_dt = pd.Timestamp('2019-01-31 23:59:00', tz=pytz.UTC)
+    universe = DynamicUniverse({
+        'EQ:ABC': start_dt,
+        'EQ:DEF': pd.Timestamp('2019-01-15 00:00:00', tz=pytz.UTC)
+    })
+
+    def alpha_model(dt):
+        return {asset: 0.5 for asset in universe.get_assets(dt)}
+
+    backtests = []
+    for sparse in [False, True]:
+        data_handler = BacktestDataHandler(
+            universe, data_sources=[CSVDailyBarDataSource(csv_dir, Equity)]
+        )
+        if not bulk_prices:
+            data_handler = _PerTimePricesDataHandler(data_handler)
+        backtest = BacktestTradingSession(
+            start_dt,
+            end_dt,
+            universe,
+            alpha_model,
+            portfolio_id='000001',
+            rebalance='weekly',
+            rebalance_weekday='WED',
+            long_only=True,
+            cash_buffer_percentage=0.05,
+            data_handler=data_handler,
+            sparse=sparse,
+            array_positions=array_positions
+        )
+        backtest.run(results=False)
+        backtests.append(backtest)
+
+    dense_backtest, sparse_backtest = backtests
+    pd.testing.assert_frame_equal(
+        sparse_backtest.get_equity_curve(), dense_backtest.get_equity_curve(),
+        check_exact=True
+    )
+    assert len(dense_backtest.get_equity_curve()) == 23
+
+
+def test_backtest_owns_asset_registry(etf_filepath):
+    """
+    Ensures that each backtest registers its assets within its own
+    registry, rather than the shared registry, such that repeated
+    backtests within a process do not grow the registry.
+    """
+    os.environ['QSTRADER_CSV_DATA_DIR'] = etf_filepath
+
+    assets = ['EQ:ABC', 'EQ:DEF']
+    universe = StaticUniverse(assets)
+    alpha_model = FixedSignalsAlphaModel({'EQ:ABC': 0.6, 'EQ:DEF': 0.4})
+
+    start_dt = pd.Timestamp('2019-01-01 14:30:00', tz=pytz.UTC)
+    end_dt = pd.Timestamp('2019-01-31 23:59:00', tz=pytz.UTC)
+
+    shared_symbols = list(asset_registry.symbols)
+    registries = []
+    for _ in range(2):
+        backtest = BacktestTradingSession(
+            start_dt,
+            end_dt,
+            universe,
+            alpha_model,
+            portfolio_id='000001',
+            rebalance='weekly',
+            rebalance_weekday='WED',
+            long_only=True,
+            cash_buffer_percentage=0.05,
+            array_positions=True
+        )
+        backtest.run(results=False)
+        portfolio = backtest.broker.portfolios['000001']
+        assert portfolio.pos_handler.registry is backtest.registry
+        assert len(portfolio.pos_handler.current_price) == 2
+        registries.append(backtest.registry)
+
+    assert registries[0] is not registries[1]
+    assert registries[0].symbols == registries[1].symbols == assets
+    assert asset_registry.symbols == shared_symbols
@@ -0,0 +1,40 @@
+import sys
+
+import numpy as np
+
+from qstrader.asset.registry import AssetRegistry
+
+
+def test_asset_registry_ids():
+    """
+    Checks that symbols are assigned dense integer IDs in
+    order of first registration and map back onto symbols.
+    """
+    registry = AssetRegistry()
+    assert registry.get_id('EQ:SPY') == 0
+    assert registry.get_id('EQ:AGG') == 1
+    assert registry.get_id('EQ:SPY') == 0
+    assert len(registry) == 2
+    assert 'EQ:AGG' in registry
+    assert 'EQ:GLD' not in registry
+
+    ids = registry.get_ids(['EQ:GLD', 'EQ:SPY', 'EQ:AGG'])
+    assert ids.dtype == np.int64
+    assert list(ids) == [2, 0, 1]
+    assert registry.get_symbol(2) == 'EQ:GLD'
+
+    # Lookups of unregistered symbols do not register them
+    assert registry.get('EQ:AGG') == 1
+    assert registry.get('EQ:TLT') is None
+    assert len(registry) == 3
+
+
+def test_asset_registry_interns_symbols():
+    """
+    Checks that registered symbols are interned, such that
+    equal symbols share a single string object.
+    """
+    registry = AssetRegistry()
+    symbol = ''.join(['EQ:', 'SPY'])
+    registry.get_id(symbol)
+    assert registry.get_symbol(0) is sys.intern(''.join(['EQ:', 'SPY']))
@@ -53,3 +53,17 @@ def test_dynamic_universe(asset_dates, dt, expected):
     """
     universe = DynamicUniverse(asset_dates)
     assert set(universe.get_assets(dt)) == set(expected)
+
+
+def test_dynamic_universe_all_assets():
+    """
+    Checks that the DynamicUniverse returns all of its assets,
+    including those without an entry date.
+    """
+    universe = DynamicUniverse(
+        {
+            'EQ:SPY': pd.Timestamp('1993-01-01 14:30:00', tz=pytz.utc),
+            'EQ:AGG': None
+        }
+    )
+    assert set(universe.get_all_assets()) == {'EQ:SPY', 'EQ:AGG'}
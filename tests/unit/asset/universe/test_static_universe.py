@@ -27,3 +27,11 @@ def test_static_universe(assets, dt, expected):
     """
     universe = StaticUniverse(assets)
     assert universe.get_assets(dt) == expected
+
+
+def test_static_universe_all_assets():
+    """
+    Checks that the StaticUniverse returns all of its assets.
+    """
+    universe = StaticUniverse(['EQ:SPY', 'EQ:AGG'])
+    assert universe.get_all_assets() == ['EQ:SPY', 'EQ:AGG']
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.asset.registry import AssetRegistry
+from qstrader.broker.portfolio.position_book import ArrayPositionBook
+from qstrader.broker.portfolio.position_handler import PositionHandler
+from qstrader.broker.transaction.transaction import Transaction
+
+
+def test_position_book_matches_position_handler():
+    """
+    Checks that a random sequence of transactions and price updates
+    produces the same positions, market values and P&Ls within the
+    ArrayPositionBook as within the PositionHandler.
+    """
+    rng = np.random.default_rng(42)
+    assets = ['EQ:%s' % idx for idx in range(12)]
+    ph = PositionHandler()
+    book = ArrayPositionBook(registry=AssetRegistry())
+
+    start_dt = pd.Timestamp('2020-01-02 14:30:00', tz=pytz.UTC)
+    for step in range(300):
+        dt = start_dt + pd.Timedelta(hours=step)
+        asset = assets[rng.integers(len(assets))]
+        quantity = int(rng.integers(-100, 101))
+        if step % 25 == 0 and asset in ph.positions:
+            # Fully close the position
+            quantity = -int(ph.positions[asset].net_quantity)
+        transaction = Transaction(
+            asset, quantity, dt, float(rng.uniform(50.0, 150.0)), step,
+            commission=float(rng.uniform(0.0, 5.0))
+        )
+        ph.transact_position(transaction)
+        book.transact_position(transaction)
+
+        prices = rng.uniform(50.0, 150.0, len(assets))
+        ph.update_current_prices(assets, prices, dt)
+        book.update_current_prices(assets, prices, dt)
+
+        assert book.assets() == ph.assets()
+        for asset in assets + ['EQ:XYZ']:
+            assert book.has_position(asset) == ph.has_position(asset)
+        assert book.net_quantities() == pytest.approx(ph.net_quantities())
+        for total in [
+            'total_market_value', 'total_unrealised_pnl',
+            'total_realised_pnl', 'total_pnl'
+        ]:
+            assert getattr(book, total)() == pytest.approx(
+                getattr(ph, total)(), rel=1e-9, abs=1e-6
+            )
+
+    for asset, pos in book.positions.items():
+        expected_pos = ph.positions[asset]
+        assert pos.current_dt == expected_pos.current_dt
+        assert pos.avg_price == pytest.approx(expected_pos.avg_price)
+        assert pos.realised_pnl == pytest.approx(expected_pos.realised_pnl)
+
+
+def test_position_book_invalid_updates():
+    """
+    Checks that non-positive prices and earlier update times are
+    rejected, and that assets without positions are ignored.
+    """
+    book = ArrayPositionBook(registry=AssetRegistry())
+    dt = pd.Timestamp('2020-01-02 14:30:00', tz=pytz.UTC)
+    book.transact_position(Transaction('EQ:ABC', 100, dt, 50.0, 1))
+
+    book.update_current_prices(['EQ:DEF', 'EQ:ABC'], [10.0, 55.0], dt)
+    assert book.assets() == ['EQ:ABC']
+    assert book.total_market_value() == 5500.0
+
+    with pytest.raises(ValueError):
+        book.update_current_price('EQ:ABC', 0.0, dt)
+    with pytest.raises(ValueError):
+        book.update_current_price(
+            'EQ:ABC', 60.0, dt - pd.Timedelta(minutes=1)
+        )
+
+    book.transact_position(Transaction('EQ:ABC', -100, dt, 60.0, 2))
+    assert book.assets() == []
+    assert book.total_market_value() == 0.0
+    assert book.total_pnl() == 0.0
+
+
+@pytest.mark.parametrize('book_cls', [PositionHandler, ArrayPositionBook])
+def test_total_market_values(book_cls):
+    """
+    Checks that the bulk total market values of each row of prices
+    are identical to marking the positions to each row in turn,
+    without updating the positions themselves.
+    """
+    book = book_cls() if book_cls is PositionHandler else book_cls(
+        registry=AssetRegistry()
+    )
+    dt = pd.Timestamp('2020-01-02 14:30:00', tz=pytz.UTC)
+    book.transact_position(Transaction('EQ:ABC', 100, dt, 50.0, 1))
+    book.transact_position(Transaction('EQ:DEF', -30, dt, 20.0, 2))
+    book.transact_position(Transaction('EQ:GHI', 7, dt, 3.0, 3))
+
+    assets = ['EQ:XYZ', 'EQ:DEF', 'EQ:ABC']
+    prices = np.array([
+        [1.0, 21.3, 50.7],
+        [1.0, np.nan, 49.1],
+        [1.0, 19.9, 51.3]
+    ])
+    market_values = book.total_market_values(assets, prices)
+    assert book.total_market_value() == 100 * 50.0 - 30 * 20.0 + 7 * 3.0
+
+    expected = []
+    for row in prices:
+        book.update_current_prices(assets, row, dt)
+        expected.append(book.total_market_value())
+    np.testing.assert_array_equal(market_values, expected)
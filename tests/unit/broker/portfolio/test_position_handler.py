@@ -103,6 +103,7 @@ def test_transact_position_quantity_zero():
         order_id=123, commission=26.83
     )
     ph.transact_position(transaction_long)
+    assert ph.has_position(asset)
 
     transaction_close = Transaction(
         asset,
@@ -117,6 +118,7 @@ def test_transact_position_quantity_zero():
     # Go long and then close, then check that the
     # positions OrderedDict is empty
     assert ph.positions == OrderedDict()
+    assert not ph.has_position(asset)
 
 
 def test_total_values_for_no_transactions():
@@ -39,6 +39,9 @@ class DataHandlerMock(object):
     def get_asset_latest_mid_price(self, dt, asset):
         return np.NaN
 
+    def get_assets_latest_mid_prices(self, dt, assets):
+        return np.full(len(assets), np.NaN)
+
 
 class DataHandlerMockPrice(object):
     def get_asset_latest_bid_ask_price(self, dt, asset):
@@ -47,6 +50,9 @@ class DataHandlerMockPrice(object):
     def get_asset_latest_mid_price(self, dt, asset):
         return (53.47 - 53.45) / 2.0
 
+    def get_assets_latest_mid_prices(self, dt, assets):
+        return np.full(len(assets), (53.47 - 53.45) / 2.0)
+
 
 class OrderMock(object):
     def __init__(self, asset, quantity, order_id=None):
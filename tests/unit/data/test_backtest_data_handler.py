@@ -0,0 +1,159 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from qstrader.asset.equity import Equity
+from qstrader.asset.universe.static import StaticUniverse
+from qstrader.data.backtest_data_handler import BacktestDataHandler
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+
+
+class DataSourceMock(object):
+    def __init__(self, prices):
+        self.prices = prices
+
+    def get_bid(self, dt, asset):
+        return self.prices[asset]
+
+    def get_ask(self, dt, asset):
+        return self.prices[asset]
+
+
+class BatchDataSourceMock(DataSourceMock):
+    def get_bids(self, dt, assets):
+        return np.array([self.prices.get(asset, np.NaN) for asset in assets])
+
+    def get_asks(self, dt, assets):
+        return np.array([self.prices.get(asset, np.NaN) for asset in assets])
+
+
+def test_get_assets_latest_prices():
+    """
+    Checks that multi-asset price queries fall back to subsequent
+    data sources for missing prices and to single asset queries
+    for data sources without multi-asset support.
+    """
+    dt = pd.Timestamp('2019-01-02 14:30:00', tz=pytz.UTC)
+    primary = BatchDataSourceMock({'EQ:ABC': 100.0, 'EQ:DEF': np.NaN})
+    backfill = DataSourceMock({'EQ:DEF': 50.0})
+    data_handler = BacktestDataHandler(None, data_sources=[primary, backfill])
+
+    assets = ['EQ:DEF', 'EQ:ABC', 'EQ:XYZ']
+    np.testing.assert_equal(
+        data_handler.get_assets_latest_ask_prices(dt, assets),
+        [50.0, 100.0, np.NaN]
+    )
+    np.testing.assert_equal(
+        data_handler.get_assets_latest_mid_prices(dt, assets),
+        [50.0, 100.0, np.NaN]
+    )
+
+
+class RoutedDataSourceMock(BatchDataSourceMock):
+    def __init__(self, prices):
+        super().__init__(prices)
+        self.queried_assets = []
+
+    def has_asset(self, asset):
+        return asset in self.prices
+
+    def get_bid(self, dt, asset):
+        self.queried_assets.append(asset)
+        return self.prices[asset]
+
+    def get_bids(self, dt, assets):
+        self.queried_assets.extend(assets)
+        return super().get_bids(dt, assets)
+
+
+def test_asset_routes():
+    """
+    Checks that prices are only queried from the data sources that
+    provide the asset, while still backfilling missing prices.
+    """
+    dt = pd.Timestamp('2019-01-02 14:30:00', tz=pytz.UTC)
+    primary = RoutedDataSourceMock({'EQ:ABC': 100.0, 'EQ:DEF': np.NaN})
+    backfill = RoutedDataSourceMock({'EQ:DEF': 50.0, 'EQ:GHI': 25.0})
+    data_handler = BacktestDataHandler(
+        StaticUniverse(['EQ:ABC', 'EQ:DEF']), data_sources=[primary, backfill]
+    )
+    assert data_handler.asset_routes == {
+        'EQ:ABC': (primary,), 'EQ:DEF': (primary, backfill)
+    }
+
+    assert data_handler.get_asset_latest_bid_price(dt, 'EQ:GHI') == 25.0
+    assert data_handler.get_asset_latest_bid_price(dt, 'EQ:DEF') == 50.0
+    np.testing.assert_equal(
+        data_handler.get_assets_latest_bid_prices(
+            dt, ['EQ:ABC', 'EQ:DEF', 'EQ:GHI']
+        ),
+        [100.0, 50.0, 25.0]
+    )
+    assert 'EQ:GHI' not in primary.queried_assets
+    assert 'EQ:ABC' not in backfill.queried_assets
+
+    data_handler.refresh_routes()
+    assert data_handler.asset_routes == {}
+
+
+def test_merged_price_store():
+    """
+    Checks that merging the data sources into a single price store
+    provides the same prices as querying the data sources in turn.
+    """
+    csv_dir = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        '..', '..', 'integration', 'trading', 'fixtures'
+    )
+    primary = CSVDailyBarDataSource(csv_dir, Equity, csv_symbols=['ABC'])
+    backfill = CSVDailyBarDataSource(csv_dir, Equity)
+    assets = ['EQ:ABC', 'EQ:DEF', 'EQ:XYZ']
+    universe = StaticUniverse(assets)
+    data_handler = BacktestDataHandler(universe, [primary, backfill])
+    merged_handler = BacktestDataHandler(
+        universe, [primary, backfill], merged=True
+    )
+    assert merged_handler.price_store.assets == ['EQ:ABC', 'EQ:DEF']
+
+    timestamps = pd.date_range(
+        '2018-12-31', '2019-02-02', freq='90min', tz=pytz.UTC
+    )
+    for dt in timestamps:
+        np.testing.assert_equal(
+            merged_handler.get_assets_latest_ask_prices(dt, assets),
+            data_handler.get_assets_latest_ask_prices(dt, assets)
+        )
+        for asset in assets:
+            np.testing.assert_equal(
+                merged_handler.get_asset_latest_bid_price(dt, asset),
+                data_handler.get_asset_latest_bid_price(dt, asset)
+            )
+
+
+def test_price_snapshot():
+    """
+    Checks that latest prices at the snapshot timestamp are served
+    from the snapshot, with assets outside of it and other
+    timestamps queried from the data sources.
+    """
+    dt = pd.Timestamp('2019-01-02 14:30:00', tz=pytz.UTC)
+    later_dt = pd.Timestamp('2019-01-02 21:00:00', tz=pytz.UTC)
+    ds = RoutedDataSourceMock({'EQ:ABC': 100.0, 'EQ:DEF': 50.0})
+    data_handler = BacktestDataHandler(None, data_sources=[ds])
+
+    snapshot = data_handler.update_snapshot(dt, ['EQ:ABC'])
+    np.testing.assert_equal(snapshot.bids, [100.0])
+    ds.queried_assets = []
+    ds.prices['EQ:ABC'] = 101.0
+
+    assert data_handler.get_asset_latest_bid_price(dt, 'EQ:ABC') == 100.0
+    assert data_handler.get_asset_latest_mid_price(dt, 'EQ:ABC') == 100.0
+    np.testing.assert_equal(
+        data_handler.get_assets_latest_bid_prices(dt, ['EQ:DEF', 'EQ:ABC']),
+        [50.0, 100.0]
+    )
+    assert ds.queried_assets == ['EQ:DEF']
+
+    assert data_handler.get_asset_latest_bid_price(later_dt, 'EQ:ABC') == 101.0
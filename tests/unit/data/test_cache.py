@@ -0,0 +1,146 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from qstrader.asset.equity import Equity
+from qstrader.data.cache import BarDataCache
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+
+FIXTURES_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    '..', '..', 'integration', 'trading', 'fixtures'
+)
+
+
+def _copy_fixtures(csv_dir):
+    for csv_file in ['ABC.csv', 'DEF.csv']:
+        shutil.copy(
+            os.path.join(FIXTURES_DIR, csv_file),
+            os.path.join(csv_dir, csv_file)
+        )
+
+
+def test_cached_frames_match_csv_frames(tmp_path):
+    """
+    Checks that the DataFrames loaded from the cache are identical
+    to those loaded from the CSV files and that the cache is
+    stored alongside the CSV files.
+    """
+    csv_dir = str(tmp_path)
+    _copy_fixtures(csv_dir)
+
+    csv_ds = CSVDailyBarDataSource(csv_dir, Equity)
+    CSVDailyBarDataSource(csv_dir, Equity, cache=True)
+    assert len(os.listdir(os.path.join(csv_dir, '.qstrader_cache'))) == 2
+
+    cached_ds = CSVDailyBarDataSource(csv_dir, Equity, cache=True)
+    for asset in ['EQ:ABC', 'EQ:DEF']:
+        pd.testing.assert_frame_equal(
+            cached_ds.asset_bar_frames[asset], csv_ds.asset_bar_frames[asset]
+        )
+        pd.testing.assert_frame_equal(
+            cached_ds.asset_bid_ask_frames[asset],
+            csv_ds.asset_bid_ask_frames[asset]
+        )
+
+
+def test_cache_invalidation(tmp_path):
+    """
+    Checks that cache entries are not used once the source file
+    is modified or a different price adjustment is requested.
+    """
+    csv_dir = str(tmp_path)
+    _copy_fixtures(csv_dir)
+    csv_path = os.path.join(csv_dir, 'ABC.csv')
+
+    ds = CSVDailyBarDataSource(csv_dir, Equity, cache=True)
+    cache = BarDataCache(os.path.join(csv_dir, '.qstrader_cache'))
+    assert cache.load(csv_path, True) is not None
+    assert cache.load(csv_path, False) is None
+
+    with open(csv_path, 'a') as csv_file:
+        csv_file.write('2019-02-01,130.0,131.0,131.0\n')
+    assert cache.load(csv_path, True) is None
+
+    cache.save(
+        csv_path, True,
+        ds.asset_bar_frames['EQ:ABC'], ds.asset_bid_ask_frames['EQ:ABC']
+    )
+    assert cache.load(csv_path, True) is not None
+
+
+def test_cache_entries_replaced_atomically_and_pruned(tmp_path):
+    """
+    Checks that re-caching a source file never removes the entry
+    visible to readers, and that superseded versions of an entry are
+    pruned once the source file is modified and re-cached.
+    """
+    csv_dir = str(tmp_path)
+    _copy_fixtures(csv_dir)
+    csv_path = os.path.join(csv_dir, 'ABC.csv')
+
+    ds = CSVDailyBarDataSource(csv_dir, Equity, cache=True)
+    cache = BarDataCache(os.path.join(csv_dir, '.qstrader_cache'))
+    entry_dir = cache._entry_dir(csv_path, True)
+    key_dir = os.path.dirname(entry_dir)
+    index_path = os.path.join(entry_dir, 'bar', 'index.npy')
+    inode = os.stat(index_path).st_ino
+
+    bar_df, bid_ask_df = cache.load(csv_path, True)
+    assert cache.save(csv_path, True, bar_df, bid_ask_df)
+    assert os.stat(index_path).st_ino == inode
+    assert os.listdir(key_dir) == [os.path.basename(entry_dir)]
+
+    with open(csv_path, 'a') as csv_file:
+        csv_file.write('2019-02-01,130.0,131.0,131.0\n')
+    CSVDailyBarDataSource(csv_dir, Equity, cache=True, validate_data=False)
+    new_entry_dir = cache._entry_dir(csv_path, True)
+    assert new_entry_dir != entry_dir
+    assert os.listdir(key_dir) == [os.path.basename(new_entry_dir)]
+    assert len(os.listdir(cache.cache_dir)) == 2
+
+    # Entries of previous cache versions are not versioned
+    legacy_dir = os.path.join(cache.cache_dir, 'legacy')
+    os.makedirs(os.path.join(legacy_dir, 'bar'))
+    BarDataCache(cache.cache_dir)
+    assert not os.path.exists(legacy_dir)
+    pd.testing.assert_frame_equal(
+        cache.load(csv_path, True)[0].iloc[:-1], ds.asset_bar_frames['EQ:ABC']
+    )
+
+
+def test_cached_validation_report(tmp_path):
+    """
+    Checks that the validation report of each CSV file is cached
+    within its entry and reused while the file is unmodified, and
+    that invalid bars fail the construction of the data source.
+    """
+    csv_dir = str(tmp_path)
+    _copy_fixtures(csv_dir)
+    csv_path = os.path.join(csv_dir, 'ABC.csv')
+    cache = BarDataCache(os.path.join(csv_dir, '.qstrader_cache'))
+
+    ds = CSVDailyBarDataSource(csv_dir, Equity, cache=True)
+    params = {'max_gap_days': 7}
+    report = cache.load_report(csv_path, True, params)
+    assert report == ds.validation_report['EQ:ABC']
+    assert cache.load_report(csv_path, True, {'max_gap_days': 3}) is None
+
+    # Cached reports are used in place of re-validating the bars
+    report['rows'] = -1
+    cache.save_report(csv_path, True, params, report)
+    cached_ds = CSVDailyBarDataSource(csv_dir, Equity, cache=True)
+    assert cached_ds.validation_report['EQ:ABC']['rows'] == -1
+
+    # Modifying the file invalidates the report
+    csv_df = pd.read_csv(csv_path)
+    csv_df.loc[3, 'Close'] = 0.0
+    csv_df.to_csv(csv_path, index=False)
+    with pytest.raises(ValueError, match='EQ:ABC'):
+        CSVDailyBarDataSource(csv_dir, Equity, cache=True)
+    ds = CSVDailyBarDataSource(
+        csv_dir, Equity, cache=True, validate_data=False
+    )
+    assert ds.validation_report is None
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytz
+
+from qstrader.data.cursor import BarCursor
+
+
+def test_cursor_matches_search():
+    """
+    Checks that rows located incrementally by the cursor match those
+    located by binary search, including after moving backwards in time
+    and for queries away from the cursor time.
+    """
+    timestamps = pd.DatetimeIndex(
+        [
+            '2019-01-02 14:30:00', '2019-01-02 21:00:00',
+            '2019-01-03 14:30:00', '2019-01-03 21:00:00',
+            '2019-01-07 14:30:00', '2019-01-07 21:00:00'
+        ]
+    ).tz_localize(pytz.UTC).asi8
+    times = list(
+        pd.date_range('2019-01-01', '2019-01-09', freq='3H', tz=pytz.UTC)
+    )
+    cursor = BarCursor()
+    for dt in times + times[10:20]:
+        cursor.advance(dt)
+        expected = int(
+            np.searchsorted(timestamps, dt.value, side='right')
+        ) - 1
+        assert cursor.locate('EQ:ABC', timestamps, dt.value) == expected
+    assert cursor.positions == {'EQ:ABC': 1}
+
+    earlier_dt = pd.Timestamp('2019-01-08', tz=pytz.UTC)
+    assert cursor.locate('EQ:ABC', timestamps, earlier_dt.value) == 5
+    assert cursor.positions == {'EQ:ABC': 1}
@@ -0,0 +1,530 @@
+import gc
+import os
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.asset.equity import Equity
+from qstrader.asset.registry import AssetRegistry
+from qstrader.data.backtest_data_handler import BacktestDataHandler
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+from qstrader.exchange.exchange_calendar import ExchangeCalendar
+
+
+@pytest.fixture
+def csv_dir():
+    return os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        '..', '..', 'integration', 'trading', 'fixtures'
+    )
+
+
+def test_array_store_matches_frames(csv_dir):
+    """
+    Checks that bid/ask prices obtained via the array-backed price
+    store match those obtained from the per-asset DataFrames.
+    """
+    frame_ds = CSVDailyBarDataSource(csv_dir, Equity)
+    array_ds = CSVDailyBarDataSource(csv_dir, Equity, array_store=True)
+
+    timestamps = pd.date_range(
+        '2018-12-31', '2019-02-02', freq='90min', tz=pytz.UTC
+    )
+    for asset in ['EQ:ABC', 'EQ:DEF']:
+        for dt in timestamps:
+            np.testing.assert_equal(
+                array_ds.get_bid(dt, asset), frame_ds.get_bid(dt, asset)
+            )
+            np.testing.assert_equal(
+                array_ds.get_ask(dt, asset), frame_ds.get_ask(dt, asset)
+            )
+
+
+def test_parallel_load_matches_sequential_load(csv_dir):
+    """
+    Checks that loading the CSV files with a process pool produces
+    the same DataFrames, in the same order, as a sequential load.
+    """
+    sequential_ds = CSVDailyBarDataSource(csv_dir, Equity)
+    parallel_ds = CSVDailyBarDataSource(csv_dir, Equity, max_workers=2)
+
+    assert list(parallel_ds.asset_bar_frames.keys()) == \
+        list(sequential_ds.asset_bar_frames.keys())
+    for asset in sequential_ds.asset_bar_frames.keys():
+        pd.testing.assert_frame_equal(
+            parallel_ds.asset_bar_frames[asset],
+            sequential_ds.asset_bar_frames[asset]
+        )
+        pd.testing.assert_frame_equal(
+            parallel_ds.asset_bid_ask_frames[asset],
+            sequential_ds.asset_bid_ask_frames[asset]
+        )
+
+
+class _LockingCSVDailyBarDataSource(CSVDailyBarDataSource):
+    """
+    A CSV data source holding an attribute that cannot be pickled.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+
+def test_parallel_load_does_not_pickle_data_source(csv_dir):
+    """
+    Checks that the worker processes of a parallel load are only sent
+    the loading parameters, rather than the data source itself, such
+    that data sources with unpicklable attributes can be loaded.
+    """
+    sequential_ds = CSVDailyBarDataSource(csv_dir, Equity)
+    parallel_ds = _LockingCSVDailyBarDataSource(
+        csv_dir, Equity, max_workers=2
+    )
+    for asset in sequential_ds.asset_bar_frames.keys():
+        pd.testing.assert_frame_equal(
+            parallel_ds.asset_bid_ask_frames[asset],
+            sequential_ds.asset_bid_ask_frames[asset]
+        )
+
+
+@pytest.mark.parametrize('max_workers', [None, 2])
+def test_invalid_csv_files(csv_dir, tmp_path, max_workers):
+    """
+    Checks that the raw bars of each CSV file are validated prior to
+    being sorted and adjusted, such that unsorted dates and a missing
+    adjusted close column are both described by a single validation
+    error.
+    """
+    abc_df = pd.read_csv(os.path.join(csv_dir, 'ABC.csv'))
+    abc_df.drop(columns='Adj Close').to_csv(
+        os.path.join(str(tmp_path), 'ABC.csv'), index=False
+    )
+    def_df = pd.read_csv(os.path.join(csv_dir, 'DEF.csv'))
+    def_df.iloc[[1, 0] + list(range(2, len(def_df)))].to_csv(
+        os.path.join(str(tmp_path), 'DEF.csv'), index=False
+    )
+
+    with pytest.raises(ValueError) as excinfo:
+        CSVDailyBarDataSource(str(tmp_path), Equity, max_workers=max_workers)
+    message = str(excinfo.value)
+    assert message.startswith(
+        'Daily bar data failed validation for 2 asset(s)'
+    )
+    assert 'EQ:ABC (Missing pricing columns: Adj Close)' in message
+    assert 'EQ:DEF (Dates are not sorted)' in message
+
+
+def test_lazy_load(csv_dir):
+    """
+    Checks that lazily loaded assets are only loaded upon request,
+    are evicted beyond the memory cap and provide the same prices
+    as eagerly loaded assets.
+    """
+    eager_ds = CSVDailyBarDataSource(csv_dir, Equity)
+    lazy_ds = CSVDailyBarDataSource(csv_dir, Equity, lazy=True, max_memory=1)
+    assert len(lazy_ds.frame_loader.loaded) == 0
+    assert 'EQ:ABC' in lazy_ds.asset_bar_frames
+
+    dt = pd.Timestamp('2019-01-15 15:00:00', tz=pytz.UTC)
+    assert lazy_ds.get_bid(dt, 'EQ:ABC') == eager_ds.get_bid(dt, 'EQ:ABC')
+    assert list(lazy_ds.frame_loader.loaded.keys()) == ['EQ:ABC']
+
+    assert lazy_ds.get_ask(dt, 'EQ:DEF') == eager_ds.get_ask(dt, 'EQ:DEF')
+    assert list(lazy_ds.frame_loader.loaded.keys()) == ['EQ:DEF']
+
+    pd.testing.assert_frame_equal(
+        lazy_ds.get_assets_historical_closes(
+            dt - pd.Timedelta(days=7), dt, ['EQ:ABC', 'EQ:DEF']
+        ),
+        eager_ds.get_assets_historical_closes(
+            dt - pd.Timedelta(days=7), dt, ['EQ:ABC', 'EQ:DEF']
+        )
+    )
+
+
+def test_lazy_load_with_array_store(csv_dir):
+    """
+    Checks that lazy loading cannot be combined with the
+    array-backed price store.
+    """
+    with pytest.raises(ValueError):
+        CSVDailyBarDataSource(csv_dir, Equity, lazy=True, array_store=True)
+
+
+def test_convert_bar_frame_into_bid_ask_df(csv_dir):
+    """
+    Checks that daily bars are converted into interleaved,
+    sorted open/close prices with adjusted opening prices and
+    forward-filled missing values.
+    """
+    ds = CSVDailyBarDataSource(csv_dir, Equity)
+    bar_df = pd.DataFrame(
+        {
+            'Open': [20.0, 10.0, np.NaN],
+            'Close': [22.0, 11.0, np.NaN],
+            'Adj Close': [11.0, 11.0, np.NaN]
+        },
+        index=pd.DatetimeIndex(
+            ['2019-01-03', '2019-01-02', '2019-01-04'], name='Date'
+        ).tz_localize(pytz.UTC)
+    )
+    expected_prices = [10.0, 11.0, 10.0, 11.0, 11.0, 11.0]
+    expected_df = pd.DataFrame(
+        {'Bid': expected_prices, 'Ask': expected_prices},
+        index=pd.DatetimeIndex(
+            [
+                '2019-01-02 14:30:00', '2019-01-02 21:00:00',
+                '2019-01-03 14:30:00', '2019-01-03 21:00:00',
+                '2019-01-04 14:30:00', '2019-01-04 21:00:00'
+            ],
+            name='Date'
+        ).tz_localize(pytz.UTC)
+    )
+    pd.testing.assert_frame_equal(
+        ds._convert_bar_frame_into_bid_ask_df(bar_df), expected_df
+    )
+
+
+def test_get_assets_historical_closes(csv_dir):
+    """
+    Checks that historical closing prices are sliced from a single
+    cached close panel, without copying when all assets are requested.
+    """
+    ds = CSVDailyBarDataSource(csv_dir, Equity)
+    start_dt = pd.Timestamp('2019-01-07', tz=pytz.UTC)
+    end_dt = pd.Timestamp('2019-01-11', tz=pytz.UTC)
+
+    def_closes = ds.get_assets_historical_closes(start_dt, end_dt, ['EQ:DEF'])
+    assert list(def_closes.columns) == ['EQ:DEF']
+    assert len(def_closes) == 5
+    pd.testing.assert_series_equal(
+        def_closes['EQ:DEF'],
+        ds.asset_bar_frames['EQ:DEF']['Close'].loc[start_dt:end_dt],
+        check_names=False
+    )
+
+    closes = ds.get_assets_historical_closes(
+        start_dt, end_dt, ['EQ:DEF', 'EQ:ABC', 'EQ:XYZ']
+    )
+    assert list(closes.columns) == ['EQ:DEF', 'EQ:ABC']
+    assert np.shares_memory(
+        closes.to_numpy(), ds.close_panels['Close'].to_numpy()
+    )
+
+    # The shared view cannot be used to corrupt the cached panel
+    first_close = closes.iloc[0, 0]
+    with pytest.raises(ValueError), \
+            pd.option_context('mode.chained_assignment', None):
+        closes.iloc[0, 0] = -999.0
+    assert ds.get_assets_historical_closes(
+        start_dt, end_dt, ['EQ:DEF', 'EQ:ABC']
+    ).iloc[0, 0] == first_close
+
+    adj_closes = ds.get_assets_historical_closes(
+        start_dt, end_dt, ['EQ:ABC'], adjusted=True
+    )
+    pd.testing.assert_series_equal(
+        adj_closes['EQ:ABC'],
+        ds.asset_bar_frames['EQ:ABC']['Adj Close'].loc[start_dt:end_dt],
+        check_names=False
+    )
+
+
+def test_streamed_prices_match_frames(csv_dir):
+    """
+    Checks that prices streamed in small chunks match those obtained
+    from the fully loaded DataFrames, that the retained window of bars
+    stays bounded and that earlier queries beyond it are rejected.
+    """
+    frame_ds = CSVDailyBarDataSource(csv_dir, Equity)
+    stream_ds = CSVDailyBarDataSource(
+        csv_dir, Equity, chunksize=3, window=2
+    )
+
+    timestamps = pd.date_range(
+        '2018-12-31', '2019-02-02', freq='90min', tz=pytz.UTC
+    )
+    for dt in timestamps:
+        for asset in ['EQ:ABC', 'EQ:DEF']:
+            np.testing.assert_equal(
+                stream_ds.get_bid(dt, asset), frame_ds.get_bid(dt, asset)
+            )
+            np.testing.assert_equal(
+                stream_ds.get_ask(dt, asset), frame_ds.get_ask(dt, asset)
+            )
+            # At most the window plus a single chunk of bars is retained
+            assert len(stream_ds.asset_bar_frames[asset]) <= 2 + 3
+
+    with pytest.raises(ValueError):
+        stream_ds.get_bid(
+            pd.Timestamp('2019-01-02 14:45:00', tz=pytz.UTC), 'EQ:ABC'
+        )
+
+    with pytest.raises(ValueError):
+        CSVDailyBarDataSource(csv_dir, Equity, chunksize=3, lazy=True)
+
+
+def test_price_cache_per_instance(csv_dir):
+    """
+    Checks that each data source caches its own prices and that
+    the cached prices are released along with the data source.
+    """
+    ds = CSVDailyBarDataSource(csv_dir, Equity, price_cache_size=4)
+    other_ds = CSVDailyBarDataSource(csv_dir, Equity, price_cache_size=0)
+    dt = pd.Timestamp('2019-01-03 15:00:00', tz=pytz.UTC)
+
+    bid = ds.get_bid(dt, 'EQ:ABC')
+    assert ds.get_bid(dt, 'EQ:ABC') == bid
+    assert ds.bid_cache.stats()['hits'] == 1
+    assert ds.bid_cache.stats()['misses'] == 1
+    assert len(ds.ask_cache) == 0
+
+    assert other_ds.get_bid(dt, 'EQ:ABC') == bid
+    assert len(other_ds.bid_cache) == 0
+
+    ds_ref = weakref.ref(ds)
+    del ds
+    gc.collect()
+    assert ds_ref() is None
+
+
+def test_price_queries_do_not_register_assets(csv_dir):
+    """
+    Checks that the data source registers only its loaded assets
+    within its registry, such that price queries of unknown assets
+    do not grow the registry.
+    """
+    registry = AssetRegistry()
+    ds = CSVDailyBarDataSource(csv_dir, Equity, registry=registry)
+    assert registry.symbols == ['EQ:ABC', 'EQ:DEF']
+
+    dt = pd.Timestamp('2019-01-03 15:00:00', tz=pytz.UTC)
+    assert ds.get_bid(dt, 'EQ:DEF') == ds.get_bid(dt, 'EQ:DEF')
+    assert ds.bid_cache.stats()['hits'] == 1
+    with pytest.raises(KeyError):
+        ds.get_bid(dt, 'EQ:XYZ')
+    assert registry.symbols == ['EQ:ABC', 'EQ:DEF']
+
+
+def test_append_bars(csv_dir):
+    """
+    Checks that appending bars to partially loaded assets provides
+    the same raw and adjusted prices as loading all of the bars.
+    """
+    full_ds = CSVDailyBarDataSource(csv_dir, Equity, array_store=True)
+    ds = CSVDailyBarDataSource(csv_dir, Equity, array_store=True)
+    split_dt = pd.Timestamp('2019-01-15', tz=pytz.UTC)
+    dt = pd.Timestamp('2019-01-22 15:00:00', tz=pytz.UTC)
+
+    raw_bar_frames = {}
+    for asset, bar_df in full_ds.asset_bar_frames.items():
+        raw_bar_df = bar_df[['Open', 'Close', 'Adj Close']]
+        raw_bar_frames[asset] = raw_bar_df.set_index(
+            raw_bar_df.index.tz_localize(None)
+        )
+        ds.asset_bar_frames[asset] = bar_df.loc[:split_dt]
+        ds.asset_bid_ask_frames[asset] = full_ds.asset_bid_ask_frames[
+            asset
+        ].loc[:split_dt + pd.Timedelta(days=1)]
+    ds.price_store = ds._create_price_store()
+    assert ds.get_bid(dt, 'EQ:ABC') == \
+        full_ds.asset_bar_frames['EQ:ABC']['Adj Close'].loc[split_dt]
+    assert len(ds.get_assets_historical_closes(split_dt, dt, ['EQ:ABC'])) == 1
+
+    for asset, raw_bar_df in raw_bar_frames.items():
+        ds.append_bars(asset, raw_bar_df.loc['2019-01-16':])
+        pd.testing.assert_frame_equal(
+            ds.asset_bar_frames[asset], full_ds.asset_bar_frames[asset]
+        )
+        pd.testing.assert_frame_equal(
+            ds.asset_bid_ask_frames[asset], full_ds.asset_bid_ask_frames[asset]
+        )
+    assert ds.get_bid(dt, 'EQ:ABC') == full_ds.get_bid(dt, 'EQ:ABC')
+    pd.testing.assert_frame_equal(
+        ds.get_assets_historical_closes(split_dt, dt, ['EQ:ABC', 'EQ:DEF']),
+        full_ds.get_assets_historical_closes(
+            split_dt, dt, ['EQ:ABC', 'EQ:DEF']
+        )
+    )
+
+    with pytest.raises(ValueError):
+        ds.append_bars('EQ:ABC', raw_bar_frames['EQ:ABC'].loc['2019-01-30':])
+
+
+def test_append_bar_frames_extends_price_store(csv_dir):
+    """
+    Checks that appending the bars of all assets a day at a time
+    extends the array-backed price store in place, providing the
+    same prices as loading all of the bars.
+    """
+    full_ds = CSVDailyBarDataSource(csv_dir, Equity, array_store=True)
+    ds = CSVDailyBarDataSource(csv_dir, Equity, array_store=True)
+    split_dt = pd.Timestamp('2019-01-15', tz=pytz.UTC)
+
+    raw_bar_frames = {}
+    for asset, bar_df in full_ds.asset_bar_frames.items():
+        raw_bar_df = bar_df[['Open', 'Close', 'Adj Close']]
+        raw_bar_frames[asset] = raw_bar_df.set_index(
+            raw_bar_df.index.tz_localize(None)
+        )
+        ds.asset_bar_frames[asset] = bar_df.loc[:split_dt]
+        ds.asset_bid_ask_frames[asset] = full_ds.asset_bid_ask_frames[
+            asset
+        ].loc[:split_dt + pd.Timedelta(days=1)]
+    ds.price_store = ds._create_price_store()
+    price_store = ds.price_store
+
+    dates = raw_bar_frames['EQ:ABC'].loc['2019-01-16':].index
+    for date in dates:
+        ds.append_bar_frames({
+            asset: raw_bar_df.loc[[date]]
+            for asset, raw_bar_df in raw_bar_frames.items()
+        })
+        assert ds.price_store is price_store
+        dt = date.tz_localize(pytz.UTC) + pd.Timedelta(hours=21)
+        for asset in raw_bar_frames:
+            assert ds.get_bid(dt, asset) == full_ds.get_bid(dt, asset)
+            assert ds.get_ask(dt, asset) == full_ds.get_ask(dt, asset)
+
+    np.testing.assert_array_equal(
+        price_store.timestamps, full_ds.price_store.timestamps
+    )
+    np.testing.assert_array_equal(price_store.bid, full_ds.price_store.bid)
+    np.testing.assert_array_equal(price_store.ask, full_ds.price_store.ask)
+    np.testing.assert_array_equal(
+        price_store.first_valid, full_ds.price_store.first_valid
+    )
+
+
+def test_compact_mid_prices(csv_dir):
+    """
+    Checks that storing single precision mid prices provides
+    bid/ask prices within the validated precision, sharing a single
+    price matrix within the array-backed price store.
+    """
+    ds = CSVDailyBarDataSource(csv_dir, Equity)
+    compact_ds = CSVDailyBarDataSource(
+        csv_dir, Equity, array_store=True, price_dtype='float32',
+        max_precision_error=1e-6
+    )
+    for asset in ['EQ:ABC', 'EQ:DEF']:
+        assert list(compact_ds.asset_bid_ask_frames[asset].columns) == ['Mid']
+        assert compact_ds.asset_bid_ask_frames[asset]['Mid'].dtype == np.float32
+        assert 0.0 < compact_ds.precision_errors[asset] <= 1e-6
+    assert compact_ds.price_store.ask is compact_ds.price_store.bid
+    assert compact_ds.price_store.bid.dtype == np.float32
+
+    dt = pd.Timestamp('2019-01-22 15:00:00', tz=pytz.UTC)
+    bid = compact_ds.get_bid(dt, 'EQ:ABC')
+    assert isinstance(bid, float)
+    assert bid == compact_ds.get_ask(dt, 'EQ:ABC')
+    assert bid == pytest.approx(ds.get_bid(dt, 'EQ:ABC'), rel=1e-6)
+
+    with pytest.raises(ValueError):
+        CSVDailyBarDataSource(
+            csv_dir, Equity, price_dtype='float16', max_precision_error=1e-6
+        )
+
+
+def test_cursor_prices_match_store(csv_dir):
+    """
+    Checks that prices located via the advancing cursor, both from
+    the per-asset DataFrames and from the array-backed price store,
+    match those located by binary search.
+    """
+    ds = CSVDailyBarDataSource(csv_dir, Equity, price_cache_size=0)
+    array_ds = CSVDailyBarDataSource(
+        csv_dir, Equity, array_store=True, price_cache_size=0
+    )
+    search_ds = CSVDailyBarDataSource(csv_dir, Equity, price_cache_size=0)
+
+    timestamps = pd.date_range(
+        '2018-12-31', '2019-02-02', freq='90min', tz=pytz.UTC
+    )
+    for dt in timestamps:
+        ds.advance(dt)
+        array_ds.advance(dt)
+        for asset in ['EQ:ABC', 'EQ:DEF']:
+            expected = search_ds.get_bid(dt, asset)
+            np.testing.assert_equal(ds.get_bid(dt, asset), expected)
+            np.testing.assert_equal(array_ds.get_bid(dt, asset), expected)
+    assert ds.cursor.positions['EQ:ABC'] == \
+        len(ds.asset_bid_ask_frames['EQ:ABC']) - 1
+
+
+def test_session_times(csv_dir):
+    """
+    Checks that the opening and closing prices are timestamped
+    at the provided market session times.
+    """
+    ds = CSVDailyBarDataSource(
+        csv_dir, Equity, market_open='13:30:00', market_close='20:00:00'
+    )
+    assert ds.session_times == ('13:30:00', '20:00:00')
+    assert CSVDailyBarDataSource(csv_dir, Equity).session_times is None
+
+    bid_ask_df = ds.asset_bid_ask_frames['EQ:ABC']
+    bar_df = ds.asset_bar_frames['EQ:ABC']
+    day = bar_df.index[0]
+    assert bid_ask_df.index[0] == day + pd.Timedelta(hours=13, minutes=30)
+    assert bid_ask_df.index[1] == day + pd.Timedelta(hours=20)
+    assert ds.get_bid(day + pd.Timedelta(hours=20), 'EQ:ABC') == \
+        bar_df['Adj Close'].iloc[0]
+
+    with pytest.raises(ValueError):
+        CSVDailyBarDataSource(
+            csv_dir, Equity, market_open='21:00:00', market_close='14:30:00'
+        )
+
+
+def test_calendar_session_times(csv_dir):
+    """
+    Checks that the closing prices of early close sessions are
+    timestamped at the early close time of the exchange calendar.
+    """
+    calendar = ExchangeCalendar(
+        name='TEST', early_close='18:00:00', adhoc_early_closes=['2019-01-03']
+    )
+    ds = CSVDailyBarDataSource(csv_dir, Equity, calendar=calendar)
+    assert ds.session_times == ('14:30:00', '21:00:00', 'TEST')
+
+    bid_ask_index = ds.asset_bid_ask_frames['EQ:ABC'].index
+    closes = bid_ask_index[1::2].strftime('%Y-%m-%d %H:%M')
+    assert '2019-01-02 21:00' in closes
+    assert '2019-01-03 18:00' in closes
+    assert '2019-01-03 21:00' not in closes
+
+
+def test_prices_matrix_matches_single_queries(csv_dir):
+    """
+    Checks that multi-timestamp price queries of the DataFrames and
+    of the array store match the single timestamp queries, and that
+    the data handler values mid prices in bulk.
+    """
+    dts = pd.date_range(
+        '2018-12-31 21:00:00', '2019-02-04 21:00:00', freq='13H', tz=pytz.UTC
+    )
+    assets = ['EQ:DEF', 'EQ:XYZ', 'EQ:ABC']
+    ds = CSVDailyBarDataSource(csv_dir, Equity)
+    store_ds = CSVDailyBarDataSource(csv_dir, Equity, array_store=True)
+
+    expected = np.array([ds.get_bids(dt, assets) for dt in dts])
+    np.testing.assert_array_equal(ds.get_bids_matrix(dts, assets), expected)
+    np.testing.assert_array_equal(ds.get_asks_matrix(dts, assets), expected)
+    np.testing.assert_array_equal(
+        store_ds.get_bids_matrix(dts, assets), expected
+    )
+
+    dh = BacktestDataHandler(None, data_sources=[ds])
+    np.testing.assert_array_equal(
+        dh.get_assets_latest_mid_prices_matrix(dts, assets), expected
+    )
+    multi_dh = BacktestDataHandler(None, data_sources=[ds, store_ds])
+    np.testing.assert_array_equal(
+        multi_dh.get_assets_latest_mid_prices_matrix(dts, assets), expected
+    )
@@ -0,0 +1,115 @@
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.asset.equity import Equity
+from qstrader.data.daily_bar_csv import CSVDailyBarDataSource
+from qstrader.data.daily_bar_hdf5 import HDF5DailyBarDataSource
+from qstrader.data.daily_bar_parquet import ParquetDailyBarDataSource
+from qstrader.data.daily_bar_sqlite import SQLiteDailyBarDataSource
+
+
+@pytest.fixture
+def csv_dir():
+    return os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        '..', '..', 'integration', 'trading', 'fixtures'
+    )
+
+
+@pytest.fixture
+def bars_df(csv_dir):
+    frames = []
+    for symbol in ['ABC', 'DEF']:
+        df = pd.read_csv(os.path.join(csv_dir, '%s.csv' % symbol))
+        df.insert(0, 'Symbol', symbol)
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _assert_matches_csv(ds, csv_dir, symbols, start_dt, end_dt):
+    csv_ds = CSVDailyBarDataSource(csv_dir, Equity, csv_symbols=symbols)
+    assert sorted(ds.asset_bar_frames.keys()) == \
+        ['EQ:%s' % symbol for symbol in symbols]
+    for asset, bar_df in ds.asset_bar_frames.items():
+        csv_bar_df = csv_ds.asset_bar_frames[asset].loc[start_dt:end_dt]
+        pd.testing.assert_frame_equal(
+            bar_df[csv_bar_df.columns], csv_bar_df, check_freq=False
+        )
+
+    dt = pd.Timestamp('2019-01-22 15:00:00', tz=pytz.UTC)
+    for asset in ds.asset_bar_frames.keys():
+        assert ds.get_bid(dt, asset) == csv_ds.get_bid(dt, asset)
+        assert ds.get_ask(dt, asset) == csv_ds.get_ask(dt, asset)
+    assert np.isnan(ds.get_bid(start_dt - pd.Timedelta(days=1), asset))
+    pd.testing.assert_frame_equal(
+        ds.get_assets_historical_closes(
+            start_dt, end_dt, list(ds.asset_bar_frames.keys())
+        ),
+        csv_ds.get_assets_historical_closes(
+            start_dt, end_dt, list(ds.asset_bar_frames.keys())
+        )
+    )
+
+
+def test_sqlite_daily_bar_data_source(bars_df, csv_dir, tmp_path):
+    """
+    Checks that the SQLite data source only loads the requested
+    symbols and date range, providing the same prices as the CSV
+    data source.
+    """
+    db_path = str(tmp_path / 'bars.db')
+    with sqlite3.connect(db_path) as conn:
+        bars_df.to_sql('daily_bars', conn, index=False)
+
+    start_dt = pd.Timestamp('2019-01-10', tz=pytz.UTC)
+    end_dt = pd.Timestamp('2019-01-25', tz=pytz.UTC)
+    ds = SQLiteDailyBarDataSource(
+        db_path, Equity, symbols=['DEF'], start_dt=start_dt, end_dt=end_dt
+    )
+    assert ds.asset_bar_frames['EQ:DEF'].index[0] == start_dt
+    assert ds.asset_bar_frames['EQ:DEF'].index[-1] == end_dt
+    _assert_matches_csv(ds, csv_dir, ['DEF'], start_dt, end_dt)
+
+
+def test_parquet_daily_bar_data_source(bars_df, csv_dir, tmp_path):
+    """
+    Checks that the partitioned Parquet data source only loads the
+    requested symbols and date range, providing the same prices as
+    the CSV data source.
+    """
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'bars')
+    bars_df = bars_df.assign(Date=pd.to_datetime(bars_df['Date']))
+    bars_df.to_parquet(path, partition_cols=['Symbol'], index=False)
+
+    start_dt = pd.Timestamp('2019-01-10', tz=pytz.UTC)
+    end_dt = pd.Timestamp('2019-01-25', tz=pytz.UTC)
+    ds = ParquetDailyBarDataSource(
+        path, Equity, symbols=['ABC'], start_dt=start_dt, end_dt=end_dt
+    )
+    _assert_matches_csv(ds, csv_dir, ['ABC'], start_dt, end_dt)
+
+
+def test_hdf5_daily_bar_data_source(bars_df, csv_dir, tmp_path):
+    """
+    Checks that the HDF5 data source only loads the requested
+    symbols and date range, providing the same prices as the CSV
+    data source.
+    """
+    pytest.importorskip('tables')
+    path = str(tmp_path / 'bars.h5')
+    for symbol, df in bars_df.groupby('Symbol'):
+        df = df.drop(columns='Symbol').set_index(pd.to_datetime(df['Date']))
+        df.drop(columns='Date').to_hdf(path, key=symbol, format='table')
+
+    start_dt = pd.Timestamp('2019-01-10', tz=pytz.UTC)
+    end_dt = pd.Timestamp('2019-01-25', tz=pytz.UTC)
+    ds = HDF5DailyBarDataSource(
+        path, Equity, symbols=['ABC', 'DEF'], start_dt=start_dt, end_dt=end_dt
+    )
+    _assert_matches_csv(ds, csv_dir, ['ABC', 'DEF'], start_dt, end_dt)
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.asset.equity import Equity
+from qstrader.data.backtest_data_handler import BacktestDataHandler
+from qstrader.data.intraday_bar import IntradayBarDataSource
+
+
+TIME_FORMAT = '%d.%m.%Y %H:%M:%S.%f'
+
+
+@pytest.fixture
+def csv_dir(tmp_path):
+    pd.DataFrame({
+        'Ticker': ['ABC', 'ABC', 'DEF', 'ABC', 'ABC'],
+        'Time': [
+            '02.01.2020 14:30:05.100', '02.01.2020 14:30:40.000',
+            '02.01.2020 14:30:50.000', '02.01.2020 14:31:10.500',
+            '02.01.2020 14:33:00.000'
+        ],
+        'Bid': [100.0, 100.5, 50.0, 101.0, 102.0],
+        'Ask': [100.2, 100.7, 50.1, 101.2, 102.2]
+    }).to_csv(tmp_path / 'ticks_20200102.csv', index=False)
+    pd.DataFrame({
+        'Time': ['02.01.2020 14:31:00.000', '02.01.2020 14:32:00.000'],
+        'Bid': [20.0, 21.0],
+        'Ask': [20.5, 21.5]
+    }).to_csv(tmp_path / 'GHI.csv', index=False)
+    return str(tmp_path)
+
+
+def test_intraday_bid_ask(csv_dir):
+    """
+    Checks that separate bid and ask prices are loaded for each
+    asset, from symbol columns or filenames, and queried as at
+    the provided time.
+    """
+    ds = IntradayBarDataSource(
+        csv_dir, Equity, csv_files=['ticks_20200102.csv', 'GHI.csv'],
+        time_format=TIME_FORMAT
+    )
+    assert ds.price_store.assets == ['EQ:ABC', 'EQ:DEF', 'EQ:GHI']
+
+    dt = pd.Timestamp('2020-01-02 14:31:00', tz=pytz.UTC)
+    assert ds.get_bid(dt, 'EQ:ABC') == 100.5
+    assert ds.get_ask(dt, 'EQ:ABC') == 100.7
+    assert ds.get_bid(dt, 'EQ:GHI') == 20.0
+    assert np.isnan(
+        ds.get_bid(pd.Timestamp('2020-01-02 14:30:00', tz=pytz.UTC), 'EQ:ABC')
+    )
+    np.testing.assert_array_equal(
+        ds.get_asks(dt, ['EQ:DEF', 'EQ:ABC']), [50.1, 100.7]
+    )
+
+    dh = BacktestDataHandler(None, data_sources=[ds])
+    assert dh.get_asset_latest_bid_ask_price(dt, 'EQ:ABC') == (100.5, 100.7)
+    assert dh.get_asset_latest_mid_price(dt, 'EQ:ABC') == 100.6
+    bids, asks = dh.get_assets_latest_bid_ask_prices(dt, ['EQ:ABC', 'EQ:GHI'])
+    np.testing.assert_array_equal(bids, [100.5, 20.0])
+    np.testing.assert_array_equal(asks, [100.7, 20.5])
+
+
+def test_intraday_resampled_bars(csv_dir):
+    """
+    Checks that prices resampled onto bars are labelled at the end
+    of each bar, such that no price is known before it was quoted.
+    """
+    ds = IntradayBarDataSource(
+        csv_dir, Equity, csv_files=['ticks_20200102.csv'], freq='1min',
+        csv_symbols=['ABC'], time_format=TIME_FORMAT, price_dtype='float32'
+    )
+    assert ds.price_store.assets == ['EQ:ABC']
+    assert ds.price_store.bid.dtype == np.float32
+
+    closes = ds.get_assets_historical_closes(
+        pd.Timestamp('2020-01-02 14:30:00', tz=pytz.UTC),
+        pd.Timestamp('2020-01-02 14:33:00', tz=pytz.UTC),
+        ['EQ:ABC']
+    )
+    expected_index = pd.DatetimeIndex(
+        [
+            '2020-01-02 14:31:00', '2020-01-02 14:32:00',
+            '2020-01-02 14:33:00'
+        ], name='Date'
+    ).tz_localize(pytz.UTC)
+    pd.testing.assert_index_equal(closes.index, expected_index)
+    np.testing.assert_allclose(
+        closes['EQ:ABC'].to_numpy(), [100.6, 101.1, 102.1], rtol=1e-6
+    )
+
+
+def test_intraday_invalid_prices(tmp_path):
+    """
+    Checks that crossed bid/ask prices are rejected.
+    """
+    pd.DataFrame({
+        'Time': ['2020-01-02 14:31:00'], 'Bid': [20.0], 'Ask': [19.0]
+    }).to_csv(tmp_path / 'ABC.csv', index=False)
+    with pytest.raises(ValueError):
+        IntradayBarDataSource(str(tmp_path), Equity)
@@ -0,0 +1,39 @@
+import numpy as np
+
+from qstrader.data.price_cache import PriceCache
+
+
+def test_price_cache_hits_and_misses():
+    """
+    Checks that cached prices (including NaN prices) are returned
+    and that hits and misses are recorded.
+    """
+    cache = PriceCache()
+    assert cache.get(1, 0) is None
+    cache.put(1, 0, 101.0)
+    cache.put(1, 1, np.NaN)
+    assert cache.get(1, 0) == 101.0
+    assert np.isnan(cache.get(1, 1))
+    assert cache.stats() == {
+        'hits': 2, 'misses': 1, 'size': 2, 'hit_rate': 2.0 / 3.0
+    }
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats()['hits'] == 0
+
+
+def test_price_cache_evicts_least_recently_used():
+    """
+    Checks that the least recently used price is evicted once the
+    maximum size of the cache is exceeded.
+    """
+    cache = PriceCache(max_size=2)
+    cache.put(1, 0, 101.0)
+    cache.put(2, 0, 102.0)
+    assert cache.get(1, 0) == 101.0
+    cache.put(3, 0, 103.0)
+    assert len(cache) == 2
+    assert cache.get(2, 0) is None
+    assert cache.get(1, 0) == 101.0
+    assert cache.get(3, 0) == 103.0
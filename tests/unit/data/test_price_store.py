@@ -0,0 +1,257 @@
+import concurrent.futures
+
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.data.price_store import ArrayPriceStore
+
+
+def _bid_ask_frame(timestamps, prices):
+    index = pd.DatetimeIndex(
+        [pd.Timestamp(ts, tz=pytz.UTC) for ts in timestamps], name='Date'
+    )
+    return pd.DataFrame({'Bid': prices, 'Ask': prices}, index=index)
+
+
+@pytest.fixture
+def bid_ask_frames():
+    return {
+        'EQ:ABC': _bid_ask_frame(
+            [
+                '2019-01-01 14:30:00', '2019-01-01 21:00:00',
+                '2019-01-02 14:30:00', '2019-01-02 21:00:00'
+            ],
+            [100.0, 101.0, 102.0, 103.0]
+        ),
+        'EQ:DEF': _bid_ask_frame(
+            ['2019-01-02 14:30:00', '2019-01-02 21:00:00'],
+            [50.0, 51.0]
+        )
+    }
+
+
+@pytest.mark.parametrize(
+    'dt,asset,expected',
+    [
+        ('2018-12-31 21:00:00', 'EQ:ABC', np.NaN),
+        ('2019-01-01 14:30:00', 'EQ:ABC', 100.0),
+        ('2019-01-01 18:00:00', 'EQ:ABC', 100.0),
+        ('2019-01-02 21:00:00', 'EQ:ABC', 103.0),
+        ('2019-01-05 14:30:00', 'EQ:ABC', 103.0),
+        ('2019-01-01 21:00:00', 'EQ:DEF', np.NaN),
+        ('2019-01-02 14:30:00', 'EQ:DEF', 50.0),
+        ('2019-01-03 14:30:00', 'EQ:DEF', 51.0)
+    ]
+)
+def test_get_bid_ask(bid_ask_frames, dt, asset, expected):
+    """
+    Checks that single asset bid/ask lookups match a 'pad'
+    lookup on the original DataFrames, including NaN prior
+    to the start date of each asset.
+    """
+    store = ArrayPriceStore.from_bid_ask_frames(bid_ask_frames)
+    ts = pd.Timestamp(dt, tz=pytz.UTC)
+    np.testing.assert_equal(store.get_bid(ts, asset), expected)
+    np.testing.assert_equal(store.get_ask(ts, asset), expected)
+
+
+def test_get_bids_asks(bid_ask_frames):
+    """
+    Checks that multi-asset lookups return prices in the order
+    of the provided assets, with NaN for unknown assets.
+    """
+    store = ArrayPriceStore.from_bid_ask_frames(bid_ask_frames)
+    ts = pd.Timestamp('2019-01-02 15:00:00', tz=pytz.UTC)
+    assets = ['EQ:DEF', 'EQ:XYZ', 'EQ:ABC']
+    np.testing.assert_equal(store.get_bids(ts, assets), [50.0, np.NaN, 102.0])
+    np.testing.assert_equal(store.get_asks(ts, assets), [50.0, np.NaN, 102.0])
+
+
+def test_get_bid_unknown_asset(bid_ask_frames):
+    """
+    Checks that a single asset lookup for an asset not within
+    the store raises a KeyError.
+    """
+    store = ArrayPriceStore.from_bid_ask_frames(bid_ask_frames)
+    with pytest.raises(KeyError):
+        store.get_bid(pd.Timestamp('2019-01-02', tz=pytz.UTC), 'EQ:XYZ')
+
+
+def _load_store_and_get_bids(store_dir, dt, assets):
+    store = ArrayPriceStore.load(store_dir)
+    return store.bid.flags.writeable, list(store.get_bids(dt, assets))
+
+
+def test_save_and_load_memory_mapped(bid_ask_frames, tmp_path):
+    """
+    Checks that a saved price store can be loaded read-only and
+    memory-mapped, including from a separate worker process.
+    """
+    store = ArrayPriceStore.from_bid_ask_frames(bid_ask_frames)
+    store_dir = str(tmp_path / 'prices')
+    store.save(store_dir)
+
+    loaded = ArrayPriceStore.load(store_dir)
+    assert loaded.assets == store.assets
+    assert isinstance(loaded.bid.base, np.memmap)
+    assert not loaded.bid.flags.writeable
+    np.testing.assert_equal(loaded.timestamps, store.timestamps)
+    np.testing.assert_equal(loaded.bid, store.bid)
+    np.testing.assert_equal(loaded.ask, store.ask)
+
+    dt = pd.Timestamp('2019-01-02 15:00:00', tz=pytz.UTC)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1) as executor:
+        writeable, bids = executor.submit(
+            _load_store_and_get_bids, store_dir, dt, ['EQ:ABC', 'EQ:DEF']
+        ).result()
+    assert not writeable
+    assert bids == [102.0, 50.0]
+
+
+def test_merge(bid_ask_frames):
+    """
+    Checks that merged price stores take prices from the first store
+    providing them, with subsequent stores backfilling missing prices.
+    """
+    primary = ArrayPriceStore.from_bid_ask_frames(
+        {'EQ:DEF': bid_ask_frames['EQ:DEF']}
+    )
+    backfill = ArrayPriceStore.from_bid_ask_frames(
+        {
+            'EQ:ABC': bid_ask_frames['EQ:ABC'],
+            'EQ:DEF': _bid_ask_frame(['2019-01-01 14:30:00'], [49.0])
+        }
+    )
+    store = ArrayPriceStore.merge([primary, backfill])
+    assert store.assets == ['EQ:DEF', 'EQ:ABC']
+    assert len(store.timestamps) == 4
+    np.testing.assert_equal(store.bid[:, 0], [49.0, 49.0, 50.0, 51.0])
+    np.testing.assert_equal(store.ask[:, 1], [100.0, 101.0, 102.0, 103.0])
+
+
+def test_append(bid_ask_frames, tmp_path):
+    """
+    Checks that appending prices extends the store in place, matching
+    a store created from all of the prices, including for new assets
+    and read-only memory-mapped stores, unless the new prices require
+    the existing rows to be re-aligned.
+    """
+    new_frames = {
+        'EQ:ABC': _bid_ask_frame(
+            ['2019-01-03 14:30:00', '2019-01-03 21:00:00'], [104.0, 105.0]
+        ),
+        'EQ:GHI': _bid_ask_frame(
+            ['2019-01-02 21:00:00', '2019-01-03 21:00:00'], [20.0, 21.0]
+        )
+    }
+    all_frames = {
+        'EQ:ABC': pd.concat([bid_ask_frames['EQ:ABC'], new_frames['EQ:ABC']]),
+        'EQ:DEF': bid_ask_frames['EQ:DEF'],
+        'EQ:GHI': new_frames['EQ:GHI']
+    }
+    expected = ArrayPriceStore.from_bid_ask_frames(all_frames)
+
+    store_dir = str(tmp_path / 'prices')
+    ArrayPriceStore.from_bid_ask_frames(bid_ask_frames).save(store_dir)
+    for store in [
+        ArrayPriceStore.from_bid_ask_frames(bid_ask_frames),
+        ArrayPriceStore.load(store_dir)
+    ]:
+        store.get_bid(pd.Timestamp('2019-01-02 21:00:00', tz=pytz.UTC), 'EQ:ABC')
+        assert store.append(new_frames)
+        assert store.assets == expected.assets
+        np.testing.assert_equal(store.timestamps, expected.timestamps)
+        np.testing.assert_equal(store.bid, expected.bid)
+        np.testing.assert_equal(store.ask, expected.ask)
+        np.testing.assert_equal(store.first_valid, expected.first_valid)
+        ts = pd.Timestamp('2019-01-03 15:00:00', tz=pytz.UTC)
+        np.testing.assert_equal(
+            store.get_bids(ts, ['EQ:ABC', 'EQ:DEF', 'EQ:GHI']),
+            [104.0, 51.0, 20.0]
+        )
+
+    store = ArrayPriceStore.from_bid_ask_frames(bid_ask_frames)
+    bid = store.bid.copy()
+    assert not store.append({
+        'EQ:DEF': _bid_ask_frame(['2019-01-02 18:00:00'], [50.5])
+    })
+    np.testing.assert_equal(store.bid, bid)
+
+
+def test_mid_prices_only(bid_ask_frames, tmp_path):
+    """
+    Checks that stores created from mid prices hold a single price
+    matrix of the mid price precision, which is saved only once.
+    """
+    mid_frames = {
+        asset: bid_ask_df[['Bid']].rename(
+            columns={'Bid': 'Mid'}
+        ).astype(np.float32)
+        for asset, bid_ask_df in bid_ask_frames.items()
+    }
+    store = ArrayPriceStore.from_bid_ask_frames(mid_frames)
+    assert store.ask is store.bid
+    assert store.bid.dtype == np.float32
+    assert store.get_ask(
+        pd.Timestamp('2019-01-02 14:30:00', tz=pytz.UTC), 'EQ:DEF'
+    ) == 50.0
+
+    store_dir = str(tmp_path / 'store')
+    store.save(store_dir)
+    loaded_store = ArrayPriceStore.load(store_dir)
+    assert loaded_store.ask is loaded_store.bid
+    assert loaded_store.bid.dtype == np.float32
+
+
+def test_first_valid_and_locate(bid_ask_frames, tmp_path):
+    """
+    Checks that the first valid row of each asset is recorded on the
+    shared index, that rows are located once per timestamp and that
+    unsorted asset timestamps are rejected.
+    """
+    store = ArrayPriceStore.from_bid_ask_frames(bid_ask_frames)
+    np.testing.assert_equal(store.first_valid, [0, 2])
+    np.testing.assert_equal(
+        ArrayPriceStore._calculate_first_valid(store.bid), store.first_valid
+    )
+
+    dt = pd.Timestamp('2019-01-01 21:00:00', tz=pytz.UTC)
+    assert store.locate(dt) == 1
+    assert store.last_dt_ns == dt.value
+    np.testing.assert_equal(
+        store.get_bids(dt, ['EQ:DEF', 'EQ:ABC']), [np.NaN, 101.0]
+    )
+    assert np.isnan(store.get_bid(dt, 'EQ:DEF'))
+
+    store_dir = str(tmp_path / 'store')
+    store.save(store_dir)
+    np.testing.assert_equal(
+        ArrayPriceStore.load(store_dir).first_valid, [0, 2]
+    )
+
+    unsorted_frames = {
+        'EQ:ABC': bid_ask_frames['EQ:ABC'].iloc[::-1]
+    }
+    with pytest.raises(ValueError):
+        ArrayPriceStore.from_bid_ask_frames(unsorted_frames)
+
+
+def test_get_bids_asks_matrix(bid_ask_frames):
+    """
+    Checks that multi-timestamp lookups match the single timestamp
+    lookups at each timestamp, including unknown assets.
+    """
+    store = ArrayPriceStore.from_bid_ask_frames(bid_ask_frames)
+    dts = pd.DatetimeIndex([
+        '2018-12-31 21:00:00', '2019-01-01 18:00:00',
+        '2019-01-02 14:30:00', '2019-01-05 14:30:00'
+    ]).tz_localize(pytz.UTC)
+    assets = ['EQ:DEF', 'EQ:XYZ', 'EQ:ABC']
+
+    bids = store.get_bids_matrix(dts, assets)
+    assert bids.shape == (4, 3)
+    for row, dt in enumerate(dts):
+        np.testing.assert_array_equal(bids[row], store.get_bids(dt, assets))
+    np.testing.assert_array_equal(store.get_asks_matrix(dts, assets), bids)
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.data.validation import BarDataValidator
+
+
+def _create_bar_df(dates, closes):
+    index = pd.DatetimeIndex(dates, name='Date').tz_localize(pytz.UTC)
+    return pd.DataFrame(
+        {'Open': closes, 'Close': closes, 'Adj Close': closes}, index=index
+    )
+
+
+def test_validate_clean_bars():
+    """
+    Checks that clean bars produce a report without errors.
+    """
+    bar_df = _create_bar_df(
+        ['2019-01-02', '2019-01-03', '2019-01-04', '2019-01-07'],
+        [100.0, 101.0, np.nan, 102.0]
+    )
+    report = BarDataValidator().validate(bar_df)
+    assert report['errors'] == []
+    assert report['rows'] == 4
+    assert report['start'] == '2019-01-02T00:00:00+00:00'
+    assert report['nan_prices']['Close'] == 1
+    assert report['max_gap_days'] == 3.0
+    assert report['gaps'] == 0
+    BarDataValidator.check({'EQ:ABC': report})
+
+
+def test_validate_bad_bars():
+    """
+    Checks that missing columns, duplicate dates, non-positive
+    prices and gaps are reported, and that errors are raised
+    for all invalid assets.
+    """
+    bar_df = _create_bar_df(
+        ['2019-01-02', '2019-01-03', '2019-01-03', '2019-02-04'],
+        [100.0, 0.0, 101.0, -1.0]
+    )
+    validator = BarDataValidator(max_gap_days=7)
+    report = validator.validate(bar_df)
+    assert report['duplicate_dates'] == 1
+    assert report['non_positive_prices'] == {
+        'Open': 2, 'Close': 2, 'Adj Close': 2
+    }
+    assert report['gaps'] == 1
+    assert len(report['errors']) == 2
+
+    missing_report = validator.validate(bar_df.drop(columns='Adj Close'))
+    assert missing_report['missing_columns'] == ['Adj Close']
+    assert validator.validate(
+        bar_df.drop(columns='Adj Close'), adjust_prices=False
+    )['missing_columns'] == []
+
+    summary = BarDataValidator.summary({'EQ:ABC': report})
+    assert summary.loc['EQ:ABC', 'non_positive_prices'] == 6
+
+    with pytest.raises(ValueError, match='EQ:ABC'):
+        BarDataValidator.check({'EQ:ABC': report})
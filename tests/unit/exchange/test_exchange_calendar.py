@@ -0,0 +1,132 @@
+import datetime
+
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.exchange.exchange_calendar import (
+    ExchangeCalendar, get_exchange_calendar
+)
+from qstrader.exchange.simulated_exchange import SimulatedExchange
+
+
+def test_default_calendar_matches_business_days():
+    """
+    Checks that a calendar without holidays consists of every
+    business day at the default market session times.
+    """
+    calendar = ExchangeCalendar()
+    sessions = calendar.sessions(
+        pd.Timestamp('2019-12-20 14:48:00', tz=pytz.UTC), '2020-01-10'
+    )
+    expected_days = pd.bdate_range('2019-12-20', '2020-01-10')
+    pd.testing.assert_index_equal(
+        sessions.index, expected_days, check_names=False
+    )
+    assert (sessions['market_open'] - sessions.index.tz_localize('UTC') ==
+            pd.Timedelta(hours=14, minutes=30)).all()
+    assert (sessions['market_close'] - sessions.index.tz_localize('UTC') ==
+            pd.Timedelta(hours=21)).all()
+    assert not sessions['early_close'].any()
+
+
+def test_nyse_holidays_and_early_closes():
+    """
+    Checks that the NYSE calendar excludes the exchange holidays
+    and closes early on the early close sessions.
+    """
+    calendar = get_exchange_calendar('NYSE')
+    assert get_exchange_calendar('NYSE') is calendar
+
+    sessions = calendar.sessions('2019-01-01', '2019-12-31')
+    holidays = pd.bdate_range('2019-01-01', '2019-12-31').difference(
+        sessions.index
+    )
+    assert list(holidays.strftime('%Y-%m-%d')) == [
+        '2019-01-01', '2019-01-21', '2019-02-18', '2019-04-19', '2019-05-27',
+        '2019-07-04', '2019-09-02', '2019-11-28', '2019-12-25'
+    ]
+    early_closes = sessions[sessions['early_close']]
+    assert list(early_closes.index.strftime('%Y-%m-%d')) == [
+        '2019-07-03', '2019-11-29', '2019-12-24'
+    ]
+    assert early_closes['market_close'].iloc[1] == \
+        pd.Timestamp('2019-11-29 18:00:00', tz=pytz.UTC)
+
+    # Adhoc closures and observed weekend holidays
+    assert not calendar.is_session(pd.Timestamp('2012-10-29'))
+    assert not calendar.is_session(pd.Timestamp('2021-12-24'))
+    assert calendar.is_session(pd.Timestamp('2021-12-31'))
+
+    with pytest.raises(ValueError):
+        get_exchange_calendar('XYZ')
+
+
+@pytest.mark.parametrize(
+    'dt,expected',
+    [
+        ('2019-11-27 14:29:59', False),
+        ('2019-11-27 14:30:00', True),
+        ('2019-11-27 20:59:59', True),
+        ('2019-11-27 21:00:00', False),
+        ('2019-11-28 15:00:00', False),
+        ('2019-11-29 17:59:00', True),
+        ('2019-11-29 18:00:00', False),
+        ('2019-11-30 15:00:00', False),
+        ('2031-07-04 15:00:00', False),
+        ('2031-07-07 15:00:00', True),
+    ]
+)
+def test_simulated_exchange_is_open(dt, expected):
+    """
+    Checks that the simulated exchange is open only within the
+    sessions of its calendar, extending the cached sessions to
+    timestamps outside of the cached years.
+    """
+    calendar = get_exchange_calendar('NYSE')
+    calendar.sessions('2019-01-01', '2019-12-31')
+    exchange = SimulatedExchange(pd.Timestamp('2019-01-01', tz=pytz.UTC), calendar)
+    assert exchange.is_open_at_datetime(pd.Timestamp(dt, tz=pytz.UTC)) is expected
+
+
+def test_simulated_exchange_is_open_datetime():
+    """
+    Checks that the simulated exchange accepts timezone-aware and
+    timezone-naive (assumed UTC) datetime.datetime instances.
+    """
+    exchange = SimulatedExchange(pd.Timestamp('2020-01-01', tz=pytz.UTC))
+    assert exchange.is_open_at_datetime(
+        datetime.datetime(2020, 1, 2, 15, tzinfo=pytz.UTC)
+    )
+    assert exchange.is_open_at_datetime(datetime.datetime(2020, 1, 2, 15))
+    assert not exchange.is_open_at_datetime(
+        datetime.datetime(2020, 1, 2, 22, tzinfo=pytz.UTC)
+    )
+
+
+def test_open_mask_matches_is_open():
+    """
+    Checks that the vectorised open mask agrees with checking each
+    timestamp individually, including across uncached years.
+    """
+    calendar = get_exchange_calendar('NYSE')
+    exchange = SimulatedExchange(pd.Timestamp('2019-01-01', tz=pytz.UTC), calendar)
+    dts = pd.date_range(
+        '2019-11-25', '2019-12-02', freq='30min', tz=pytz.UTC
+    ).append(pd.DatetimeIndex(['2032-07-02 15:00:00'], tz=pytz.UTC))
+    expected = [exchange.is_open_at_datetime(dt) for dt in dts]
+    assert exchange.is_open_at_datetimes(dts).tolist() == expected
+    assert calendar.open_mask(dts.tz_localize(None).to_numpy()).tolist() == \
+        expected
+    assert calendar.open_mask([]).tolist() == []
+
+
+def test_invalid_calendar_times():
+    """
+    Checks that an early close outside of the market session
+    is rejected.
+    """
+    with pytest.raises(ValueError):
+        ExchangeCalendar(early_close='22:00:00')
+    with pytest.raises(ValueError):
+        ExchangeCalendar(market_open='21:00:00', market_close='14:30:00')
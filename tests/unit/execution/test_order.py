@@ -0,0 +1,29 @@
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.execution.order import Order
+
+
+def test_order_ids_are_unique_and_increasing():
+    """
+    Checks that generated order IDs are unique and monotonically
+    increasing, while provided order IDs are retained.
+    """
+    dt = pd.Timestamp('2020-01-01 14:30:00', tz=pytz.UTC)
+    order_ids = [Order(dt, 'EQ:ABC', 100).order_id for _ in range(100)]
+    assert len(set(order_ids)) == 100
+    assert order_ids == sorted(order_ids)
+    assert Order(dt, 'EQ:ABC', 100, order_id='ORDER-1').order_id == 'ORDER-1'
+
+
+def test_order_is_slotted():
+    """
+    Checks that orders do not allocate a per-instance dictionary
+    and reject undeclared attributes.
+    """
+    order = Order(pd.Timestamp('2020-01-01', tz=pytz.UTC), 'EQ:ABC', -50)
+    assert not hasattr(order, '__dict__')
+    assert order.direction == -1
+    with pytest.raises(AttributeError):
+        order.price = 100.0
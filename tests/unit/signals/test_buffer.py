@@ -0,0 +1,49 @@
+import pytest
+
+from qstrader.asset.registry import AssetRegistry
+from qstrader.signals.buffer import AssetPriceBuffers
+
+
+def test_asset_price_buffers():
+    """
+    Checks that the integer ID indexed price buffers retain
+    the most recent prices of each lookback, including those
+    of assets added subsequent to creation.
+    """
+    registry = AssetRegistry()
+    buffers = AssetPriceBuffers(
+        ['EQ:SPY', 'EQ:AGG'], lookbacks=[2, 3], registry=registry
+    )
+    for price in [100.0, 101.0, 102.0, 103.0]:
+        buffers.append('EQ:SPY', price)
+    buffers.append('EQ:GLD', 50.0)
+
+    assert list(buffers.get_prices('EQ:SPY', 2)) == [102.0, 103.0]
+    assert list(buffers.get_prices('EQ:SPY', 3)) == [101.0, 102.0, 103.0]
+    assert list(buffers.get_prices('EQ:AGG', 3)) == []
+    assert list(buffers.get_prices('EQ:GLD', 2)) == [50.0]
+    assert buffers.buffers[registry.get_id('EQ:GLD')][0] is \
+        buffers.get_prices('EQ:GLD', 2)
+
+    # Legacy string keyed view of the buffers
+    assert list(buffers.prices['EQ:SPY_2']) == [102.0, 103.0]
+    assert len(buffers.prices) == 6
+
+    with pytest.raises(KeyError):
+        buffers.get_prices('EQ:TLT', 2)
+    assert 'EQ:TLT' not in registry
+    with pytest.raises(ValueError):
+        buffers.append('EQ:SPY', 0.0)
+    with pytest.raises(ValueError):
+        buffers.add_asset('EQ:SPY')
+
+
+def test_asset_price_buffers_private_registry():
+    """
+    Checks that buffers created without a registry are indexed
+    only by their own assets.
+    """
+    buffers = AssetPriceBuffers(['EQ:SPY', 'EQ:AGG'], lookbacks=[2])
+    buffers.append('EQ:GLD', 50.0)
+    assert buffers.registry.symbols == ['EQ:SPY', 'EQ:AGG', 'EQ:GLD']
+    assert len(buffers.buffers) == 3
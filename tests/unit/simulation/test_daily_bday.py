@@ -2,6 +2,7 @@ import pandas as pd
 import pytest
 import pytz
 
+from qstrader.exchange.exchange_calendar import get_exchange_calendar
 from qstrader.simulation.daily_bday import DailyBusinessDaySimulationEngine
 from qstrader.simulation.event import SimulationEvent
 
@@ -67,3 +68,32 @@ def test_daily_rebalance(
         calculated_event = sim_events[0]
         expected_event = SimulationEvent(pd.Timestamp(sim_events[1][0], tz=pytz.UTC), sim_events[1][1])
         assert calculated_event == expected_event
+
+
+def test_calendar_sessions():
+    """
+    Checks that the events are generated from the sessions of the
+    provided exchange calendar, skipping holidays and closing early
+    on early close sessions.
+    """
+    sd = pd.Timestamp('2019-11-27', tz=pytz.UTC)
+    ed = pd.Timestamp('2019-12-02', tz=pytz.UTC)
+    calendar = get_exchange_calendar('NYSE')
+
+    expected_events = [
+        SimulationEvent(pd.Timestamp(ts, tz=pytz.UTC), event_type)
+        for ts, event_type in [
+            ('2019-11-27 14:30:00', 'market_open'),
+            ('2019-11-27 21:00:00', 'market_close'),
+            ('2019-11-29 14:30:00', 'market_open'),
+            ('2019-11-29 18:00:00', 'market_close'),
+            ('2019-12-02 14:30:00', 'market_open'),
+            ('2019-12-02 21:00:00', 'market_close'),
+        ]
+    ]
+    for precompute in [False, True]:
+        sim_engine = DailyBusinessDaySimulationEngine(
+            sd, ed, pre_market=False, post_market=False,
+            precompute=precompute, calendar=calendar
+        )
+        assert list(sim_engine) == expected_events
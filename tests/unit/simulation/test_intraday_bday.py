@@ -0,0 +1,87 @@
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.exchange.exchange_calendar import get_exchange_calendar
+from qstrader.simulation.daily_bday import DailyBusinessDaySimulationEngine
+from qstrader.simulation.event import SimulationEvent
+from qstrader.simulation.intraday_bday import (
+    IntradayBusinessDaySimulationEngine
+)
+
+
+def test_intraday_events():
+    """
+    Checks that the intraday business day event generation provides
+    bar events at the frequency within the configured market session.
+    """
+    sd = pd.Timestamp('2020-01-03', tz=pytz.UTC)
+    ed = pd.Timestamp('2020-01-06', tz=pytz.UTC)
+
+    sim_engine = IntradayBusinessDaySimulationEngine(
+        sd, ed, freq='1H', pre_market=False, post_market=True,
+        market_open='13:30:00', market_close='16:00:00'
+    )
+    expected_events = [
+        ('2020-01-03 13:30:00', 'market_open'),
+        ('2020-01-03 14:30:00', 'market_bar'),
+        ('2020-01-03 15:30:00', 'market_bar'),
+        ('2020-01-03 16:00:00', 'market_close'),
+        ('2020-01-03 23:59:00', 'post_market'),
+        ('2020-01-06 13:30:00', 'market_open'),
+        ('2020-01-06 14:30:00', 'market_bar'),
+        ('2020-01-06 15:30:00', 'market_bar'),
+        ('2020-01-06 16:00:00', 'market_close'),
+        ('2020-01-06 23:59:00', 'post_market'),
+    ]
+    assert list(sim_engine) == [
+        SimulationEvent(pd.Timestamp(ts, tz=pytz.UTC), event_type)
+        for ts, event_type in expected_events
+    ]
+
+    minute_engine = IntradayBusinessDaySimulationEngine(
+        sd, sd, freq='1min', pre_market=False, post_market=False
+    )
+    assert len(list(minute_engine)) == 6.5 * 60 + 1
+
+
+def test_calendar_early_close():
+    """
+    Checks that no bar events are generated after the early close
+    of an early close session of the exchange calendar.
+    """
+    sd = pd.Timestamp('2019-11-28', tz=pytz.UTC)
+    ed = pd.Timestamp('2019-11-29', tz=pytz.UTC)
+    calendar = get_exchange_calendar('NYSE')
+
+    events = []
+    for precompute in [False, True]:
+        sim_engine = IntradayBusinessDaySimulationEngine(
+            sd, ed, freq='1H', pre_market=False, post_market=False,
+            precompute=precompute, calendar=calendar
+        )
+        events.append(list(sim_engine))
+    assert events[0] == events[1]
+    assert [
+        (event.ts.strftime('%Y-%m-%d %H:%M'), event.event_type)
+        for event in events[0]
+    ] == [
+        ('2019-11-29 14:30', 'market_open'),
+        ('2019-11-29 15:30', 'market_bar'),
+        ('2019-11-29 16:30', 'market_bar'),
+        ('2019-11-29 17:30', 'market_bar'),
+        ('2019-11-29 18:00', 'market_close'),
+    ]
+
+
+def test_invalid_session_times():
+    """
+    Checks that a market open at or after the market close is rejected.
+    """
+    sd = pd.Timestamp('2020-01-03', tz=pytz.UTC)
+    with pytest.raises(ValueError):
+        DailyBusinessDaySimulationEngine(
+            sd, sd, market_open='21:00:00', market_close='14:30:00'
+        )
+    with pytest.raises(ValueError):
+        IntradayBusinessDaySimulationEngine(sd, sd, freq='0min')
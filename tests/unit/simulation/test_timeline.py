@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+import pytz
+
+from qstrader.simulation.daily_bday import DailyBusinessDaySimulationEngine
+from qstrader.simulation.event import SimulationEvent
+from qstrader.simulation.intraday_bday import (
+    IntradayBusinessDaySimulationEngine
+)
+from qstrader.simulation.timeline import EventTimeline
+
+
+def test_event_timeline():
+    """
+    Checks the iteration, random access, slicing and location of
+    events within a timeline created from daily offsets.
+    """
+    days = pd.DatetimeIndex(['2020-01-02', '2020-01-03']).tz_localize(pytz.UTC)
+    timeline = EventTimeline.from_days(
+        days,
+        [pd.Timedelta(hours=14, minutes=30), pd.Timedelta(hours=21)],
+        ['market_open', 'market_close']
+    )
+    expected_events = [
+        SimulationEvent(pd.Timestamp(ts, tz=pytz.UTC), event_type)
+        for ts, event_type in [
+            ('2020-01-02 14:30:00', 'market_open'),
+            ('2020-01-02 21:00:00', 'market_close'),
+            ('2020-01-03 14:30:00', 'market_open'),
+            ('2020-01-03 21:00:00', 'market_close'),
+        ]
+    ]
+    assert len(timeline) == 4
+    assert timeline.timestamps.dtype == np.dtype('datetime64[ns]')
+    assert list(timeline) == expected_events
+    assert timeline[2] == expected_events[2]
+    assert timeline[-1] == expected_events[-1]
+    assert list(timeline[1:3]) == expected_events[1:3]
+    np.testing.assert_array_equal(
+        timeline.event_type_mask('market_close'), [False, True, False, True]
+    )
+    assert not timeline.event_type_mask('pre_market').any()
+    assert timeline.locate(pd.Timestamp('2020-01-02 21:00:00', tz=pytz.UTC)) == 1
+    assert timeline.locate(pd.Timestamp('2020-01-03 15:00:00', tz=pytz.UTC)) == 3
+    assert timeline.locate(pd.Timestamp('2020-01-04', tz=pytz.UTC)) == 4
+
+    with pytest.raises(ValueError):
+        EventTimeline(timeline.timestamps, timeline.codes[:2], ['market_open'])
+
+
+def test_event_timeline_is_read_only():
+    """
+    Checks that the timestamps and event type codes of a timeline,
+    and of its slices, cannot be modified by its consumers, nor via
+    the arrays it was created from.
+    """
+    timestamps = np.array(
+        ['2020-01-02T14:30', '2020-01-02T21:00'], dtype='datetime64[ns]'
+    )
+    codes = np.array([0, 1], dtype=np.int8)
+    timeline = EventTimeline(timestamps, codes, ['market_open', 'market_close'])
+    codes[0] = 1
+    assert timeline.codes[0] == 0
+
+    for tl in [timeline, timeline[1:], timeline[np.array([True, False])]]:
+        with pytest.raises(ValueError):
+            tl.timestamps[0] = np.datetime64('2020-01-03T14:30')
+        with pytest.raises(ValueError):
+            tl.codes[0] = 1
+
+
+@pytest.mark.parametrize('pre_market,post_market', [(True, True), (False, False)])
+def test_precomputed_events_match_generated_events(pre_market, post_market):
+    """
+    Checks that the precomputed timeline of the simulation engines
+    provides the same events as generating each event individually.
+    """
+    sd = pd.Timestamp('2019-12-20', tz=pytz.UTC)
+    ed = pd.Timestamp('2020-01-10', tz=pytz.UTC)
+
+    daily_engine = DailyBusinessDaySimulationEngine(
+        sd, ed, pre_market, post_market, precompute=True
+    )
+    assert daily_engine.timeline is not None
+    assert list(daily_engine) == list(
+        DailyBusinessDaySimulationEngine(sd, ed, pre_market, post_market)
+    )
+
+    intraday_engine = IntradayBusinessDaySimulationEngine(
+        sd, ed, freq='15min', pre_market=pre_market,
+        post_market=post_market, precompute=True
+    )
+    assert list(intraday_engine) == list(
+        IntradayBusinessDaySimulationEngine(
+            sd, ed, freq='15min', pre_market=pre_market,
+            post_market=post_market
+        )
+    )